@@ -2,6 +2,7 @@ from typing import List
 
 from core.base_service import BaseService
 from core.dependence.redisdb import RedisDB
+from utils.tiered_cache import TieredCache
 
 __all__ = ["GameCache", "GameCacheForStrategy"]
 
@@ -12,16 +13,23 @@ class GameCache:
     def __init__(self, redis: RedisDB, ttl: int = 3600):
         self.client = redis.client
         self.ttl = ttl
+        self.cache: TieredCache[List[str]] = TieredCache(
+            self.client,
+            self.qname,
+            lambda data: [str(str_data, encoding="utf-8") for str_data in data][::-1],
+            copy=list,
+        )
 
     async def get_url_list(self, character_name: str):
         qname = f"{self.qname}:{character_name}"
-        return [str(str_data, encoding="utf-8") for str_data in await self.client.lrange(qname, 0, -1)][::-1]
+        return await self.cache.get(qname, lambda: self.client.lrange(qname, 0, -1)) or []
 
     async def set_url_list(self, character_name: str, str_list: List[str]):
         qname = f"{self.qname}:{character_name}"
         await self.client.ltrim(qname, 1, 0)
         await self.client.lpush(qname, *str_list)
         await self.client.expire(qname, self.ttl)
+        await self.cache.invalidate(qname)
         return await self.client.llen(qname)
 
 
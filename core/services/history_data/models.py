@@ -1,7 +1,9 @@
 import enum
-from typing import Dict
+from typing import Dict, Optional
 
 from pydantic import BaseModel
+from sqlalchemy import Index
+from sqlmodel import BigInteger, Column, Field, Integer, SQLModel, String
 from simnet.models.genshin.chronicle.abyss import SpiralAbyss
 from simnet.models.genshin.chronicle.hard_challenge import HardChallengeData
 from simnet.models.genshin.chronicle.img_theater import ImgTheaterData
@@ -11,6 +13,7 @@ from gram_core.services.history_data.models import HistoryData
 
 __all__ = (
     "HistoryData",
+    "HistoryDataIndex",
     "HistoryDataTypeEnum",
     "HistoryDataAbyss",
     "HistoryDataLedger",
@@ -26,6 +29,25 @@ class HistoryDataTypeEnum(int, enum.Enum):
     HARD_CHALLENGE = 4  # 肃靖险乱
 
 
+class HistoryDataIndex(SQLModel, table=True):
+    """历史数据索引，保存每条历史数据的内容哈希与摘要，用于快速去重和分页浏览"""
+
+    __tablename__ = "history_data_index"
+    __table_args__ = (
+        Index("ix_history_data_index_user_id_data_id_type", "user_id", "data_id", "type"),
+        dict(mysql_charset="utf8mb4", mysql_collate="utf8mb4_general_ci"),
+    )
+
+    id: Optional[int] = Field(default=None, sa_column=Column(Integer, primary_key=True, autoincrement=True))
+    history_id: int = Field(sa_column=Column(Integer, nullable=False, index=True))
+    user_id: int = Field(sa_column=Column(BigInteger, nullable=False))
+    data_id: Optional[int] = Field(default=None, sa_column=Column(BigInteger))
+    type: int = Field(sa_column=Column(Integer, nullable=False))
+    data_hash: str = Field(sa_column=Column(String(64), nullable=False))
+    name: Optional[str] = Field(default=None, sa_column=Column(String(255)))
+    """按钮显示的摘要，例如深渊的期数、星数与称号，保存时生成"""
+
+
 class HistoryDataAbyss(BaseModel):
     abyss_data: SpiralAbyss
     character_data: Dict[int, int]
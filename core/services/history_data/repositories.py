@@ -1,3 +1,137 @@
+from typing import List, Optional
+
+from sqlalchemy import delete, func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.base_service import BaseService
+from core.dependence.database import Database
+from core.services.history_data.models import HistoryData, HistoryDataIndex
 from gram_core.services.history_data.repositories import HistoryDataRepository
 
-__all__ = ("HistoryDataRepository",)
+__all__ = ("HistoryDataRepository", "HistoryDataIndexRepository")
+
+
+class HistoryDataIndexRepository(BaseService.Component):
+    def __init__(self, database: Database):
+        self.engine = database.engine
+
+    async def add(self, data: HistoryData, data_hash: str, name: Optional[str] = None) -> HistoryData:
+        """在同一事务中写入历史数据与其索引"""
+        async with AsyncSession(self.engine) as session:
+            session.add(data)
+            await session.flush()
+            index = HistoryDataIndex(
+                history_id=data.id,
+                user_id=data.user_id,
+                data_id=data.data_id,
+                type=data.type,
+                data_hash=data_hash,
+                name=name,
+            )
+            session.add(index)
+            await session.commit()
+            await session.refresh(data)
+            return data
+
+    async def exists(self, user_id: int, data_id: int, data_type: int, data_hash: str) -> bool:
+        async with AsyncSession(self.engine) as session:
+            statement = (
+                select(HistoryDataIndex.id)
+                .join(HistoryData, HistoryData.id == HistoryDataIndex.history_id)
+                .where(HistoryDataIndex.user_id == user_id)
+                .where(HistoryDataIndex.data_id == data_id)
+                .where(HistoryDataIndex.type == data_type)
+                .where(HistoryDataIndex.data_hash == data_hash)
+                .limit(1)
+            )
+            results = await session.exec(statement)
+            return results.first() is not None
+
+    async def exists_by_data_id(self, user_id: int, data_id: int, data_type: int) -> bool:
+        async with AsyncSession(self.engine) as session:
+            statement = (
+                select(HistoryDataIndex.id)
+                .join(HistoryData, HistoryData.id == HistoryDataIndex.history_id)
+                .where(HistoryDataIndex.user_id == user_id)
+                .where(HistoryDataIndex.data_id == data_id)
+                .where(HistoryDataIndex.type == data_type)
+                .limit(1)
+            )
+            results = await session.exec(statement)
+            return results.first() is not None
+
+    async def get_page(self, user_id: int, data_type: int, offset: int, limit: int) -> List[HistoryDataIndex]:
+        async with AsyncSession(self.engine) as session:
+            statement = (
+                select(HistoryDataIndex)
+                .join(HistoryData, HistoryData.id == HistoryDataIndex.history_id)
+                .where(HistoryDataIndex.user_id == user_id)
+                .where(HistoryDataIndex.type == data_type)
+                .order_by(HistoryDataIndex.data_id.desc(), HistoryDataIndex.history_id.desc())  # pylint: disable=E1101
+                .offset(offset)
+                .limit(limit)
+            )
+            results = await session.exec(statement)
+            return results.all()
+
+    async def count(self, user_id: int, data_type: int) -> int:
+        async with AsyncSession(self.engine) as session:
+            statement = (
+                select(func.count(HistoryDataIndex.id))
+                .join(HistoryData, HistoryData.id == HistoryDataIndex.history_id)
+                .where(HistoryDataIndex.user_id == user_id)
+                .where(HistoryDataIndex.type == data_type)
+            )
+            results = await session.exec(statement)
+            return results.one()
+
+    async def update_name(self, index_id: int, name: str):
+        async with AsyncSession(self.engine) as session:
+            await session.exec(update(HistoryDataIndex).where(HistoryDataIndex.id == index_id).values(name=name))
+            await session.commit()
+
+    async def get_unindexed(self, data_type: int, limit: int = 500) -> List[HistoryData]:
+        """获取还没有索引的历史数据"""
+        async with AsyncSession(self.engine) as session:
+            indexed = select(HistoryDataIndex.history_id).where(HistoryDataIndex.type == data_type)
+            statement = (
+                select(HistoryData)
+                .where(HistoryData.type == data_type)
+                .where(HistoryData.id.not_in(indexed))  # pylint: disable=E1101
+                .limit(limit)
+            )
+            results = await session.exec(statement)
+            return results.all()
+
+    async def add_index(self, indexes: List[HistoryDataIndex]):
+        async with AsyncSession(self.engine) as session:
+            session.add_all(indexes)
+            await session.commit()
+
+    async def remove_same_data(self, data_type: int) -> int:
+        """按 (user_id, data_id, data_hash) 分组，每组只保留最早的一条记录
+
+        :return: 删除的记录数量
+        """
+        async with AsyncSession(self.engine) as session:
+            keep = (
+                select(func.min(HistoryDataIndex.history_id))
+                .where(HistoryDataIndex.type == data_type)
+                .group_by(HistoryDataIndex.user_id, HistoryDataIndex.data_id, HistoryDataIndex.data_hash)
+            )
+            statement = (
+                select(HistoryDataIndex.history_id)
+                .where(HistoryDataIndex.type == data_type)
+                .where(HistoryDataIndex.history_id.not_in(keep))  # pylint: disable=E1101
+            )
+            results = await session.exec(statement)
+            remove_ids = list(results.all())
+            if not remove_ids:
+                return 0
+            await session.exec(
+                delete(HistoryData).where(HistoryData.type == data_type).where(HistoryData.id.in_(remove_ids))
+            )
+            await session.exec(delete(HistoryDataIndex).where(HistoryDataIndex.history_id.in_(remove_ids)))
+            await session.commit()
+            return len(remove_ids)
@@ -1,5 +1,8 @@
+import asyncio
 import datetime
-from typing import Dict, List
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from simnet.models.genshin.chronicle.abyss import SpiralAbyss
 from simnet.models.genshin.chronicle.hard_challenge import HardChallengeData
@@ -8,14 +11,17 @@ from simnet.models.genshin.diary import Diary
 
 from core.services.history_data.models import (
     HistoryData,
+    HistoryDataIndex,
     HistoryDataTypeEnum,
     HistoryDataAbyss,
     HistoryDataLedger,
     HistoryDataImgTheater,
     HistoryDataHardChallenge,
 )
+from core.services.history_data.repositories import HistoryDataRepository, HistoryDataIndexRepository
 from gram_core.base_service import BaseService
 from gram_core.services.history_data.services import HistoryDataBaseServices
+from utils.log import logger
 
 try:
     import ujson as jsonlib
@@ -25,6 +31,7 @@ except ImportError:
 
 __all__ = (
     "HistoryDataBaseServices",
+    "HistoryDataIndexedServices",
     "HistoryDataAbyssServices",
     "HistoryDataLedgerServices",
     "HistoryDataImgTheaterServices",
@@ -32,16 +39,112 @@ __all__ = (
 )
 
 
-class HistoryDataAbyssServices(BaseService, HistoryDataBaseServices):
-    DATA_TYPE = HistoryDataTypeEnum.ABYSS.value
+class HistoryDataIndexedServices(HistoryDataBaseServices):
+    """通过内容哈希索引去重的历史数据服务"""
+
+    SUMMARY_PAGE_SIZE = 15
+
+    def __init__(self, repository: HistoryDataRepository, index_repository: HistoryDataIndexRepository):
+        super().__init__(repository)
+        self._index_repository = index_repository
+        self._index_lock = asyncio.Lock()
+        self._index_ready = False
 
     @staticmethod
-    def exists_data(data: HistoryData, old_data: List[HistoryData]) -> bool:
-        def _get_data(_d: dict):
-            return _d.get("abyss_data", {}).get("floors")
+    def get_hash_source(data: Dict[str, Any]) -> Any:
+        """用于判断数据是否相同的部分"""
+        return data
+
+    @classmethod
+    def get_data_hash(cls, data: Dict[str, Any]) -> str:
+        canonical = json.dumps(cls.get_hash_source(data), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def exists_data(cls, data: HistoryData, old_data: List[HistoryData]) -> bool:
+        source = cls.get_hash_source(data.data)
+        return any(cls.get_hash_source(d.data) == source for d in old_data)
+
+    async def exists_by_data_id(self, user_id: int, data_id: int) -> bool:
+        if not self._index_ready:
+            await self.rebuild_index()
+        return await self._index_repository.exists_by_data_id(user_id, data_id, self.DATA_TYPE)
+
+    async def add_if_not_exists(self, data: HistoryData, name: Optional[str] = None) -> Optional[HistoryData]:
+        """如果不存在相同内容的数据则保存
+
+        :param data: 历史数据
+        :param name: 数据摘要，用于历史记录按钮的显示
+        :return: 保存成功返回数据，已存在返回 None
+        """
+        if not self._index_ready:
+            await self.rebuild_index()
+        data_hash = self.get_data_hash(data.data)
+        if await self._index_repository.exists(data.user_id, data.data_id, self.DATA_TYPE, data_hash):
+            return None
+        return await self._index_repository.add(data, data_hash, name)
+
+    async def get_summary_page(
+        self, user_id: int, page: int, get_name: Callable[[HistoryData], str]
+    ) -> Tuple[List[HistoryDataIndex], int]:
+        """分页获取历史数据摘要，只有缺少摘要的旧数据才会读取完整数据
+
+        :param user_id: 玩家 UID
+        :param page: 页码，从 1 开始
+        :param get_name: 从完整数据生成摘要的方法
+        :return: 当前页的索引与数据总数
+        """
+        if not self._index_ready:
+            await self.rebuild_index()
+        total = await self._index_repository.count(user_id, self.DATA_TYPE)
+        offset = (page - 1) * self.SUMMARY_PAGE_SIZE
+        indexes = await self._index_repository.get_page(user_id, self.DATA_TYPE, offset, self.SUMMARY_PAGE_SIZE)
+        for index in indexes:
+            if index.name is not None:
+                continue
+            data = await self.get_by_id(index.history_id)
+            if data is None:
+                continue
+            index.name = get_name(data)
+            await self._index_repository.update_name(index.id, index.name)
+        return [index for index in indexes if index.name is not None], total
+
+    async def rebuild_index(self) -> int:
+        """为没有索引的历史数据补充索引
+
+        :return: 补充的索引数量
+        """
+        count = 0
+        async with self._index_lock:
+            while data_list := await self._index_repository.get_unindexed(self.DATA_TYPE):
+                indexes = [
+                    HistoryDataIndex(
+                        history_id=data.id,
+                        user_id=data.user_id,
+                        data_id=data.data_id,
+                        type=data.type,
+                        data_hash=self.get_data_hash(data.data),
+                    )
+                    for data in data_list
+                ]
+                await self._index_repository.add_index(indexes)
+                count += len(indexes)
+            self._index_ready = True
+        if count:
+            logger.info("历史数据 type[%s] 补充索引 %s 条", self.DATA_TYPE, count)
+        return count
+
+    async def remove_same_data(self) -> int:
+        await self.rebuild_index()
+        return await self._index_repository.remove_same_data(self.DATA_TYPE)
+
+
+class HistoryDataAbyssServices(BaseService, HistoryDataIndexedServices):
+    DATA_TYPE = HistoryDataTypeEnum.ABYSS.value
 
-        floor = _get_data(data.data)
-        return any(_get_data(d.data) == floor for d in old_data)
+    @staticmethod
+    def get_hash_source(data: Dict[str, Any]) -> Any:
+        return data.get("abyss_data", {}).get("floors")
 
     @staticmethod
     def create(user_id: int, abyss_data: SpiralAbyss, character_data: Dict[int, int]):
@@ -56,7 +159,7 @@ class HistoryDataAbyssServices(BaseService, HistoryDataBaseServices):
         )
 
 
-class HistoryDataLedgerServices(BaseService, HistoryDataBaseServices):
+class HistoryDataLedgerServices(BaseService, HistoryDataIndexedServices):
     DATA_TYPE = HistoryDataTypeEnum.LEDGER.value
 
     @staticmethod
@@ -72,16 +175,12 @@ class HistoryDataLedgerServices(BaseService, HistoryDataBaseServices):
         )
 
 
-class HistoryDataImgTheaterServices(BaseService, HistoryDataBaseServices):
+class HistoryDataImgTheaterServices(BaseService, HistoryDataIndexedServices):
     DATA_TYPE = HistoryDataTypeEnum.ROLE_COMBAT.value
 
     @staticmethod
-    def exists_data(data: HistoryData, old_data: List[HistoryData]) -> bool:
-        def _get_data(_d: dict):
-            return _d.get("abyss_data", {}).get("detail", {}).get("rounds_data")
-
-        floor = _get_data(data.data)
-        return any(_get_data(d.data) == floor for d in old_data)
+    def get_hash_source(data: Dict[str, Any]) -> Any:
+        return data.get("abyss_data", {}).get("detail", {}).get("rounds_data")
 
     @staticmethod
     def create(user_id: int, abyss_data: ImgTheaterData, character_data: Dict[int, int]):
@@ -96,16 +195,12 @@ class HistoryDataImgTheaterServices(BaseService, HistoryDataBaseServices):
         )
 
 
-class HistoryDataHardChallengeServices(BaseService, HistoryDataBaseServices):
+class HistoryDataHardChallengeServices(BaseService, HistoryDataIndexedServices):
     DATA_TYPE = HistoryDataTypeEnum.HARD_CHALLENGE.value
 
     @staticmethod
-    def exists_data(data: HistoryData, old_data: List[HistoryData]) -> bool:
-        def _get_data(_d: dict):
-            return _d.get("abyss_data", {}).get("single", {}).get("challenge", [{}])[0].get("teams", [])
-
-        abyss_data = _get_data(data.data)
-        return any(_get_data(d.data) == abyss_data for d in old_data)
+    def get_hash_source(data: Dict[str, Any]) -> Any:
+        return data.get("abyss_data", {}).get("single", {}).get("challenge", [{}])[0].get("teams", [])
 
     @staticmethod
     def create(user_id: int, abyss_data: HardChallengeData):
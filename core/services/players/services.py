@@ -16,8 +16,9 @@ from core.dependence.redisdb import RedisDB
 from core.services.players.models import PlayersDataBase as Player, PlayerInfoSQLModel, PlayerInfo
 from core.services.players.repositories import PlayerInfoRepository
 from gram_core.services.players.services import PlayersService
-from utils.enkanetwork import RedisCache, EnkaNetworkAPI
+from utils.enkanetwork import RedisCache, EnkaNetworkAPI, enka_guard
 from utils.log import logger
+from utils.tiered_cache import TieredCache
 
 __all__ = ("PlayersService", "PlayerInfoService")
 
@@ -29,22 +30,23 @@ class PlayerInfoService(BaseService):
         self.enka_client = EnkaNetworkAPI(lang="chs", user_agent=config.enka_network_api_agent)
         self.enka_client.set_cache(RedisCache(redis.client, key="players_info:enka_network", ex=60))
         self.qname = "players_info"
+        self.form_cache: TieredCache[PlayerInfo] = TieredCache(
+            redis.client, self.qname, PlayerInfo.parse_raw, copy=lambda x: x.copy(deep=True)
+        )
 
     async def get_form_cache(self, player: Player):
         qname = f"{self.qname}:{player.user_id}:{player.player_id}"
-        data = await self.cache.get(qname)
-        if data is None:
-            return None
-        json_data = str(data, encoding="utf-8")
-        return PlayerInfo.parse_raw(json_data)
+        return await self.form_cache.get(qname)
 
     async def set_form_cache(self, player: PlayerInfo):
         qname = f"{self.qname}:{player.user_id}:{player.player_id}"
-        await self.cache.set(qname, player.json(), ex=60)
+        await self.form_cache.set(qname, player.json(), ex=60)
 
     async def get_player_info_from_enka(self, player_id: int) -> Optional[EnkaPlayerInfo]:
         try:
-            response = await self.enka_client.fetch_user(player_id, info=True)
+            response = await enka_guard.call(
+                player_id, lambda: self.enka_client.fetch_user(player_id, info=True), kind="info"
+            )
             return response.player
         except VaildateUIDError:
             logger.warning("Enka.Network 请求失败 UID 不正确")
@@ -8,62 +8,82 @@ __all__ = ("QuizCache",)
 
 
 class QuizCache(BaseService.Component):
+    """问题与答案分别保存在一个 Redis Hash 中，field 为 ID，value 为 JSON"""
+
     def __init__(self, redis: RedisDB):
         self.client = redis.client
         self.question_qname = "quiz:question"
         self.answer_qname = "quiz:answer"
 
     async def get_all_question(self) -> List[Question]:
-        temp_list = []
-        qname = self.question_qname + "id_list"
-        data_list = [self.question_qname + f":{question_id}" for question_id in await self.client.lrange(qname, 0, -1)]
-        data = await self.client.mget(data_list)
-        for i in data:
-            temp_list.append(Question.parse_raw(i))
-        return temp_list
+        data = await self.client.hvals(self.question_qname)
+        return [Question.parse_raw(i) for i in data]
 
     async def get_all_question_id_list(self) -> List[str]:
-        qname = self.question_qname + ":id_list"
-        return await self.client.lrange(qname, 0, -1)
+        return await self.client.hkeys(self.question_qname)
 
     async def get_one_question(self, question_id: int) -> Question:
-        qname = f"{self.question_qname}:{question_id}"
-        data = await self.client.get(qname)
+        data = await self.client.hget(self.question_qname, str(question_id))
         json_data = str(data, encoding="utf-8")
         return Question.parse_raw(json_data)
 
     async def get_one_answer(self, answer_id: int) -> Answer:
-        qname = f"{self.answer_qname}:{answer_id}"
-        data = await self.client.get(qname)
+        data = await self.client.hget(self.answer_qname, str(answer_id))
         json_data = str(data, encoding="utf-8")
         return Answer.parse_raw(json_data)
 
     async def add_question(self, question_list: List[Question] = None) -> int:
         if not question_list:
             return 0
-        for question in question_list:
-            await self.client.set(f"{self.question_qname}:{question.question_id}", question.json())
-        question_id_list = [question.question_id for question in question_list]
-        await self.client.lpush(f"{self.question_qname}:id_list", *question_id_list)
-        return await self.client.llen(f"{self.question_qname}:id_list")
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(self.question_qname, mapping={str(i.question_id): i.json() for i in question_list})
+            pipe.hlen(self.question_qname)
+            _, count = await pipe.execute()
+        return count
+
+    async def add_answer(self, answer_list: List[Answer] = None) -> int:
+        if not answer_list:
+            return 0
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(self.answer_qname, mapping={str(i.answer_id): i.json() for i in answer_list})
+            pipe.hlen(self.answer_qname)
+            _, count = await pipe.execute()
+        return count
+
+    async def _del_legacy(self, qname: str):
+        """删除旧版本按 ID 分开保存的 key，只在存在旧版本 ID 列表时扫描一次"""
+        if not await self.client.exists(f"{qname}:id_list"):
+            return
+        keys = []
+        async for key in self.client.scan_iter(match=f"{qname}:*", count=1000):
+            keys.append(key)
+            if len(keys) >= 1000:
+                await self.client.unlink(*keys)
+                keys.clear()
+        if keys:
+            await self.client.unlink(*keys)
 
     async def del_all_question(self):
-        keys = await self.client.keys(f"{self.question_qname}*")
-        if keys is not None:
-            for key in keys:
-                await self.client.delete(key)
+        await self._del_legacy(self.question_qname)
+        await self.client.unlink(self.question_qname)
 
     async def del_all_answer(self):
-        keys = await self.client.keys(f"{self.answer_qname}*")
-        if keys is not None:
-            for key in keys:
-                await self.client.delete(key)
+        await self._del_legacy(self.answer_qname)
+        await self.client.unlink(self.answer_qname)
 
-    async def add_answer(self, answer_list: List[Answer] = None) -> int:
-        if not answer_list:
-            return 0
-        for answer in answer_list:
-            await self.client.set(f"{self.answer_qname}:{answer.answer_id}", answer.json())
-        answer_id_list = [answer.answer_id for answer in answer_list]
-        await self.client.lpush(f"{self.answer_qname}:id_list", *answer_id_list)
-        return await self.client.llen(f"{self.answer_qname}:id_list")
+    async def replace_all(self, question_list: List[Question], answer_list: List[Answer]) -> int:
+        """在一个事务中替换全部问题与答案
+
+        :return: 已经缓存问题的数量
+        """
+        await self._del_legacy(self.question_qname)
+        await self._del_legacy(self.answer_qname)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.unlink(self.question_qname, self.answer_qname)
+            if question_list:
+                pipe.hset(self.question_qname, mapping={str(i.question_id): i.json() for i in question_list})
+            if answer_list:
+                pipe.hset(self.answer_qname, mapping={str(i.answer_id): i.json() for i in answer_list})
+            pipe.hlen(self.question_qname)
+            result = await pipe.execute()
+        return result[-1]
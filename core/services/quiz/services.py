@@ -41,12 +41,8 @@ class QuizService(BaseService):
         # 只允许一个线程访问该区域 让数据被安全有效的访问
         async with self.lock:
             question_list = await self.get_quiz_from_database()
-            await self._cache.del_all_question()
-            question_count = await self._cache.add_question(question_list)
-            await self._cache.del_all_answer()
-            for question in question_list:
-                await self._cache.add_answer(question.answers)
-            return question_count
+            answer_list = [answer for question in question_list for answer in question.answers]
+            return await self._cache.replace_all(question_list, answer_list)
 
     async def get_question_id_list(self) -> List[int]:
         return [int(question_id) for question_id in await self._cache.get_all_question_id_list()]
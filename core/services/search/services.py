@@ -1,14 +1,13 @@
 import asyncio
 import heapq
-import itertools
 import json
 import os
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Type
 
 import aiofiles
-from async_lru import alru_cache
 
 from core.base_service import BaseService
 from core.services.search.models import BaseEntry, StrategyEntry, StrategyEntryList, WeaponEntry, WeaponsEntry
@@ -19,13 +18,102 @@ __all__ = ("SearchServices",)
 ENTRY_DAYA_PATH = PROJECT_ROOT.joinpath("data", "entry")
 ENTRY_DAYA_PATH.mkdir(parents=True, exist_ok=True)
 
+ENTRY_TYPES: Dict[str, Type[BaseEntry]] = {"weapon": WeaponEntry, "strategy": StrategyEntry}
+
+
+def _tokens(text: str, query: bool = False) -> Set[str]:
+    """条目文本索引单字与双字，查询文本长度大于 1 时只使用双字"""
+    text = str.casefold(text)
+    chars = [char for char in text if not char.isspace()]
+    bigrams = {a + b for a, b in zip(chars, chars[1:])}
+    if query and bigrams:
+        return bigrams
+    return bigrams | set(chars)
+
+
+class SearchIndex:
+    """条目的只读快照与倒排索引
+
+    写入时构建新的快照再整体替换，读取时不需要加锁。
+    """
+
+    __slots__ = ("generation", "entries", "postings", "_counts")
+
+    COUNTS_CACHE_SIZE = 256
+
+    def __init__(self, entries: Tuple[BaseEntry, ...] = (), generation: int = 0):
+        self.generation = generation
+        self.entries = entries
+        self._counts: "OrderedDict[str, Tuple[FrozenSet[str], Dict[int, int]]]" = OrderedDict()
+        postings: Dict[str, Set[int]] = {}
+        for idx, entry in enumerate(entries):
+            for token in self.entry_tokens(entry):
+                postings.setdefault(token, set()).add(idx)
+        self.postings: Dict[str, FrozenSet[int]] = {key: frozenset(value) for key, value in postings.items()}
+
+    @staticmethod
+    def entry_tokens(entry: BaseEntry) -> Set[str]:
+        tokens = _tokens(entry.title)
+        for tag in entry.tags or ():
+            tokens |= _tokens(tag)
+        if entry.description:
+            tokens |= _tokens(entry.description)
+        return tokens
+
+    def counts(self, search_query: str) -> Dict[int, int]:
+        """每个条目命中的查询 token 数量
+
+        inline 查询逐字输入，当前查询的 token 通常包含上一次查询的全部 token，
+        这时在最长的已缓存前缀的计数上只累加新增 token 的命中。
+        """
+        tokens = frozenset(_tokens(search_query, query=True))
+        base_tokens: FrozenSet[str] = frozenset()
+        counter: Dict[int, int] = {}
+        for end in range(len(search_query) - 1, 0, -1):
+            cached = self._counts.get(search_query[:end])
+            if cached is not None and cached[0] <= tokens:
+                base_tokens, counter = cached[0], dict(cached[1])
+                break
+        for token in tokens - base_tokens:
+            for idx in self.postings.get(token, ()):
+                counter[idx] = counter.get(idx, 0) + 1
+        self._counts[search_query] = (tokens, counter)
+        while len(self._counts) > self.COUNTS_CACHE_SIZE:
+            self._counts.popitem(last=False)
+        return counter
+
+    def candidates(self, search_query: str, limit: int) -> List[BaseEntry]:
+        """按命中的 token 数量筛选候选条目"""
+        counter = self.counts(search_query)
+        if len(counter) > limit:
+            ids = heapq.nlargest(limit, counter, key=counter.__getitem__)
+        else:
+            ids = list(counter)
+        return [self.entries[idx] for idx in ids]
+
 
 class SearchServices(BaseService):
+    """条目搜索服务
+
+    条目按 key 存储，每次修改都会增加 ``generation``，在写锁内重建索引快照并使查询缓存失效。
+    修改以追加日志的形式写入 ``entry.jsonl``，``save_entry`` 时再压缩日志。
+    查询缓存以原始查询文本为 key（打分区分大小写与空白），保存完整排序，不同 ``amount`` 共用一份；
+    未命中时由索引快照复用最长前缀的候选计数，逐字输入的 inline 查询只需要查找新增的 token。
+    """
+
+    CANDIDATE_LIMIT = 100
+    QUERY_CACHE_SIZE = 256
+
     def __init__(self):
-        self._lock = asyncio.Lock()  # 访问和修改操作成员变量必须加锁操作
-        self.weapons: List[WeaponEntry] = []
-        self.strategy: List[StrategyEntry] = []
+        self._lock = asyncio.Lock()  # 修改操作成员变量必须加锁操作，读取使用 self._index 快照
+        self._entries: Dict[str, BaseEntry] = {}
+        self._index = SearchIndex()
+        self.generation = 0
+        self._query_cache: "OrderedDict[str, List[BaseEntry]]" = OrderedDict()
         self.entry_data_path: Path = ENTRY_DAYA_PATH
+        self.entry_log_path = self.entry_data_path / "entry.jsonl"
+        self._log_lines = 0
+        # 旧版本的全量保存文件，加载后在下次压缩日志时删除
         self.weapons_entry_data_path = self.entry_data_path / "weapon.json"
         self.strategy_entry_data_path = self.entry_data_path / "strategy.json"
         self.replace_time: Dict[str, float] = {}
@@ -36,34 +124,72 @@ class SearchServices(BaseService):
             return json.loads(await f.read())
 
     @staticmethod
-    async def save_json(path, data):
-        async with aiofiles.open(path, "w", encoding="utf-8") as f:
-            await f.write(data)
+    def get_entry_type(entry: BaseEntry) -> Optional[str]:
+        for name, entry_type in ENTRY_TYPES.items():
+            if isinstance(entry, entry_type):
+                return name
+        return None
+
+    @classmethod
+    def dump_entry(cls, entry: BaseEntry) -> str:
+        return json.dumps({"op": "put", "type": cls.get_entry_type(entry), "entry": entry.dict()}, ensure_ascii=False)
+
+    async def _changed(self):
+        """条目被修改，使查询缓存失效并在线程池中重建索引快照，调用时必须持有写锁"""
+        self.generation += 1
+        self._query_cache.clear()
+        loop = asyncio.get_running_loop()
+        self._index = await loop.run_in_executor(None, SearchIndex, tuple(self._entries.values()), self.generation)
+
+    async def _append_log(self, *lines: str):
+        async with aiofiles.open(self.entry_log_path, "a", encoding="utf-8") as f:
+            await f.write("".join(f"{line}\n" for line in lines))
+        self._log_lines += len(lines)
 
     async def load_data(self):
         async with self._lock:
             if self.weapons_entry_data_path.exists():
-                weapon_json = await self.load_json(self.weapons_entry_data_path)
-                weapons = WeaponsEntry.parse_obj(weapon_json)
-                for weapon in weapons.data:
-                    self.weapons.append(weapon.copy())
+                weapons = WeaponsEntry.parse_obj(await self.load_json(self.weapons_entry_data_path))
+                for weapon in weapons.data or []:
+                    self._entries[weapon.key] = weapon
             if self.strategy_entry_data_path.exists():
-                strategy_json = await self.load_json(self.strategy_entry_data_path)
-                strategy = StrategyEntryList.parse_obj(strategy_json)
-                for strategy in strategy.data:
-                    self.strategy.append(strategy.copy())
+                strategy_list = StrategyEntryList.parse_obj(await self.load_json(self.strategy_entry_data_path))
+                for strategy in strategy_list.data or []:
+                    self._entries[strategy.key] = strategy
+            if self.entry_log_path.exists():
+                async with aiofiles.open(self.entry_log_path, "r", encoding="utf-8") as f:
+                    async for line in f:
+                        if not line.strip():
+                            continue
+                        self._log_lines += 1
+                        try:
+                            data = json.loads(line)
+                        except ValueError:
+                            continue  # 写入中断导致的不完整记录
+                        if data["op"] == "clear":
+                            self._entries.clear()
+                        elif data["op"] == "put" and (entry_type := ENTRY_TYPES.get(data["type"])):
+                            entry = entry_type.parse_obj(data["entry"])
+                            self._entries[entry.key] = entry
+            await self._changed()
 
     async def save_entry(self) -> None:
-        """保存条目
+        """压缩条目日志，只保留每个条目的最新记录
         :return: None
         """
         async with self._lock:
-            if len(self.weapons) > 0:
-                weapons = WeaponsEntry(data=self.weapons)
-                await self.save_json(self.weapons_entry_data_path, weapons.json())
-            if len(self.strategy) > 0:
-                strategy = StrategyEntryList(data=self.strategy)
-                await self.save_json(self.strategy_entry_data_path, strategy.json())
+            legacy = self.weapons_entry_data_path.exists() or self.strategy_entry_data_path.exists()
+            if not legacy and self._log_lines <= len(self._entries):
+                return
+            temp_path = self.entry_log_path.with_suffix(".tmp")
+            lines = [self.dump_entry(entry) for entry in self._entries.values()]
+            async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
+                await f.write("".join(f"{line}\n" for line in lines))
+            os.replace(temp_path, self.entry_log_path)
+            self._log_lines = len(lines)
+            for path in (self.weapons_entry_data_path, self.strategy_entry_data_path):
+                if path.exists():
+                    os.remove(path)
 
     async def add_entry(self, entry: BaseEntry, update: bool = False, ttl: int = 3600):
         """添加条目
@@ -72,47 +198,40 @@ class SearchServices(BaseService):
         :param ttl: 条目存在时需要多久时间覆盖
         :return: None
         """
+        if self.get_entry_type(entry) is None:
+            return
         async with self._lock:
-            replace_time = self.replace_time.get(entry.key)
-            if replace_time and replace_time <= time.time() + ttl:
-                return
-            if isinstance(entry, WeaponEntry):
-                for index, value in enumerate(self.weapons):
-                    if value.key == entry.key:
-                        if update:
-                            self.replace_time[entry.key] = time.time()
-                            self.weapons[index] = entry
-                        break
-                else:
-                    self.weapons.append(entry)
-            elif isinstance(entry, StrategyEntry):
-                for index, value in enumerate(self.strategy):
-                    if value.key == entry.key:
-                        if update:
-                            self.replace_time[entry.key] = time.time()
-                            self.strategy[index] = entry
-                        break
-                else:
-                    self.strategy.append(entry)
+            if entry.key in self._entries:
+                if not update:
+                    return
+                replace_time = self.replace_time.get(entry.key)
+                if replace_time and replace_time + ttl > time.time():
+                    return
+                self.replace_time[entry.key] = time.time()
+            self._entries[entry.key] = entry
+            await self._changed()
+            await self._append_log(self.dump_entry(entry))
 
     async def remove_all_entry(self):
         """移除全部条目
         :return: None
         """
         async with self._lock:
-            self.weapons = []
-            if self.weapons_entry_data_path.exists():
-                os.remove(self.weapons_entry_data_path)
-            self.strategy = []
-            if self.strategy_entry_data_path.exists():
-                os.remove(self.strategy_entry_data_path)
+            self._entries.clear()
+            self.replace_time.clear()
+            await self._changed()
+            for path in (self.entry_log_path, self.weapons_entry_data_path, self.strategy_entry_data_path):
+                if path.exists():
+                    os.remove(path)
+            self._log_lines = 0
 
     @staticmethod
-    def _sort_key(entry: BaseEntry, search_query: str) -> float:
-        return entry.compare_to_query(search_query)
+    def _rank(entries: Iterable[BaseEntry], search_query: str) -> List[BaseEntry]:
+        return sorted(entries, key=lambda entry: entry.compare_to_query(search_query), reverse=True)
 
-    @alru_cache(maxsize=64)
-    async def multi_search_combinations(self, search_queries: Tuple[str], results_per_query: int = 3):
+    async def multi_search_combinations(
+        self, search_queries: Tuple[str], results_per_query: int = 3
+    ) -> Dict[str, List[BaseEntry]]:
         """多个关键词搜索
         :param search_queries: 搜索文本
         :param results_per_query: 约定返回的数目
@@ -123,29 +242,29 @@ class SearchServices(BaseService):
         for query in effective_queries:
             if res := await self.search(search_query=query, amount=results_per_query):
                 results[query] = res
+        return results
 
-    @alru_cache(maxsize=64)
     async def search(self, search_query: Optional[str], amount: int = None) -> Optional[List[BaseEntry]]:
         """在所有可用条目中搜索适当的结果
         :param search_query: 搜索文本
         :param amount: 约定返回的数目
         :return: 搜索结果
         """
-        # search_entries: Iterable[BaseEntry] = []
-        async with self._lock:
-            search_entries = itertools.chain(self.weapons, self.strategy)
-
-            if not search_query:
-                return search_entries if isinstance(search_entries, list) else list(search_entries)
-
-            if not amount:
-                return sorted(
-                    search_entries,
-                    key=lambda entry: self._sort_key(entry, search_query),  # type: ignore
-                    reverse=True,
-                )
-            return heapq.nlargest(
-                amount,
-                search_entries,
-                key=lambda entry: self._sort_key(entry, search_query),  # type: ignore[arg-type]
-            )
+        index = self._index
+        if not search_query:
+            return list(index.entries)
+        if (results := self._query_cache.get(search_query)) is not None:
+            self._query_cache.move_to_end(search_query)
+            return results[:amount] if amount else list(results)
+        candidates = index.candidates(search_query, self.CANDIDATE_LIMIT)
+        if not candidates:
+            results = []
+        else:
+            # 模糊匹配打分是 CPU 密集操作，放到线程池中执行
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(None, self._rank, candidates, search_query)
+        if index.generation == self.generation:  # 打分期间条目没有被修改才写入缓存
+            self._query_cache[search_query] = results
+            while len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return results[:amount] if amount else list(results)
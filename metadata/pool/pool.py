@@ -1,3 +1,9 @@
+import bisect
+import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from simnet.models.base import add_timezone
+
 from metadata.pool.pool_100 import POOL_100
 from metadata.pool.pool_200 import POOL_200
 from metadata.pool.pool_301 import POOL_301
@@ -6,6 +12,21 @@ from metadata.pool.pool_500 import POOL_500
 from metadata.pool.pool_1000 import POOL_1000
 from metadata.pool.pool_2000 import POOL_2000
 
+__all__ = (
+    "POOL_100",
+    "POOL_200",
+    "POOL_301",
+    "POOL_302",
+    "POOL_500",
+    "POOL_1000",
+    "POOL_2000",
+    "Banner",
+    "BannerCatalogue",
+    "get_pool_by_id",
+    "get_banners",
+    "get_banner_at",
+)
+
 
 def get_pool_by_id(pool_type):
     if pool_type == 100:
@@ -23,3 +44,88 @@ def get_pool_by_id(pool_type):
     if pool_type == 2000:
         return POOL_2000
     return None
+
+
+class Banner:
+    """预先解析好时间的卡池"""
+
+    __slots__ = ("name", "five", "four", "five_set", "four_set", "from_", "to", "from_time", "to_time", "data")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.name: str = data["name"]
+        self.five: Tuple[str, ...] = tuple(data["five"])
+        self.four: Tuple[str, ...] = tuple(data["four"])
+        self.five_set: FrozenSet[str] = frozenset(self.five)
+        self.four_set: FrozenSet[str] = frozenset(self.four)
+        self.from_: str = data["from"]
+        self.to: str = data["to"]
+        self.from_time = add_timezone(datetime.datetime.strptime(self.from_, "%Y-%m-%d %H:%M:%S"))
+        self.to_time = add_timezone(datetime.datetime.strptime(self.to, "%Y-%m-%d %H:%M:%S"))
+        self.data = data
+        """原始数据，集录祈愿等卡池的额外字段从这里获取"""
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.five_set or name in self.four_set
+
+    def __repr__(self) -> str:
+        return f"<Banner {self.name} {self.from_} ~ {self.to}>"
+
+
+class BannerCatalogue:
+    """预先编译的卡池列表，按时间查询时二分查找"""
+
+    __slots__ = ("banners", "_sorted", "_starts", "_max_end")
+
+    def __init__(self, pool: List[Dict[str, Any]]):
+        self.banners: Tuple[Banner, ...] = tuple(Banner(i) for i in pool)
+        """与原始数据顺序相同，最新的卡池在前"""
+        self._sorted = sorted(self.banners, key=lambda x: x.from_time)
+        self._starts = [i.from_time for i in self._sorted]
+        self._max_end = []
+        for banner in self._sorted:
+            self._max_end.append(max(self._max_end[-1], banner.to_time) if self._max_end else banner.to_time)
+
+    def __iter__(self):
+        return iter(self.banners)
+
+    def __len__(self) -> int:
+        return len(self.banners)
+
+    def get_all_at(self, time: datetime.datetime) -> List[Banner]:
+        """获取在 ``time`` 时开放的全部卡池，按开始时间倒序"""
+        result = []
+        idx = bisect.bisect_right(self._starts, time) - 1
+        # 卡池之间很少重叠，往前找到结束时间都早于 time 时停止
+        while idx >= 0 and self._max_end[idx] >= time:
+            if self._sorted[idx].to_time >= time:
+                result.append(self._sorted[idx])
+            idx -= 1
+        return result
+
+    def get_at(self, time: datetime.datetime) -> Optional[Banner]:
+        """获取在 ``time`` 时开放的卡池，有多个时返回最晚开始的"""
+        banners = self.get_all_at(time)
+        return banners[0] if banners else None
+
+
+_CATALOGUES: Dict[int, BannerCatalogue] = {
+    100: BannerCatalogue(POOL_100),
+    200: BannerCatalogue(POOL_200),
+    301: BannerCatalogue(POOL_301),
+    302: BannerCatalogue(POOL_302),
+    500: BannerCatalogue(POOL_500),
+    1000: BannerCatalogue(POOL_1000),
+    2000: BannerCatalogue(POOL_2000),
+}
+_CATALOGUES[400] = _CATALOGUES[301]
+
+
+def get_banners(pool_type: int) -> Optional[BannerCatalogue]:
+    """获取预先编译的卡池列表，顺序与 ``get_pool_by_id`` 相同"""
+    return _CATALOGUES.get(pool_type)
+
+
+def get_banner_at(pool_type: int, time: datetime.datetime) -> Optional[Banner]:
+    """获取 ``time`` 时该类型开放的卡池"""
+    catalogue = _CATALOGUES.get(pool_type)
+    return None if catalogue is None else catalogue.get_at(time)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import functools
-from typing import List
+from typing import Dict, Iterable, List, Tuple
 
 __all__ = [
     "roles",
@@ -15,9 +15,13 @@ __all__ = [
     "elementsToColor",
     "not_real_roles",
     "roleToTag",
+    "refresh_index",
+    "searchRoles",
+    "searchWeapons",
 ]
 
 from core.dependence.assets.impl.genshin import AssetsService
+from utils.fuzzy import FuzzyIndex
 
 # noinspection SpellCheckingInspection
 roles = {
@@ -1007,7 +1011,106 @@ elementsToColor = {
 }
 
 
-@functools.lru_cache()
+def _build_role_index() -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """构建角色昵称索引，同一个昵称对应多个角色时以先出现的为准"""
+    alias_to_id: Dict[str, int] = {}
+    name_to_tags: Dict[str, List[str]] = {}
+    for cid, value in roles.items():
+        name_to_tags.setdefault(value[0], value)
+        for name in value:
+            alias_to_id.setdefault(str.casefold(name), cid)
+    return alias_to_id, name_to_tags
+
+
+def _build_weapon_index() -> Dict[str, str]:
+    """构建武器昵称索引，同一个昵称对应多个武器时以先出现的为准"""
+    alias_to_name: Dict[str, str] = {}
+    for key, value in weapons.items():
+        alias_to_name.setdefault(key, key)
+        for name in value:
+            alias_to_name.setdefault(name, key)
+    return alias_to_name
+
+
+def _build_role_search_index() -> FuzzyIndex[int]:
+    index: FuzzyIndex[int] = FuzzyIndex()
+    for cid, value in roles.items():
+        index.update((name, cid) for name in value)
+    return index
+
+
+def _build_weapon_search_index(asset_names: Iterable[str] = ()) -> FuzzyIndex[str]:
+    index: FuzzyIndex[str] = FuzzyIndex()
+    index.update(_weapon_alias_to_name.items())
+    index.update((name, name) for name in asset_names)
+    return index
+
+
+_role_alias_to_id, _role_name_to_tags = _build_role_index()
+_weapon_alias_to_name = _build_weapon_index()
+_role_search_index = _build_role_search_index()
+
+
+class _WeaponIdIndex:
+    """武器正式名到 ID 的索引，资源刷新后自动重建"""
+
+    def __init__(self):
+        self._source = None
+        self._size = 0
+        self._name_to_id: Dict[str, int] = {}
+        self._search_index: FuzzyIndex[str] | None = None
+
+    def clear(self):
+        self._source = None
+        self._size = 0
+        self._name_to_id = {}
+        self._search_index = None
+        self.fuzzy.cache_clear()
+
+    def get_items(self) -> Dict:
+        items = AssetsService.weapon.get_instance().all_items_name
+        if items is not self._source or len(items) != self._size:
+            self._name_to_id = {key: int(value.id) for key, value in items.items()}
+            self._source = items
+            self._size = len(items)
+            self._search_index = None
+            self.fuzzy.cache_clear()
+        return items
+
+    def get_search_index(self) -> FuzzyIndex[str]:
+        """武器昵称与资源中的武器名的模糊搜索索引"""
+        try:
+            items = self.get_items()
+        except Exception:  # skipcq: PYL-W0703
+            items = {}  # 资源未初始化时只使用昵称数据
+        if self._search_index is None:
+            self._search_index = _build_weapon_search_index(items.keys())
+        return self._search_index
+
+    def get(self, name: str) -> int | None:
+        self.get_items()
+        if (wid := self._name_to_id.get(name)) is not None:
+            return wid
+        return self.fuzzy(name)
+
+    @functools.lru_cache(maxsize=256)  # noqa: B019
+    def fuzzy(self, name: str) -> int | None:
+        """模糊匹配，返回第一个包含该名称的武器"""
+        return next((wid for key, wid in self._name_to_id.items() if name in key), None)
+
+
+_weapon_id_index = _WeaponIdIndex()
+
+
+def refresh_index():
+    """重新构建昵称索引，修改昵称数据或刷新资源后调用"""
+    global _role_alias_to_id, _role_name_to_tags, _weapon_alias_to_name, _role_search_index  # pylint: disable=W0603
+    _role_alias_to_id, _role_name_to_tags = _build_role_index()
+    _weapon_alias_to_name = _build_weapon_index()
+    _role_search_index = _build_role_search_index()
+    _weapon_id_index.clear()
+
+
 def elementToName(elem: str) -> str | None:
     """将元素昵称转为正式名"""
     elem = str.casefold(elem)  # 忽略大小写
@@ -1015,52 +1118,52 @@ def elementToName(elem: str) -> str | None:
 
 
 # noinspection PyPep8Naming
-@functools.lru_cache()
-def roleToName(shortname: str) -> str:
-    """将角色昵称转为正式名"""
+def roleToName(shortname: str, fuzzy: bool = False) -> str:
+    """将角色昵称转为正式名
+
+    :param shortname: 角色昵称
+    :param fuzzy: 找不到时是否使用模糊搜索的最佳结果，没有足够相近的结果时仍返回原昵称
+    """
     shortname = str.casefold(shortname)  # 忽略大小写
-    return next((value[0] for value in roles.values() for name in value if name == shortname), shortname)
+    cid = _role_alias_to_id.get(shortname)
+    if cid is None and fuzzy and (results := _role_search_index.search(shortname, limit=1)):
+        cid = results[0][0]
+    return shortname if cid is None else roles[cid][0]
 
 
 # noinspection PyPep8Naming
-@functools.lru_cache()
 def roleToId(name: str) -> int | None:
     """获取角色ID"""
-    name = str.casefold(name)
-    return next((key for key, value in roles.items() for n in value if n == name), None)
+    return _role_alias_to_id.get(str.casefold(name))
 
 
 # noinspection PyPep8Naming
-@functools.lru_cache()
 def idToName(cid: int) -> str | None:
     """从角色ID获取正式名"""
     return roles[cid][0] if cid in roles else None
 
 
 # noinspection PyPep8Naming
-@functools.lru_cache()
-def weaponToName(shortname: str) -> str:
-    """将武器昵称转为正式名"""
-    return next((key for key, value in weapons.items() if shortname == key or shortname in value), shortname)
+def weaponToName(shortname: str, fuzzy: bool = False) -> str:
+    """将武器昵称转为正式名
+
+    :param shortname: 武器昵称
+    :param fuzzy: 找不到时是否使用模糊搜索的最佳结果，没有足够相近的结果时仍返回原昵称
+    """
+    name = _weapon_alias_to_name.get(shortname)
+    if name is None and fuzzy and (results := _weapon_id_index.get_search_index().search(shortname, limit=1)):
+        name = results[0][0]
+    return shortname if name is None else name
 
 
 # noinspection PyPep8Naming
-@functools.lru_cache()
 def weaponToId(name: str) -> int | None:
-    """获取武器ID"""
-    return next(
-        (
-            int(value.id)
-            for key, value in AssetsService.weapon.get_instance().all_items_name.items()
-            if weaponToName(name) in key
-        ),
-        None,
-    )
+    """获取武器ID，优先精确匹配正式名，找不到时再模糊匹配"""
+    return _weapon_id_index.get(weaponToName(name))
 
 
 # noinspection PyPep8Naming
-@functools.lru_cache()
 def roleToTag(role_name: str) -> List[str]:
     """通过角色名获取TAG"""
     role_name = str.casefold(role_name)
-    return next((value for value in roles.values() if value[0] == role_name), [role_name])
+    return _role_name_to_tags.get(role_name, [role_name])
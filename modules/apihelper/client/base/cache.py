@@ -0,0 +1,147 @@
+"""公共接口的响应缓存
+
+同一个 key 的并发请求只会向上游发起一次（single-flight），结果在 ``ttl`` 秒内直接返回，
+过期后 ``stale_ttl`` 秒内仍会先返回旧数据，同时在后台刷新（stale-while-revalidate）。
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TYPE_CHECKING
+
+from ...logger import logger
+
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+__all__ = ("RequestCache", "request_cache", "cached_request")
+
+
+class RequestCache:
+    """single-flight + TTL 响应缓存，可选 Redis 作为二级缓存"""
+
+    def __init__(self, maxsize: int = 512, qname: str = "apihelper:request_cache"):
+        self.maxsize = maxsize
+        self.qname = qname
+        self._data: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+        self._redis: Optional["Redis"] = None
+
+    def set_redis(self, redis: Optional["Redis"]):
+        self._redis = redis
+
+    @staticmethod
+    def make_key(method: str, url: str, **kwargs) -> str:
+        raw = jsonlib.dumps([method, url, kwargs], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()  # nosec B303
+
+    def clear(self):
+        self._data.clear()
+
+    def _set_local(self, key: str, value: Any, expires: float, stale_until: float):
+        self._data[key] = (value, expires, stale_until)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(f"{self.qname}:{key}")
+        except Exception as exc:  # skipcq: PYL-W0703
+            logger.warning("读取请求缓存失败 %s", str(exc))
+            return None
+        if data is None:
+            return None
+        value, expires, stale_until = jsonlib.loads(data)
+        return value, expires, stale_until
+
+    async def _set_remote(self, key: str, value: Any, expires: float, stale_until: float):
+        if self._redis is None:
+            return
+        try:
+            ex = max(int(stale_until - time.time()), 1)
+            await self._redis.set(f"{self.qname}:{key}", jsonlib.dumps([value, expires, stale_until]), ex=ex)
+        except Exception as exc:  # skipcq: PYL-W0703
+            logger.warning("写入请求缓存失败 %s", str(exc))
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float) -> Any:
+        value = await fetch()
+        expires = time.time() + ttl
+        stale_until = expires + stale_ttl
+        self._set_local(key, value, expires, stale_until)
+        await self._set_remote(key, value, expires, stale_until)
+        return value
+
+    def _fetch_once(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float
+    ) -> "asyncio.Task":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch, ttl, stale_ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float):
+        def _done(_task: "asyncio.Task"):
+            if not _task.cancelled() and _task.exception() is not None:
+                logger.warning("后台刷新请求缓存失败 %s", repr(_task.exception()))
+
+        self._fetch_once(key, fetch, ttl, stale_ttl).add_done_callback(_done)
+
+    async def get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float = 0
+    ) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            entry = await self._get_remote(key)
+            if entry is not None:
+                self._set_local(key, *entry)
+        if entry is not None:
+            value, expires, stale_until = entry
+            now = time.time()
+            if now < expires:
+                return copy.deepcopy(value)
+            if now < stale_until:
+                self._revalidate(key, fetch, ttl, stale_ttl)
+                return copy.deepcopy(value)
+        value = await asyncio.shield(self._fetch_once(key, fetch, ttl, stale_ttl))
+        return copy.deepcopy(value)
+
+
+request_cache = RequestCache()
+
+
+def cached_request(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """为 ``HyperionRequest.get/post`` 增加 ``cache_ttl`` 与 ``cache_stale_ttl`` 参数
+
+    只应该用于与用户无关的公共接口，缓存的 key 由请求方法、URL 与参数组成，不包含请求头。
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, url: str, *args, cache_ttl: float = 0, cache_stale_ttl: float = 0, **kwargs):
+        if not cache_ttl or args or not kwargs.get("de_json", True):
+            return await func(self, url, *args, **kwargs)
+        key = request_cache.make_key(
+            func.__name__,
+            str(url),
+            params=kwargs.get("params"),
+            data=kwargs.get("data"),
+            json=kwargs.get("json"),
+            re_json_data=kwargs.get("re_json_data", False),
+        )
+        return await request_cache.get_or_fetch(
+            key, functools.partial(func, self, url, **kwargs), cache_ttl, cache_stale_ttl
+        )
+
+    return wrapper
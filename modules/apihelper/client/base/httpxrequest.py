@@ -2,24 +2,14 @@ from contextlib import AbstractAsyncContextManager
 from types import TracebackType
 from typing import Optional, Type
 
-import httpx
+from utils.http_client import HTTPClientPool, timeout
 
 __all__ = ("HTTPXRequest",)
 
-from core.config import config
-
-timeout = httpx.Timeout(
-    timeout=config.timeout,
-    read=config.read_timeout,
-    write=config.write_timeout,
-    connect=config.connect_timeout,
-    pool=config.pool_timeout,
-)
-
 
 class HTTPXRequest(AbstractAsyncContextManager):
     def __init__(self, *args, headers=None, **kwargs):
-        self._client = httpx.AsyncClient(headers=headers, *args, **kwargs)
+        self._client = HTTPClientPool.create_client(headers=headers, *args, **kwargs)
 
     async def __aenter__(self):
         try:
@@ -36,7 +26,7 @@ class HTTPXRequest(AbstractAsyncContextManager):
 
     async def initialize(self):
         if self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=timeout)
+            self._client = HTTPClientPool.create_client(timeout=timeout)
 
     async def shutdown(self):
         if self._client.is_closed:
@@ -3,6 +3,7 @@ from typing import Union
 import httpx
 from httpx import Response
 
+from .cache import cached_request
 from .httpxrequest import HTTPXRequest
 from ...error import NetworkException, ResponseException, APIHelperTimedOut
 from ...typedefs import POST_DATA, JSON_DATA
@@ -11,6 +12,7 @@ __all__ = ("HyperionRequest",)
 
 
 class HyperionRequest(HTTPXRequest):
+    @cached_request
     async def get(
         self, url: str, *args, de_json: bool = True, re_json_data: bool = False, **kwargs
     ) -> Union[POST_DATA, JSON_DATA, Response]:
@@ -38,6 +40,7 @@ class HyperionRequest(HTTPXRequest):
             return data
         return json_data
 
+    @cached_request
     async def post(
         self, url: str, *args, de_json: bool = True, re_json_data: bool = False, **kwargs
     ) -> Union[POST_DATA, JSON_DATA, Response]:
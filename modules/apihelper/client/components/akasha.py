@@ -2,8 +2,6 @@ from types import TracebackType
 from typing import Optional, Type, List
 from urllib.parse import unquote
 
-import httpx
-
 from gram_core.basemodel import Settings
 from modules.apihelper.models.genshin.akasha import (
     AkashaRank,
@@ -12,6 +10,7 @@ from modules.apihelper.models.genshin.akasha import (
     AkashaSubStat,
     AkashaArtifact,
 )
+from utils.http_client import HTTPClientPool
 
 BASE_URL = "https://akasha.cv/api"
 MAIN_API = BASE_URL + "/filters/accounts/"
@@ -68,7 +67,7 @@ class Akasha:
         headers = {
             "User-Agent": self.config.akasha_api_agent,
         }
-        self.client = httpx.AsyncClient(timeout=60, headers=headers)
+        self.client = HTTPClientPool.create_client(timeout=60, headers=headers)
         self.session_id = None
 
     async def get_session_id(self) -> Optional[str]:
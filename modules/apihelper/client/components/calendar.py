@@ -2,10 +2,10 @@ import re
 from datetime import datetime, timedelta
 from typing import List, Tuple, Optional, Dict, Union
 
-from httpx import AsyncClient
-
 from core.dependence.assets.impl.genshin import AssetsService, AssetsCouldNotFound
 from metadata.shortname import roleToId
+from modules.apihelper.client.base.hyperionrequest import HyperionRequest
+from modules.apihelper.error import APIHelperException
 from modules.apihelper.models.genshin.calendar import Date, FinalAct, ActEnum, ActDetail, ActTime, BirthChar
 from utils.log import logger
 
@@ -40,7 +40,7 @@ class Calendar:
     FULL_TIME_RE = re.compile(r"(魔神任务)")
 
     def __init__(self):
-        self.client = AsyncClient()
+        self.client = HyperionRequest()
 
     @staticmethod
     async def async_gen_birthday_list() -> Dict[str, List[str]]:
@@ -66,10 +66,16 @@ class Calendar:
     async def parse_official_content_date(self) -> Dict[str, ActTime]:
         """解析官方内容时间"""
         time_map = {}
-        req = await self.client.get(self.ANNOUNCEMENT_CONTENT, params=self.ANNOUNCEMENT_PARAMS)
-        if req.status_code != 200:
+        try:
+            detail_data = await self.client.get(
+                self.ANNOUNCEMENT_CONTENT,
+                params=self.ANNOUNCEMENT_PARAMS,
+                re_json_data=True,
+                cache_ttl=300,
+                cache_stale_ttl=3600,
+            )
+        except APIHelperException:
             return time_map
-        detail_data = req.json()
         for data in detail_data.get("data", {}).get("list", []):
             ann_id = data.get("ann_id", 0)
             title = data.get("title", "")
@@ -96,8 +102,13 @@ class Calendar:
 
     async def req_cal_data(self) -> Tuple[List[List[ActDetail]], Dict[str, ActTime]]:
         """请求日历数据"""
-        list_data = await self.client.get(self.ANNOUNCEMENT_LIST, params=self.ANNOUNCEMENT_PARAMS)
-        list_data = list_data.json()
+        list_data = await self.client.get(
+            self.ANNOUNCEMENT_LIST,
+            params=self.ANNOUNCEMENT_PARAMS,
+            re_json_data=True,
+            cache_ttl=300,
+            cache_stale_ttl=3600,
+        )
 
         new_list_data = [[], [], []]
         for idx, data in enumerate(list_data.get("data", {}).get("list", [])):
@@ -25,16 +25,8 @@ class Gacha:
         self.cache_ttl = 600
 
     async def get_gacha_list_info(self) -> List[GachaInfo]:
-        if self.cache.get("time", 0) + self.cache_ttl < time.time():
-            self.cache.clear()
-        cache = self.cache.get("gacha_list_info")
-        if cache is not None:
-            return cache
-        req = await self.client.get(self.GACHA_LIST_URL)
-        data = [GachaInfo(**i) for i in req["list"]]
-        self.cache["gacha_list_info"] = data
-        self.cache["time"] = time.time()
-        return data
+        req = await self.client.get(self.GACHA_LIST_URL, cache_ttl=self.cache_ttl, cache_stale_ttl=self.cache_ttl)
+        return [GachaInfo(**i) for i in req["list"]]
 
     async def get_gacha_info(self, gacha_id: str) -> dict:
         cache = self.cache.get(gacha_id)
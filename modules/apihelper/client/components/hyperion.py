@@ -183,12 +183,14 @@ class Hyperion(HyperionBase):
 
     async def get_post_full_in_collection(self, collection_id: int, gids: int = 2, order_type=1) -> JSON_DATA:
         params = {"collection_id": collection_id, "gids": gids, "order_type": order_type}
-        response = await self.client.get(url=self.POST_FULL_IN_COLLECTION_URL, params=params)
+        response = await self.client.get(
+            url=self.POST_FULL_IN_COLLECTION_URL, params=params, cache_ttl=600, cache_stale_ttl=3600
+        )
         return response
 
     async def get_post_info(self, gids: int, post_id: int, read: int = 1) -> PostInfo:
         params = {"gids": gids, "post_id": post_id, "read": read}
-        response = await self.client.get(self.POST_FULL_URL, params=params)
+        response = await self.client.get(self.POST_FULL_URL, params=params, cache_ttl=300, cache_stale_ttl=3600)
         return PostInfo.paste_data(response, gids=gids)
 
     async def get_images_by_post_id(self, gids: int, post_id: int) -> List[ArtworkImage]:
@@ -204,7 +206,7 @@ class Hyperion(HyperionBase):
 
     async def get_new_list(self, gids: int, type_id: int, page_size: int = 20, lang: str = "") -> Dict:
         params = {"gids": gids, "page_size": page_size, "type": type_id}
-        return await self.client.get(url=self.GET_NEW_LIST_URL, params=params)
+        return await self.client.get(url=self.GET_NEW_LIST_URL, params=params, cache_ttl=60, cache_stale_ttl=300)
 
     async def get_new_list_recommended_posts(
         self, gids: int, type_id: int, page_size: int = 20, lang: str = ""
@@ -215,7 +217,7 @@ class Hyperion(HyperionBase):
 
     async def get_home_news(self, gids: int) -> Dict:
         params = {"gids": gids}
-        return await self.client.get(url=self.GET_HOME_NEWS_URL, params=params)
+        return await self.client.get(url=self.GET_HOME_NEWS_URL, params=params, cache_ttl=60, cache_stale_ttl=300)
 
     async def get_live_info(self, act_id: str) -> LiveInfo:
         headers = {"x-rpc-act_id": act_id}
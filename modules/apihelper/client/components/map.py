@@ -2,10 +2,11 @@ import json
 from pathlib import Path
 from typing import Dict, Union
 
-from httpx import AsyncClient, HTTPError
+from httpx import HTTPError
 
 from modules.apihelper.models.genshin.map import LabelTree, ListData
 from utils.const import PROJECT_ROOT
+from utils.http_client import HTTPClientPool
 
 MAP_PATH = PROJECT_ROOT.joinpath("data", "apihelper", "map")
 MAP_PATH.mkdir(parents=True, exist_ok=True)
@@ -41,7 +42,7 @@ class MapHelper:
     ]
 
     def __init__(self):
-        self.client = AsyncClient()
+        self.client = HTTPClientPool.create_client()
         self.query_map_path = MAP_PATH / "query_map.json"
         self.label_count_path = MAP_PATH / "label_count.json"
         self.query_map: Dict[str, str] = {}
@@ -1,27 +1,112 @@
-from typing import Dict, Any
+import hashlib
+import os
+from typing import Dict, Any, Optional
 
-from httpx import AsyncClient
+import aiofiles
+from httpx import Timeout
 
 from metadata.scripts.metadatas import RESOURCE_FightPropRule_URL
+from utils.const import CACHE_DIR
+from utils.http_client import HTTPClientPool
 from utils.log import logger
 
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+REMOTE_CACHE_DIR = CACHE_DIR / "remote"
+
 
 class Remote:
-    """拉取云控资源"""
+    """拉取云控资源
+
+    资源会缓存在本地，并通过 ETag/Last-Modified 发起条件请求，内容没有变化时不会重新下载；
+    云端无法访问时直接使用本地缓存。
+    """
 
     RULE = f"{RESOURCE_FightPropRule_URL}FightPropRule_genshin.json"
     DAMAGE = f"{RESOURCE_FightPropRule_URL}GenshinDamageRule.json"
     GCSIM = f"{RESOURCE_FightPropRule_URL}gcsim.json"
 
+    TIMEOUT = Timeout(10.0, connect=5.0)
+
+    @staticmethod
+    async def _read_cache(name: str) -> Optional[Dict[str, Any]]:
+        meta_path = REMOTE_CACHE_DIR / f"{name}.meta.json"
+        data_path = REMOTE_CACHE_DIR / f"{name}.json"
+        if not (meta_path.exists() and data_path.exists()):
+            return None
+        try:
+            async with aiofiles.open(meta_path, "r", encoding="utf-8") as f:
+                meta = jsonlib.loads(await f.read())
+            async with aiofiles.open(data_path, "rb") as f:
+                content = await f.read()
+        except (OSError, ValueError) as exc:
+            logger.warning("读取云控资源缓存 %s 失败: %s", name, str(exc))
+            return None
+        if hashlib.sha256(content).hexdigest() != meta.get("sha256"):
+            logger.warning("云控资源缓存 %s 校验失败", name)
+            return None
+        meta["content"] = content
+        return meta
+
+    @staticmethod
+    async def _write_cache(name: str, content: bytes, meta: Dict[str, Any]):
+        REMOTE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for path, data in (
+            (REMOTE_CACHE_DIR / f"{name}.json", content),
+            (REMOTE_CACHE_DIR / f"{name}.meta.json", jsonlib.dumps(meta).encode("utf-8")),
+        ):
+            temp_path = path.with_suffix(".tmp")
+            async with aiofiles.open(temp_path, "wb") as f:
+                await f.write(data)
+            os.replace(temp_path, path)
+
+    @staticmethod
+    async def _get_json(url: str, name: str) -> Dict[str, Any]:
+        """获取云控资源，内容没有变化或云端不可用时使用本地缓存"""
+        cache = await Remote._read_cache(name)
+        headers = {}
+        if cache is not None:
+            if etag := cache.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := cache.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+        try:
+            async with HTTPClientPool.create_client(timeout=Remote.TIMEOUT) as client:
+                req = await client.get(url, headers=headers)
+            if req.status_code == 304 and cache is not None:
+                logger.debug("云控资源 %s 没有变化，使用本地缓存", name)
+                return jsonlib.loads(cache["content"])
+            if req.status_code == 200:
+                content = req.content
+                data = jsonlib.loads(content)
+                meta = {
+                    "url": url,
+                    "etag": req.headers.get("ETag"),
+                    "last_modified": req.headers.get("Last-Modified"),
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                }
+                if cache is None or any(cache.get(key) != value for key, value in meta.items()):
+                    await Remote._write_cache(name, content, meta)
+                return data
+            logger.warning("获取云控资源 %s 失败 status_code[%s]", name, req.status_code)
+        except Exception as exc:  # skipcq: PYL-W0703
+            logger.warning("获取云控资源 %s 失败: %s", name, repr(exc))
+        if cache is not None:
+            logger.info("云控资源 %s 使用本地缓存", name)
+            try:
+                return jsonlib.loads(cache["content"])
+            except ValueError:
+                pass
+        return {}
+
     @staticmethod
     async def get_fight_prop_rule_data() -> Dict[str, Dict[str, float]]:
         """获取云端圣遗物评分规则"""
         try:
-            async with AsyncClient() as client:
-                req = await client.get(Remote.RULE)
-                if req.status_code == 200:
-                    return req.json()
-                return {}
+            return await Remote._get_json(Remote.RULE, "fight_prop_rule")
         except Exception as exc:  # skipcq: PYL-W0703
             logger.error("获取云端圣遗物评分规则失败: %s", exc_info=exc)
             return {}
@@ -30,11 +115,7 @@ class Remote:
     async def get_damage_data() -> Dict[str, Any]:
         """获取云端伤害计算规则"""
         try:
-            async with AsyncClient() as client:
-                req = await client.get(Remote.DAMAGE)
-                if req.status_code == 200:
-                    return req.json()
-                return {}
+            return await Remote._get_json(Remote.DAMAGE, "damage")
         except Exception as exc:  # skipcq: PYL-W0703
             logger.error("获取云端伤害计算规则失败: %s", exc_info=exc)
             return {}
@@ -43,11 +124,7 @@ class Remote:
     async def get_gcsim_scripts() -> Dict[str, str]:
         """获取云端 gcsim 脚本"""
         try:
-            async with AsyncClient() as client:
-                req = await client.get(Remote.GCSIM)
-                if req.status_code == 200:
-                    return req.json()
-                return {}
+            return await Remote._get_json(Remote.GCSIM, "gcsim")
         except Exception as exc:  # skipcq: PYL-W0703
             logger.error("获取云端 gcsim 脚本失败: %s", exc_info=exc)
             return {}
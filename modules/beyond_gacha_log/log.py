@@ -14,7 +14,7 @@ from simnet.models.genshin.wish import GenshinBeyondBannerType as BannerType
 from simnet.utils.player import recognize_genshin_server
 
 from gram_core.services.gacha_log_rank.services import GachaLogRankService
-from metadata.pool.pool import get_pool_by_id
+from metadata.pool.pool import get_banners
 from modules.beyond_gacha_log.ranks import BeyondGachaLogRanks
 from modules.gacha_log.error import (
     GachaLogAccountNotFound,
@@ -144,12 +144,12 @@ class BeyondGachaLog(BeyondGachaLogRanks, BeyondGachaLogUigfConverter):
         for item_info in all_items:
             pool_name = GACHA_TYPE_LIST[item_info.banner_type]
             if pool_name not in temp_id_data:
-                temp_id_data[pool_name] = []
+                temp_id_data[pool_name] = set()
             if pool_name not in gacha_log.item_list:
                 gacha_log.item_list[pool_name] = []
             if item_info.id not in temp_id_data[pool_name]:
                 gacha_log.item_list[pool_name].append(item_info)
-                temp_id_data[pool_name].append(item_info.id)
+                temp_id_data[pool_name].add(item_info.id)
                 new_num += 1
         return new_num
 
@@ -178,7 +178,7 @@ class BeyondGachaLog(BeyondGachaLogRanks, BeyondGachaLogUigfConverter):
                 raise GachaLogMixedProvider
             # 将唯一 id 放入临时数据中，加快查找速度
             temp_id_data = {
-                pool_name: [i.id for i in pool_data] for pool_name, pool_data in gacha_log.item_list.items()
+                pool_name: {i.id for i in pool_data} for pool_name, pool_data in gacha_log.item_list.items()
             }
             # 使用新线程进行遍历，避免堵塞主线程
             loop = asyncio.get_event_loop()
@@ -223,12 +223,12 @@ class BeyondGachaLog(BeyondGachaLogRanks, BeyondGachaLogUigfConverter):
         if gacha_log.get_import_type == ImportType.PAIMONMOE:
             raise GachaLogMixedProvider
         # 将唯一 id 放入临时数据中，加快查找速度
-        temp_id_data = {pool_name: [i.id for i in pool_data] for pool_name, pool_data in gacha_log.item_list.items()}
+        temp_id_data = {pool_name: {i.id for i in pool_data} for pool_name, pool_data in gacha_log.item_list.items()}
         client = self.get_game_client(player_id)
         try:
             for pool_id, pool_name in GACHA_TYPE_LIST.items():
                 if pool_name not in temp_id_data:
-                    temp_id_data[pool_name] = []
+                    temp_id_data[pool_name] = set()
                 if pool_name not in gacha_log.item_list:
                     gacha_log.item_list[pool_name] = []
                 min_id = 0
@@ -253,7 +253,7 @@ class BeyondGachaLog(BeyondGachaLogRanks, BeyondGachaLogUigfConverter):
 
                     if item.id not in temp_id_data[pool_name] or (not is_lazy and min_id):
                         gacha_log.item_list[pool_name].append(item)
-                        temp_id_data[pool_name].append(item.id)
+                        temp_id_data[pool_name].add(item.id)
                         new_num += 1
 
                 await asyncio.sleep(1)
@@ -507,7 +507,7 @@ class BeyondGachaLog(BeyondGachaLogRanks, BeyondGachaLogUigfConverter):
         all_five, _ = await self.get_all_5_star_items(data, assets, pool_name)
         all_four, _ = await self.get_all_4_star_items(data, assets, pool_name)
         pool_data = []
-        up_pool_data = [Pool(**i) for i in get_pool_by_id(pool.value)]
+        up_pool_data = [Pool.from_banner(i) for i in get_banners(pool.value)]
         for up_pool in up_pool_data:
             for item in all_five:
                 up_pool.parse(item)
@@ -1,6 +1,6 @@
 import datetime
 from enum import Enum
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, List, Union, Optional, TYPE_CHECKING
 
 from pydantic import field_validator, BaseModel
 
@@ -9,6 +9,9 @@ from simnet.models.base import DateTimeField, add_timezone
 from metadata.shortname import not_real_roles, roleToId, weaponToId
 from modules.gacha_log.const import UIGF_VERSION
 
+if TYPE_CHECKING:
+    from metadata.pool.pool import Banner
+
 
 class ImportType(Enum):
     PaiGram = "PaiGram"
@@ -96,21 +99,43 @@ class GachaLogInfo(BaseModel):
 
 
 class Pool:
-    def __init__(self, five: List[str], four: List[str], name: str, to: str, **kwargs):
+    def __init__(
+        self,
+        five: List[str],
+        four: List[str],
+        name: str,
+        to: str,
+        from_time: Optional[datetime.datetime] = None,
+        to_time: Optional[datetime.datetime] = None,
+        **kwargs,
+    ):
         self.five = five
         self.real_name = name
         self.name = "、".join(self.five)
         self.four = four
         self.from_ = kwargs.get("from")
         self.to = to
-        self.from_time = add_timezone(datetime.datetime.strptime(self.from_, "%Y-%m-%d %H:%M:%S"))
-        self.to_time = add_timezone(datetime.datetime.strptime(self.to, "%Y-%m-%d %H:%M:%S"))
+        self.from_time = from_time or add_timezone(datetime.datetime.strptime(self.from_, "%Y-%m-%d %H:%M:%S"))
+        self.to_time = to_time or add_timezone(datetime.datetime.strptime(self.to, "%Y-%m-%d %H:%M:%S"))
         self.start = self.from_time
         self.start_init = False
         self.end = self.to_time
         self.dict = {}
         self.count = 0
 
+    @classmethod
+    def from_banner(cls, banner: "Banner") -> "Pool":
+        """从预先解析好时间的卡池创建，不需要再解析时间"""
+        return cls(
+            five=list(banner.five),
+            four=list(banner.four),
+            name=banner.name,
+            to=banner.to,
+            from_time=banner.from_time,
+            to_time=banner.to_time,
+            **{"from": banner.from_},
+        )
+
     def parse(self, item: Union[FiveStarItem, FourStarItem]):
         if self.from_time <= item.time <= self.to_time:
             if self.dict.get(item.name):
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Optional
 
-import httpx
 from httpx import URL
 from httpx import HTTPError
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
@@ -9,6 +8,7 @@ from telegram.helpers import create_deep_linked_url
 
 from gram_core.basemodel import Settings, SettingsConfigDict
 from modules.gacha_log.error import GachaLogWebNotConfigError, GachaLogWebUploadError, GachaLogNotFound
+from utils.http_client import HTTPClientPool
 
 
 class GachaLogWebConfig(Settings):
@@ -49,7 +49,7 @@ class GachaLogOnlineView:
         file_path = self.gacha_log_path / f"{user_id}-{uid}.json"
         if not file_path.exists():
             raise GachaLogNotFound
-        async with httpx.AsyncClient() as client:
+        async with HTTPClientPool.create_client() as client:
             with open(file_path, "rb") as file:
                 try:
                     req = await client.post(
@@ -1,6 +1,7 @@
 from typing import Optional
 
 from core.dependence.redisdb import RedisDB
+from utils.tiered_cache import TieredCache
 
 __all__ = [
     "GCSimCache",
@@ -13,16 +14,15 @@ class GCSimCache:
     def __init__(self, redis: RedisDB, ttl: int = 24 * 60 * 60):
         self.client = redis.client
         self.ttl = ttl
+        self.cache: TieredCache[str] = TieredCache(self.client, self.qname, bytes.decode)
 
     def get_key(self, player_id: str, script_hash: int) -> str:
         return f"{self.qname}:{player_id}:{script_hash}"
 
     async def set_cache(self, player_id: str, script_hash: int, file_id: str) -> None:
         key = self.get_key(player_id, script_hash)
-        await self.client.set(key, file_id, ex=self.ttl)
+        await self.cache.set(key, file_id, ex=self.ttl)
 
     async def get_cache(self, player_id: str, script_hash: int) -> Optional[str]:
         key = self.get_key(player_id, script_hash)
-        data = await self.client.get(key)
-        if data:
-            return data.decode()
+        return await self.cache.get(key)
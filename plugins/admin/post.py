@@ -7,7 +7,6 @@ from typing import List, Optional, Tuple, TYPE_CHECKING, Union
 
 import aiofiles
 from arkowrapper import ArkoWrapper
-from bs4 import BeautifulSoup
 from httpx import Timeout
 from telegram import (
     InlineKeyboardButton,
@@ -39,7 +38,7 @@ from utils.helpers import sha1
 from utils.log import logger
 
 if TYPE_CHECKING:
-    from bs4 import Tag
+    from bs4 import BeautifulSoup, Tag
     from telegram import Update, Message
     from telegram.ext import ContextTypes
 
@@ -216,7 +215,7 @@ class Post(Plugin.Conversation):
                 await self.set_posted(post_type, post_id)
 
     @staticmethod
-    def parse_post_text(soup: BeautifulSoup, post_subject: str) -> Tuple[str, bool]:
+    def parse_post_text(soup: "BeautifulSoup", post_subject: str) -> Tuple[str, bool]:
         def parse_tag(_tag: "Tag") -> str:
             if _tag.name == "a":
                 href = _tag.get("href")
@@ -429,6 +428,8 @@ class Post(Plugin.Conversation):
         post_data = post_info["post"]["post"]
         post_subject = post_data["subject"]
         post_tags = self.get_tags_by_subject(post_subject)
+        from bs4 import BeautifulSoup
+
         post_soup = BeautifulSoup(post_info.content, features="html.parser")
         post_text, too_long = self.parse_post_text(post_soup, post_subject)
         url = post_info.get_url()
@@ -4,6 +4,7 @@ from telegram.ext import CallbackContext
 from core.dependence.assets.impl.genshin import AssetsService
 from core.plugin import Plugin, handler
 from metadata.scripts.paimon_moe import update_paimon_moe_zh
+from metadata.shortname import refresh_index
 from utils.log import logger
 
 __all__ = ("MetadataPlugin",)
@@ -25,4 +26,5 @@ class MetadataPlugin(Plugin):
         msg = await message.reply_text("正在刷新元数据，请耐心等待...")
         await update_paimon_moe_zh()
         await self.assets_service.init(True)
+        refresh_index()
         await msg.edit_text("元数据刷新完成！")
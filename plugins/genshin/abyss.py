@@ -18,10 +18,8 @@ from core.services.history_data.services import HistoryDataAbyssServices
 from core.services.template.models import RenderResult
 from core.services.template.services import TemplateService
 from gram_core.config import config
-from gram_core.dependence.redisdb import RedisDB
 from gram_core.plugin.methods.inline_use_data import IInlineUseData
 from plugins.tools.genshin import GenshinHelper
-from utils.enkanetwork import RedisCache
 from utils.log import logger
 from utils.uid import mask_number
 
@@ -64,12 +62,10 @@ class AbyssPlugin(Plugin):
         template: TemplateService,
         helper: GenshinHelper,
         history_data_abyss: HistoryDataAbyssServices,
-        redis: RedisDB,
     ):
         self.template_service = template
         self.helper = helper
         self.history_data_abyss = history_data_abyss
-        self.cache = RedisCache(redis.client, key="plugin:abyss:history")
 
     @handler.command("abyss", block=False)
     @handler.message(filters.Regex(r"^深渊数据"), block=False)
@@ -253,12 +249,8 @@ class AbyssPlugin(Plugin):
         character_data: Dict[int, int],
     ) -> bool:
         model = history_data_abyss.create(uid, abyss_data, character_data)
-        old_data = await history_data_abyss.get_by_user_id_data_id(uid, model.data_id)
-        exists = history_data_abyss.exists_data(model, old_data)
-        if not exists:
-            await history_data_abyss.add(model)
-            return True
-        return False
+        name = AbyssPlugin.get_season_data_name(HistoryDataAbyss(abyss_data=abyss_data, character_data=character_data))
+        return await history_data_abyss.add_if_not_exists(model, name) is not None
 
     async def get_abyss_data(self, uid: int):
         return await self.history_data_abyss.get_by_user_id(uid)
@@ -283,22 +275,18 @@ class AbyssPlugin(Plugin):
 
         return f"{time} {data.abyss_data.total_stars} ★ {honor}"
 
-    async def get_session_button_data(self, user_id: int, uid: int, force: bool = False):
-        redis = await self.cache.get(str(uid))
-        if redis and not force:
-            return redis["buttons"]
-        data = await self.get_abyss_data(uid)
-        data.sort(key=lambda x: x.id, reverse=True)
-        abyss_data = [HistoryDataAbyss.from_data(i) for i in data]
+    async def get_session_button_data(self, user_id: int, uid: int, page: int = 1) -> Tuple[List[Dict[str, str]], int]:
+        indexes, total = await self.history_data_abyss.get_summary_page(
+            uid, page, lambda x: AbyssPlugin.get_season_data_name(HistoryDataAbyss.from_data(x))
+        )
         buttons = [
             {
-                "name": AbyssPlugin.get_season_data_name(abyss_data[idx]),
-                "value": f"get_abyss_history|{user_id}|{uid}|{value.id}",
+                "name": value.name,
+                "value": f"get_abyss_history|{user_id}|{uid}|{value.history_id}",
             }
-            for idx, value in enumerate(data)
+            for value in indexes
         ]
-        await self.cache.set(str(uid), {"buttons": buttons})
-        return buttons
+        return buttons, total
 
     async def gen_season_button(
         self,
@@ -307,7 +295,7 @@ class AbyssPlugin(Plugin):
         page: int = 1,
     ) -> List[List[InlineKeyboardButton]]:
         """生成按钮"""
-        data = await self.get_session_button_data(user_id, uid)
+        data, total = await self.get_session_button_data(user_id, uid, page)
         if not data:
             return []
         buttons = [
@@ -317,10 +305,9 @@ class AbyssPlugin(Plugin):
             )
             for value in data
         ]
-        all_buttons = [buttons[i : i + 3] for i in range(0, len(buttons), 3)]
-        send_buttons = all_buttons[(page - 1) * 5 : page * 5]
+        send_buttons = [buttons[i : i + 3] for i in range(0, len(buttons), 3)]
         last_page = page - 1 if page > 1 else 0
-        all_page = math.ceil(len(all_buttons) / 5)
+        all_page = math.ceil(total / self.history_data_abyss.SUMMARY_PAGE_SIZE)
         next_page = page + 1 if page < all_page and all_page > 1 else 0
         last_button = []
         if last_page:
@@ -357,7 +344,6 @@ class AbyssPlugin(Plugin):
         self.log_user(update, logger.info, "查询深渊历史数据")
 
         async with self.helper.genshin_or_public(user_id, uid=uid, offset=offset) as client:
-            await self.get_session_button_data(user_id, client.player_id, force=True)
             buttons = await self.gen_season_button(user_id, client.player_id)
             if not buttons:
                 await message.reply_text("还没有深渊历史数据哦~")
@@ -1,10 +1,9 @@
 import asyncio
 import functools
 import typing
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from httpx import AsyncClient
 from pydantic import BaseModel
 from simnet.errors import BadRequest as SimnetBadRequest
 from simnet.errors import InvalidCookies
@@ -18,9 +17,9 @@ from core.dependence.assets.impl.models.genshin.daily_material import AreaDailyM
 from core.plugin import Plugin, handler
 from core.services.template.models import FileType, RenderGroupResult
 from core.services.template.services import TemplateService
-from metadata.pool.pool_301 import POOL_301 as CHARACTER_POOL
-from modules.gacha_log.models import Pool
+from metadata.pool.pool import get_banner_at
 from plugins.tools.genshin import CharacterDetails, CookiesNotFoundError, GenshinHelper, PlayerNotFoundError
+from utils.http_client import HTTPClientPool
 from utils.log import logger
 from utils.uid import mask_number
 
@@ -98,17 +97,16 @@ def get_material_serial_name(names: Iterable[str]) -> str:
 def is_first_week_of_pool(date: Optional["datetime"] = None) -> bool:
     target_date = date or datetime.now()
     target_date_cn = add_timezone(target_date)
-    pool = [Pool(**i) for i in CHARACTER_POOL]
-    for p in pool:
-        start, end = p.start, p.start + timedelta(weeks=1)
-        if start <= target_date_cn < end:
-            return True
-    return False
+    banner = get_banner_at(301, target_date_cn)
+    return banner is not None and target_date_cn < banner.from_time + timedelta(weeks=1)
 
 
 class DailyMaterial(Plugin):
     """每日素材表"""
 
+    SKILLS_CONCURRENCY = 8
+    """获取角色天赋等级的最大并发数"""
+
     everyday_materials: "MaterialsData" = MaterialsData()
     """
     everyday_materials 储存的是一周中每天能刷的素材 ID
@@ -134,29 +132,44 @@ class DailyMaterial(Plugin):
         self.template_service = template_service
         self.helper = helper
         self.character_details = character_details
-        self.client = AsyncClient()
+        self.client = HTTPClientPool.create_client()
+        self._area_static: Dict[int, Dict[str, "AreaStaticData"]] = {}
+        self._area_static_date: Optional[date] = None
 
     async def initialize(self):
         """插件在初始化时，会检查一下本地是否缓存了每日素材的数据"""
         self.everyday_materials = self.everyday_materials.model_validate(self.assets_service.other.get_daily_material())
-
-    async def _get_skills_data(self, client: "FragileGenshinClient", character: Character) -> Optional[List[int]]:
-        if client.damaged:
-            return None
-        detail = None
+        self._area_static.clear()
+
+    async def _get_skills_data(
+        self, client: "FragileGenshinClient", characters: List[Character], loading_prompt: "Message"
+    ) -> Dict[int, List[int]]:
+        """并发获取全部角色的天赋等级"""
+        if client.damaged or not characters:
+            return {}
         try:
             real_client = typing.cast("GenshinClient", client.client)
-            detail = await self.character_details.get_character_details(real_client, character)
+            details = await self.character_details.get_character_details_many(
+                real_client, characters, concurrency=self.SKILLS_CONCURRENCY
+            )
         except InvalidCookies:
             client.damaged = True
+            return {}
         except SimnetBadRequest as e:
-            if e.ret_code == -502002:
-                client.damaged = True
-            raise
-        if detail is None:
-            return None
-        talents = [t for t in detail.talents if t.type in ["attack", "skill", "burst"]]
-        return [t.level for t in talents]
+            if e.ret_code != -502002:
+                raise e
+            client.damaged = True
+            self.add_delete_message_job(loading_prompt, delay=5)
+            await loading_prompt.edit_text(
+                "获取角色天赋信息失败，如果想要显示角色天赋信息，请先在米游社/HoYoLab中使用一次<b>养成计算器</b>后再使用此功能~",
+                parse_mode=ParseMode.HTML,
+            )
+            return {}
+        return {
+            character_id: [t.level for t in detail.talents if t.type in ["attack", "skill", "burst"]]
+            for character_id, detail in details.items()
+            if detail is not None
+        }
 
     async def _get_items_from_user(
         self, user_id: int, uid: int, offset: int
@@ -217,12 +230,39 @@ class DailyMaterial(Plugin):
         # 有上述异常的， client 会返回 None
         return None, user_data
 
-    async def area_user_weapon(
-        self,
+    def _get_area_static(self, weekday: int) -> Dict[str, "AreaStaticData"]:
+        """获取当天各区域与用户无关的数据，每天只构建一次"""
+        today = date.today()
+        if self._area_static_date != today:
+            self._area_static.clear()
+            self._area_static_date = today
+        if weekday not in self._area_static:
+            self._area_static[weekday] = {
+                area_name: self._build_area_static(area_daily)
+                for area_name, area_daily in self.everyday_materials.weekday(weekday).items()
+            }
+        return self._area_static[weekday]
+
+    def _build_area_static(self, area_daily: "AreaDailyMaterialsData") -> "AreaStaticData":
+        avatar_materials = self.user_materials(area_daily.avatar_materials)
+        weapon_materials = self.user_materials(area_daily.weapon_materials)
+        avatars = {i: item for i in area_daily.avatar if (item := self._assemble_item_from_honey_data("avatar", i))}
+        weapons = {i: item for i in area_daily.weapon if (item := self._assemble_item_from_honey_data("weapon", i))}
+        return AreaStaticData(
+            avatar_materials=avatar_materials,
+            avatar_material_name=get_material_serial_name(map(lambda x: x.name, avatar_materials)),
+            weapon_materials=weapon_materials,
+            weapon_material_name=get_material_serial_name(map(lambda x: x.name, weapon_materials)),
+            avatars=avatars,
+            weapons=weapons,
+        )
+
+    @staticmethod
+    def area_user_weapon(
         area_name: str,
         user_owned: "UserOwned",
         area_daily: "AreaDailyMaterialsData",
-        loading_prompt: "Message",
+        area_static: "AreaStaticData",
     ) -> Optional["AreaData"]:
         """
         area_user_weapon 通过从选定区域当日可突破的武器中查找用户持有的武器
@@ -232,30 +272,29 @@ class DailyMaterial(Plugin):
         for weapon_id in area_daily.weapon:
             weapons = user_owned.weapon.get(weapon_id)
             if weapons is None or len(weapons) == 0:
-                weapon = await self._assemble_item_from_honey_data("weapon", weapon_id)
+                weapon = area_static.weapons.get(weapon_id)
                 if weapon is None:
                     continue
-                weapons = [weapon]
+                weapons = [weapon.model_copy()]
             if weapons[0].rarity < 4:
                 continue
             weapon_items.extend(weapons)
         if len(weapon_items) == 0:
             return None
-        weapon_materials = await self.user_materials(area_daily.weapon_materials, loading_prompt)
         return AreaData(
             name=area_name,
-            materials=weapon_materials,
+            materials=area_static.weapon_materials,
             items=list(sort_item(weapon_items)),
-            material_name=get_material_serial_name(map(lambda x: x.name, weapon_materials)),
+            material_name=area_static.weapon_material_name,
         )
 
-    async def area_user_avatar(
-        self,
+    @staticmethod
+    def area_user_avatar(
         area_name: str,
         user_owned: "UserOwned",
         area_daily: "AreaDailyMaterialsData",
-        client: "FragileGenshinClient",
-        loading_prompt: "Message",
+        area_static: "AreaStaticData",
+        skills: Dict[int, List[int]],
     ) -> Optional["AreaData"]:
         """
         area_user_avatar 通过从选定区域当日可升级的角色技能中查找用户拥有的角色
@@ -264,46 +303,30 @@ class DailyMaterial(Plugin):
         avatar_items: List[ItemData] = []
         for avatar_id in area_daily.avatar:
             avatar = user_owned.avatar.get(avatar_id)
-            avatar = avatar or await self._assemble_item_from_honey_data("avatar", avatar_id)
             if avatar is None:
-                continue
-            if avatar.origin is None:
-                avatar_items.append(avatar)
-                continue
-            # 最大努力获取用户角色等级
-            try:
-                avatar.skills = await self._get_skills_data(client, avatar.origin)
-            except SimnetBadRequest as e:
-                if e.ret_code != -502002:
-                    raise e
-                self.add_delete_message_job(loading_prompt, delay=5)
-                await loading_prompt.edit_text(
-                    "获取角色天赋信息失败，如果想要显示角色天赋信息，请先在米游社/HoYoLab中使用一次<b>养成计算器</b>后再使用此功能~",
-                    parse_mode=ParseMode.HTML,
-                )
+                avatar = area_static.avatars.get(avatar_id)
+                if avatar is None:
+                    continue
+                avatar = avatar.model_copy()
+            if avatar.origin is not None:
+                avatar.skills = skills.get(avatar.origin.id)
             avatar_items.append(avatar)
         if len(avatar_items) == 0:
             return None
-        avatar_materials = await self.user_materials(area_daily.avatar_materials, loading_prompt)
         return AreaData(
             name=area_name,
-            materials=avatar_materials,
+            materials=area_static.avatar_materials,
             items=list(sort_item(avatar_items)),
-            material_name=get_material_serial_name(map(lambda x: x.name, avatar_materials)),
+            material_name=area_static.avatar_material_name,
         )
 
-    async def user_materials(self, material_ids: List[str], loading_prompt: "Message") -> List["ItemData"]:
+    def user_materials(self, material_ids: List[str]) -> List["ItemData"]:
         """
         user_materials 返回 /daily_material 每个国家角色或武器列表右上角标的素材列表
         """
         area_materials: List[ItemData] = []
         for material_id in material_ids:  # 添加这个区域当天（weekday）的培养素材
-            try:
-                material_icon = self.assets_service.material.icon(material_id)
-            except AssetsCouldNotFound as exc:
-                logger.warning("AssetsCouldNotFound message[%s] target[%s]", exc.message, exc.target)
-                await loading_prompt.edit_text(f"出错了呜呜呜 ~ {config.notice.bot_name}找不到一些素材")
-                raise
+            material_icon = self.assets_service.material.icon(material_id)
             material = self.assets_service.material.get_by_name(material_id)
             material_uri = material_icon.as_uri()
             area_materials.append(
@@ -348,19 +371,32 @@ class DailyMaterial(Plugin):
         loading_prompt = await message.reply_text(f"{config.notice.bot_name}可能需要找找图标素材，还请耐心等待哦~")
         await message.reply_chat_action(ChatAction.TYPING)
 
+        try:
+            area_static = self._get_area_static(weekday)
+        except AssetsCouldNotFound as exc:
+            logger.warning("AssetsCouldNotFound message[%s] target[%s]", exc.message, exc.target)
+            await loading_prompt.edit_text(f"出错了呜呜呜 ~ {config.notice.bot_name}找不到一些素材")
+            raise
+
         # 尝试获取用户已绑定的原神账号信息
         client, user_owned = await self._get_items_from_user(user_id, uid, offset)
         today_materials = self.everyday_materials.weekday(weekday)
         fragile_client = FragileGenshinClient(client)
+        characters = [
+            avatar.origin
+            for area_daily in today_materials.values()
+            for avatar_id in area_daily.avatar
+            if (avatar := user_owned.avatar.get(avatar_id)) is not None and avatar.origin is not None
+        ]
+        # 最大努力获取用户角色天赋等级，所有角色一起并发请求
+        skills = await self._get_skills_data(fragile_client, characters, loading_prompt)
         area_avatars: List["AreaData"] = []
         area_weapons: List["AreaData"] = []
         for country_name, area_daily in today_materials.items():
-            area_avatar = await self.area_user_avatar(
-                country_name, user_owned, area_daily, fragile_client, loading_prompt
-            )
+            area_avatar = self.area_user_avatar(country_name, user_owned, area_daily, area_static[country_name], skills)
             if area_avatar is not None:
                 area_avatars.append(area_avatar)
-            area_weapon = await self.area_user_weapon(country_name, user_owned, area_daily, loading_prompt)
+            area_weapon = self.area_user_weapon(country_name, user_owned, area_daily, area_static[country_name])
             if area_weapon is not None:
                 area_weapons.append(area_weapon)
         render_data = RenderData(
@@ -403,7 +439,7 @@ class DailyMaterial(Plugin):
 
         logger.debug("角色、武器培养素材图发送成功")
 
-    async def _assemble_item_from_honey_data(self, item_type: str, item_id: str) -> Optional["ItemData"]:
+    def _assemble_item_from_honey_data(self, item_type: str, item_id: str) -> Optional["ItemData"]:
         """用户拥有的角色和武器中找不到数据时，使用 HoneyImpact 的数据组装出基本信息置灰展示"""
         honey_item = getattr(self.assets_service, item_type).get_by_id(item_id)
         if honey_item is None:
@@ -455,6 +491,15 @@ class AreaData(BaseModel):
     items: List[ItemData] = []  # 可培养的角色或武器
 
 
+class AreaStaticData(BaseModel):
+    avatar_materials: List[ItemData] = []  # 角色培养素材
+    avatar_material_name: str  # 角色培养素材系列名
+    weapon_materials: List[ItemData] = []  # 武器突破素材
+    weapon_material_name: str  # 武器突破素材系列名
+    avatars: Dict[str, ItemData] = {}  # 用户未持有时展示的角色
+    weapons: Dict[str, ItemData] = {}  # 用户未持有时展示的武器
+
+
 class RenderData(BaseModel):
     title: str  # 页面标题，主要用于显示星期几
     time: str  # 页面时间
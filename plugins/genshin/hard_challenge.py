@@ -3,7 +3,7 @@
 import math
 import re
 from functools import lru_cache, partial
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from simnet import GenshinClient
@@ -19,10 +19,8 @@ from core.services.history_data.services import HistoryDataHardChallengeServices
 from core.services.template.models import RenderResult
 from core.services.template.services import TemplateService
 from gram_core.config import config
-from gram_core.dependence.redisdb import RedisDB
 from gram_core.plugin.methods.inline_use_data import IInlineUseData
 from plugins.tools.genshin import GenshinHelper
-from utils.enkanetwork import RedisCache
 from utils.log import logger
 from utils.uid import mask_number
 
@@ -60,12 +58,10 @@ class HardChallengePlugin(Plugin):
         template: TemplateService,
         helper: GenshinHelper,
         history_data_abyss: HistoryDataHardChallengeServices,
-        redis: RedisDB,
     ):
         self.template_service = template
         self.helper = helper
         self.history_data_abyss = history_data_abyss
-        self.cache = RedisCache(redis.client, key="plugin:hard_challenge:history")
 
     @handler.command("hard_challenge", block=False)
     @handler.message(filters.Regex(r"^幽境危战数据"), block=False)
@@ -198,12 +194,8 @@ class HardChallengePlugin(Plugin):
         abyss_data: "HardChallengeData",
     ) -> bool:
         model = history_data_abyss.create(uid, abyss_data)
-        old_data = await history_data_abyss.get_by_user_id_data_id(uid, model.data_id)
-        exists = history_data_abyss.exists_data(model, old_data)
-        if not exists:
-            await history_data_abyss.add(model)
-            return True
-        return False
+        name = HardChallengePlugin.get_season_data_name(HistoryDataHardChallenge(abyss_data=abyss_data))
+        return await history_data_abyss.add_if_not_exists(model, name) is not None
 
     async def get_abyss_data(self, uid: int):
         return await self.history_data_abyss.get_by_user_id(uid)
@@ -215,22 +207,18 @@ class HardChallengePlugin(Plugin):
         difficulty = data.abyss_data.single.best.difficulty
         return f"{time} {data.abyss_data.schedule.name} ★ 难度{difficulty}"
 
-    async def get_session_button_data(self, user_id: int, uid: int, force: bool = False):
-        redis = await self.cache.get(str(uid))
-        if redis and not force:
-            return redis["buttons"]
-        data = await self.get_abyss_data(uid)
-        data.sort(key=lambda x: x.id, reverse=True)
-        abyss_data = [HistoryDataHardChallenge.from_data(i) for i in data]
+    async def get_session_button_data(self, user_id: int, uid: int, page: int = 1) -> Tuple[List[Dict[str, str]], int]:
+        indexes, total = await self.history_data_abyss.get_summary_page(
+            uid, page, lambda x: HardChallengePlugin.get_season_data_name(HistoryDataHardChallenge.from_data(x))
+        )
         buttons = [
             {
-                "name": HardChallengePlugin.get_season_data_name(abyss_data[idx]),
-                "value": f"get_hard_challenge_history|{user_id}|{uid}|{value.id}",
+                "name": value.name,
+                "value": f"get_hard_challenge_history|{user_id}|{uid}|{value.history_id}",
             }
-            for idx, value in enumerate(data)
+            for value in indexes
         ]
-        await self.cache.set(str(uid), {"buttons": buttons})
-        return buttons
+        return buttons, total
 
     async def gen_season_button(
         self,
@@ -239,7 +227,7 @@ class HardChallengePlugin(Plugin):
         page: int = 1,
     ) -> List[List[InlineKeyboardButton]]:
         """生成按钮"""
-        data = await self.get_session_button_data(user_id, uid)
+        data, total = await self.get_session_button_data(user_id, uid, page)
         if not data:
             return []
         buttons = [
@@ -249,10 +237,9 @@ class HardChallengePlugin(Plugin):
             )
             for value in data
         ]
-        all_buttons = [buttons[i : i + 3] for i in range(0, len(buttons), 3)]
-        send_buttons = all_buttons[(page - 1) * 5 : page * 5]
+        send_buttons = [buttons[i : i + 3] for i in range(0, len(buttons), 3)]
         last_page = page - 1 if page > 1 else 0
-        all_page = math.ceil(len(all_buttons) / 5)
+        all_page = math.ceil(total / self.history_data_abyss.SUMMARY_PAGE_SIZE)
         next_page = page + 1 if page < all_page and all_page > 1 else 0
         last_button = []
         if last_page:
@@ -289,7 +276,6 @@ class HardChallengePlugin(Plugin):
         self.log_user(update, logger.info, "查询幽境危战历史数据")
 
         async with self.helper.genshin_or_public(user_id, uid=uid, offset=offset) as client:
-            await self.get_session_button_data(user_id, client.player_id, force=True)
             buttons = await self.gen_season_button(user_id, client.player_id)
             if not buttons:
                 await message.reply_text("还没有幽境危战历史数据哦~")
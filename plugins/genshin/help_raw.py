@@ -2,7 +2,6 @@ import os
 from typing import Optional
 
 import aiofiles
-from bs4 import BeautifulSoup
 from telegram import Update
 from telegram.ext import CallbackContext
 
@@ -21,6 +20,8 @@ class HelpRawPlugin(Plugin):
         file_path = os.path.join(os.getcwd(), "resources", "bot", "help", "help.jinja2")
         async with aiofiles.open(file_path, mode="r", encoding="utf-8") as f:
             html_content = await f.read()
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html_content, "html.parser")
         commands = []
         command_div = soup.find_all("div", class_="command")
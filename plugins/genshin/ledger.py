@@ -156,11 +156,9 @@ class LedgerPlugin(Plugin):
         if month == ledger_data.month:
             return False
         model = history_data_ledger.create(uid, ledger_data)
-        old_data = await history_data_ledger.get_by_user_id_data_id(uid, model.data_id)
-        if not old_data:
-            await history_data_ledger.add(model)
-            return True
-        return False
+        if await history_data_ledger.exists_by_data_id(uid, model.data_id):
+            return False
+        return await history_data_ledger.add_if_not_exists(model) is not None
 
     async def get_ledger_data(self, uid: int):
         return await self.history_data_ledger.get_by_user_id(uid)
@@ -11,6 +11,7 @@ from core.handler.callbackqueryhandler import CallbackQueryHandler
 from core.plugin import handler, Plugin
 from modules.apihelper.client.components.map import MapHelper, MapException
 from utils.log import logger
+from utils.tiered_cache import TieredCache
 
 
 class Map(Plugin):
@@ -20,31 +21,29 @@ class Map(Plugin):
         self.cache = redis.client
         self.cache_photo_key = "plugin:map:photo:"
         self.cache_doc_key = "plugin:map:doc:"
+        self.photo_cache: TieredCache[str] = TieredCache(self.cache, "plugin:map:photo", bytes.decode)
+        self.doc_cache: TieredCache[str] = TieredCache(self.cache, "plugin:map:doc", bytes.decode)
         self.map_helper = MapHelper()
         self.temp_photo_path = "resources/img/map.png"
         self.temp_photo = None
 
     async def get_photo_cache(self, map_id: Union[str, int], name: str) -> Optional[str]:
-        if file_id := await self.cache.get(f"{self.cache_photo_key}{map_id}:{name}"):
-            return file_id.decode("utf-8")
-        return None
+        return await self.photo_cache.get(f"{self.cache_photo_key}{map_id}:{name}")
 
     async def get_doc_cache(self, map_id: Union[str, int], name: str) -> Optional[str]:
-        if file_id := await self.cache.get(f"{self.cache_doc_key}{map_id}:{name}"):
-            return file_id.decode("utf-8")
-        return None
+        return await self.doc_cache.get(f"{self.cache_doc_key}{map_id}:{name}")
 
     async def set_photo_cache(self, map_id: Union[str, int], name: str, file_id: str) -> None:
-        await self.cache.set(f"{self.cache_photo_key}{map_id}:{name}", file_id)
+        await self.photo_cache.set(f"{self.cache_photo_key}{map_id}:{name}", file_id)
 
     async def set_doc_cache(self, map_id: Union[str, int], name: str, file_id: str) -> None:
-        await self.cache.set(f"{self.cache_doc_key}{map_id}:{name}", file_id)
+        await self.doc_cache.set(f"{self.cache_doc_key}{map_id}:{name}", file_id)
 
     async def clear_cache(self) -> None:
-        for i in await self.cache.keys(f"{self.cache_photo_key}*"):
-            await self.cache.delete(i)
-        for i in await self.cache.keys(f"{self.cache_doc_key}*"):
-            await self.cache.delete(i)
+        for cache, key in ((self.photo_cache, self.cache_photo_key), (self.doc_cache, self.cache_doc_key)):
+            keys = [i async for i in self.cache.scan_iter(match=f"{key}*")]
+            await cache.delete(*keys)
+            cache.clear_local()
 
     async def edit_media(self, message: Message, map_id: str, name: str) -> None:
         caption = self.gen_caption(map_id, name)
@@ -213,7 +213,7 @@ class MaterialPlugin(Plugin):
                 self.add_delete_message_job(message)
                 self.add_delete_message_job(reply_message)
             return
-        character_name = roleToName(character_name)
+        character_name = roleToName(character_name, fuzzy=True)
         self.log_user(update, logger.info, "查询角色培养素材命令请求 || 参数 %s", character_name)
         await message.reply_chat_action(ChatAction.UPLOAD_PHOTO)
         result = await self.render(character_name, material_count)
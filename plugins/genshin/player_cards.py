@@ -36,7 +36,7 @@ from modules.playercards.helpers import ArtifactStatsTheory
 from modules.playercards.models import EnkaNetworkResponse
 from modules.playercards.to_enka import from_simnet_to_enka
 from plugins.tools.genshin import PlayerNotFoundError, GenshinHelper, CookiesNotFoundError
-from utils.enkanetwork import RedisCache, EnkaNetworkAPI
+from utils.enkanetwork import RedisCache, EnkaNetworkAPI, enka_guard
 from utils.helpers import download_resource
 from utils.log import logger
 from utils.uid import mask_number
@@ -99,23 +99,32 @@ class PlayerCards(Plugin):
         self.fight_prop_rule = await Remote.get_fight_prop_rule_data()
         self.damage_config = await Remote.get_damage_data()
 
+    async def _fetch_enka_data(self, uid) -> Dict:
+        user = await self.client.http.fetch_user_by_uid(uid)
+        data = user["content"].decode("utf-8", "surrogatepass")  # type: ignore
+        data = jsonlib.loads(data)
+        data = await self.player_cards_file.merge_info(uid, data)
+        await self.cache.set(uid, data)
+        return data
+
     async def _update_enka_data(self, uid) -> Union[EnkaNetworkResponse, str]:
         try:
             data = await self.cache.get(uid)
             if data is not None:
                 return EnkaNetworkResponse.parse_obj(data)
-            user = await self.client.http.fetch_user_by_uid(uid)
-            data = user["content"].decode("utf-8", "surrogatepass")  # type: ignore
-            data = jsonlib.loads(data)
-            data = await self.player_cards_file.merge_info(uid, data)
-            await self.cache.set(uid, data)
+            data = await enka_guard.call(uid, lambda: self._fetch_enka_data(uid), kind="player_cards")
             return EnkaNetworkResponse.parse_obj(data)
         except TimedOut:
             error = "Enka.Network 服务请求超时，请稍后重试"
-        except EnkaServerRateLimit:
-            error = "Enka.Network 已对此API进行速率限制，请稍后重试"
-        except EnkaServerMaintanance:
-            error = "Enka.Network 正在维护，请等待5-8小时或1天"
+        except (EnkaServerRateLimit, EnkaServerMaintanance) as exc:
+            # 熔断期间使用本地保存的数据
+            if (history := await self._load_data_as_enka_response(uid)) is not None:
+                logger.info("Enka.Network 暂不可用，使用本地保存的数据 uid[%s]", uid)
+                return history
+            if isinstance(exc, EnkaServerRateLimit):
+                error = "Enka.Network 已对此API进行速率限制，请稍后重试"
+            else:
+                error = "Enka.Network 正在维护，请等待5-8小时或1天"
         except EnkaServerError:
             error = "Enka.Network 服务请求错误，请稍后重试"
         except EnkaServerUnknown:
@@ -170,7 +179,7 @@ class PlayerCards(Plugin):
         if args:
             for i in args:
                 if i is not None and not i.startswith("@"):
-                    ch_name = roleToName(i)
+                    ch_name = roleToName(i, fuzzy=True)
         if reply:
             try:
                 user_id_ = reply.from_user.id
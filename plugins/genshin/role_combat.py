@@ -21,10 +21,8 @@ from core.services.history_data.services import HistoryDataImgTheaterServices
 from core.services.template.models import RenderGroupResult, RenderResult
 from core.services.template.services import TemplateService
 from gram_core.config import config
-from gram_core.dependence.redisdb import RedisDB
 from gram_core.plugin.methods.inline_use_data import IInlineUseData
 from plugins.tools.genshin import GenshinHelper
-from utils.enkanetwork import RedisCache
 from utils.log import logger
 from utils.uid import mask_number
 
@@ -71,12 +69,10 @@ class RoleCombatPlugin(Plugin):
         template: TemplateService,
         helper: GenshinHelper,
         history_data_abyss: HistoryDataImgTheaterServices,
-        redis: RedisDB,
     ):
         self.template_service = template
         self.helper = helper
         self.history_data_abyss = history_data_abyss
-        self.cache = RedisCache(redis.client, key="plugin:role_combat:history")
 
     @handler.command("role_combat", block=False)
     @handler.message(filters.Regex(r"^幻想真境剧诗数据"), block=False)
@@ -294,12 +290,10 @@ class RoleCombatPlugin(Plugin):
         character_data: Dict[int, int],
     ) -> bool:
         model = history_data_abyss.create(uid, abyss_data, character_data)
-        old_data = await history_data_abyss.get_by_user_id_data_id(uid, model.data_id)
-        exists = history_data_abyss.exists_data(model, old_data)
-        if not exists:
-            await history_data_abyss.add(model)
-            return True
-        return False
+        name = RoleCombatPlugin.get_season_data_name(
+            HistoryDataImgTheater(abyss_data=abyss_data, character_data=character_data)
+        )
+        return await history_data_abyss.add_if_not_exists(model, name) is not None
 
     async def get_abyss_data(self, uid: int):
         return await self.history_data_abyss.get_by_user_id(uid)
@@ -328,22 +322,18 @@ class RoleCombatPlugin(Plugin):
 
         return f"{time} {data.abyss_data.stat.medal_num} ★ {diff} {honor}"
 
-    async def get_session_button_data(self, user_id: int, uid: int, force: bool = False):
-        redis = await self.cache.get(str(uid))
-        if redis and not force:
-            return redis["buttons"]
-        data = await self.get_abyss_data(uid)
-        data.sort(key=lambda x: x.id, reverse=True)
-        abyss_data = [HistoryDataImgTheater.from_data(i) for i in data]
+    async def get_session_button_data(self, user_id: int, uid: int, page: int = 1) -> Tuple[List[Dict[str, str]], int]:
+        indexes, total = await self.history_data_abyss.get_summary_page(
+            uid, page, lambda x: RoleCombatPlugin.get_season_data_name(HistoryDataImgTheater.from_data(x))
+        )
         buttons = [
             {
-                "name": RoleCombatPlugin.get_season_data_name(abyss_data[idx]),
-                "value": f"get_role_combat_history|{user_id}|{uid}|{value.id}",
+                "name": value.name,
+                "value": f"get_role_combat_history|{user_id}|{uid}|{value.history_id}",
             }
-            for idx, value in enumerate(data)
+            for value in indexes
         ]
-        await self.cache.set(str(uid), {"buttons": buttons})
-        return buttons
+        return buttons, total
 
     async def gen_season_button(
         self,
@@ -352,7 +342,7 @@ class RoleCombatPlugin(Plugin):
         page: int = 1,
     ) -> List[List[InlineKeyboardButton]]:
         """生成按钮"""
-        data = await self.get_session_button_data(user_id, uid)
+        data, total = await self.get_session_button_data(user_id, uid, page)
         if not data:
             return []
         buttons = [
@@ -362,10 +352,9 @@ class RoleCombatPlugin(Plugin):
             )
             for value in data
         ]
-        all_buttons = [buttons[i : i + 3] for i in range(0, len(buttons), 3)]
-        send_buttons = all_buttons[(page - 1) * 5 : page * 5]
+        send_buttons = [buttons[i : i + 3] for i in range(0, len(buttons), 3)]
         last_page = page - 1 if page > 1 else 0
-        all_page = math.ceil(len(all_buttons) / 5)
+        all_page = math.ceil(total / self.history_data_abyss.SUMMARY_PAGE_SIZE)
         next_page = page + 1 if page < all_page and all_page > 1 else 0
         last_button = []
         if last_page:
@@ -436,7 +425,6 @@ class RoleCombatPlugin(Plugin):
         self.log_user(update, logger.info, "查询幻想真境剧诗历史数据")
 
         async with self.helper.genshin_or_public(user_id, uid=uid, offset=offset) as client:
-            await self.get_session_button_data(user_id, client.player_id, force=True)
             buttons = await self.gen_season_button(user_id, client.player_id)
             if not buttons:
                 await message.reply_text("还没有幻想真境剧诗历史数据哦~")
@@ -40,7 +40,7 @@ class StrategyPlugin(Plugin):
                 self.add_delete_message_job(message)
                 self.add_delete_message_job(reply_message)
             return
-        character_name = roleToName(character_name)
+        character_name = roleToName(character_name, fuzzy=True)
         url = await self.game_strategy_service.get_strategy(character_name)
         if url == "":
             reply_message = await message.reply_text(
@@ -44,7 +44,7 @@ class WeaponPlugin(Plugin):
                 self.add_delete_message_job(message)
                 self.add_delete_message_job(reply_message)
             return
-        weapon_name = weaponToName(weapon_name)
+        weapon_name = weaponToName(weapon_name, fuzzy=True)
         self.log_user(update, logger.info, "查询角色攻略命令请求 weapon_name[%s]", weapon_name)
         weapon_data = self.assets_service.weapon.get_by_name(weapon_name)
         if not weapon_data:
@@ -3,7 +3,6 @@ import re
 from datetime import datetime
 from typing import Any, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup
 from telegram import Update
 from telegram.constants import ChatAction
 from telegram.ext import CallbackContext, CommandHandler, MessageHandler, filters
@@ -124,6 +123,8 @@ class WishSimulatorHandle:
 
     @staticmethod
     def de_title(title: str) -> Union[Tuple[str, None], Tuple[str, Any]]:
+        from bs4 import BeautifulSoup
+
         title_html = BeautifulSoup(title, "lxml")
         re_color = re.search(r"<color=#(.*?)>", title, flags=0)
         if re_color is None:
@@ -16,7 +16,7 @@ from gram_core.plugin import Plugin, handler
 from gram_core.plugin.methods.inline_use_data import IInlineUseData
 from gram_core.services.template.services import TemplateService
 
-from metadata.pool.pool import POOL_301 as CHARACTER_POOL, POOL_302 as WEAPON_POOL, POOL_500 as MIX_POOL
+from metadata.pool.pool import BannerCatalogue, get_banners
 from plugins.tools.player_info import PlayerInfoSystem
 from utils.log import logger
 
@@ -62,8 +62,8 @@ class WishWaitingListPlugin(Plugin):
         if self.waiting_list and (now - self.waiting_list["time"]).total_seconds() < 3600:
             return
         data = {
-            "avatar": await self._get_waiting_list(CHARACTER_POOL, "avatar", self.assets_service.avatar),
-            "weapon": await self._get_waiting_list(WEAPON_POOL, "weapon", self.assets_service.weapon),
+            "avatar": await self._get_waiting_list(get_banners(301), "avatar", self.assets_service.avatar),
+            "weapon": await self._get_waiting_list(get_banners(302), "weapon", self.assets_service.weapon),
             "time": now,
         }
         self.waiting_list.update(data)
@@ -80,12 +80,12 @@ class WishWaitingListPlugin(Plugin):
         five_times: Dict[str, WishWaitingListData],
         four_times: Dict[str, WishWaitingListData],
     ):
-        now = datetime.now()
-        for p in MIX_POOL:
-            does = p[pool_type]
+        now = datetime.now().astimezone()
+        for p in get_banners(500):
+            does = p.data[pool_type]
             fives = does["five"]
             fours = does["four"]
-            last_up_time = datetime.strptime(p["to"], "%Y-%m-%d %H:%M:%S")
+            last_up_time = p.to_time
             last_up_day = max(math.ceil((now - last_up_time).total_seconds() / 86400), 0)
             for i, times in [(fives, five_times), (fours, four_times)]:
                 for n in i:
@@ -99,20 +99,20 @@ class WishWaitingListPlugin(Plugin):
 
     async def _get_waiting_list(
         self,
-        pool,
+        pool: BannerCatalogue,
         pool_type: str,
         assets,
     ) -> Tuple[Dict[str, WishWaitingListData], List[str], Dict[str, WishWaitingListData], List[str]]:
-        now = datetime.now()
+        now = datetime.now().astimezone()
         five_times: Dict[str, WishWaitingListData] = {}
         five_data = []
         four_times: Dict[str, WishWaitingListData] = {}
         four_data = []
         ignore = await self._ignore_static_pool(pool_type)
         for p in pool:
-            fives = p["five"]
-            fours = p["four"]
-            last_up_time = datetime.strptime(p["to"], "%Y-%m-%d %H:%M:%S")
+            fives = p.five
+            fours = p.four
+            last_up_time = p.to_time
             last_up_day = max(math.ceil((now - last_up_time).total_seconds() / 86400), 0)
             for i, times in [(fives, five_times), (fours, four_times)]:
                 for n in i:
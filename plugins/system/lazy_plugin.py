@@ -0,0 +1,26 @@
+from typing import List
+
+from core.plugin import Plugin, get_all_plugins
+from utils.lazy_plugin import LazyPlugin, lazy_plugin_config, lazy_plugins
+from utils.log import logger
+
+
+class LazyPluginLoader(Plugin):
+    """为按需加载的插件注册声明的 handler 与定时任务"""
+
+    def __init__(self):
+        self.plugins: List[LazyPlugin] = []
+
+    async def initialize(self) -> None:
+        if not lazy_plugin_config.enable:
+            return
+        self.plugins = lazy_plugins(self.application, get_all_plugins)
+        for plugin in self.plugins:
+            plugin.install()
+        if self.plugins:
+            logger.info("按需加载的插件：%s", ", ".join(i.declaration.module for i in self.plugins))
+
+    async def shutdown(self) -> None:
+        for plugin in self.plugins:
+            if not plugin.loaded:
+                plugin.uninstall()
@@ -1,4 +1,8 @@
+import asyncio
+import functools
 import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 from telegram import Update
 from telegram.constants import ChatAction
@@ -7,22 +11,61 @@ from telegram.ext import CallbackContext
 from core.config import config
 from core.plugin import Plugin, handler
 from modules.errorpush import PbClient, PbClientException
-from utils.log import logger
+from utils.log import LogQuery, compress_lines, logger, query_log
 
 current_dir = os.getcwd()
 error_log = os.path.join(current_dir, "logs", "error", "error.log")
 debug_log = os.path.join(current_dir, "logs", "debug", "debug.log")
 
+DEFAULT_LINES = 10000
+MAX_LINES = 200000
+
 
 class Log(Plugin):
     def __init__(self):
         self.pb_client = PbClient(config.error.pb_url, 3600, 10000)
 
-    async def send_to_pb(self, file_name: str):
+    @staticmethod
+    def parse_query(args: List[str]) -> Tuple[List[str], LogQuery]:
+        """解析参数
+
+        ``/send_log [error|debug] [行数] [level=WARNING] [since=2024-01-01T10:00] [until=...] [grep=文本]``
+        """
+        names: List[str] = []
+        options: Dict[str, str] = {}
+        lines = DEFAULT_LINES
+        for arg in args:
+            if "=" in arg:
+                key, value = arg.split("=", 1)
+                options[key.lower()] = value
+            elif arg.isdigit():
+                lines = min(int(arg), MAX_LINES)
+            elif arg.lower() in ("error", "debug"):
+                names.append(arg.lower())
+            else:
+                raise ValueError(f"未知参数 {arg}")
+        since = datetime.fromisoformat(options["since"]) if "since" in options else None
+        until = datetime.fromisoformat(options["until"]) if "until" in options else None
+        query = LogQuery(
+            lines=lines,
+            level=options.get("level"),
+            since=since,
+            until=until,
+            keyword=options.get("grep"),
+            time_format=config.logger.time_format,
+        )
+        return names or ["error", "debug"], query
+
+    @staticmethod
+    async def query(file_name: str, query: LogQuery) -> List[str]:
+        """在线程池中从文件末尾读取日志"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(query_log, file_name, query))
+
+    async def send_to_pb(self, lines: List[str]) -> str:
         pb_url = ""
         try:
-            with open(file_name, "r", encoding="utf-8") as f:
-                pb_url = await self.pb_client.create_pb(f.read())
+            pb_url = await self.pb_client.create_pb("\n".join(lines[-self.pb_client.max_lines :]))
         except PbClientException as exc:
             logger.warning("上传错误信息至 fars 失败", exc_info=exc)
         except Exception as exc:
@@ -30,24 +73,35 @@ class Log(Plugin):
             logger.exception(exc)
         return pb_url
 
+    async def send_log_file(self, update: Update, name: str, file_name: str, query: LogQuery) -> Optional[str]:
+        message = update.effective_message
+        title = "Error Log" if name == "error" else "Debug Log"
+        if not (os.path.exists(file_name) and os.path.getsize(file_name) > 0):
+            return "错误日记未找到" if name == "error" else "调试日记未找到"
+        lines = await self.query(file_name, query)
+        if not lines:
+            return f"{title} 中没有符合条件的记录"
+        pb_url = await self.send_to_pb(lines)
+        await message.reply_chat_action(ChatAction.UPLOAD_DOCUMENT)
+        document = compress_lines(lines, os.path.basename(file_name))
+        caption = f"{title} 最后 {len(lines)} 行"
+        await message.reply_document(document, caption=f"{caption}\n{pb_url}/text" if pb_url else caption)
+        return None
+
     @handler.command(command="send_log", block=False, admin=True)
-    async def send_log(self, update: Update, _: CallbackContext):
+    async def send_log(self, update: Update, context: CallbackContext):
         user = update.effective_user
         logger.info("用户 %s[%s] send_log 命令请求", user.full_name, user.id)
         message = update.effective_message
-        if os.path.exists(error_log) and os.path.getsize(error_log) > 0:
-            pb_url = await self.send_to_pb(error_log)
-            await message.reply_chat_action(ChatAction.UPLOAD_DOCUMENT)
-            await message.reply_document(
-                open(error_log, mode="rb+"), caption=f"Error Log\n{pb_url}/text" if pb_url else "Error Log"
-            )
-        else:
-            await message.reply_text("错误日记未找到")
-        if os.path.exists(debug_log) and os.path.getsize(debug_log) > 0:
-            pb_url = await self.send_to_pb(debug_log)
-            await message.reply_chat_action(ChatAction.UPLOAD_DOCUMENT)
-            await message.reply_document(
-                open(debug_log, mode="rb+"), caption=f"Debug Log\n{pb_url}/text" if pb_url else "Debug Log"
+        try:
+            names, query = self.parse_query(self.get_args(context))
+        except ValueError as exc:
+            await message.reply_text(
+                f"参数错误：{exc}\n用法：/send_log [error|debug] [行数] [level=WARNING] "
+                "[since=2024-01-01T10:00] [until=2024-01-01T12:00] [grep=文本]"
             )
-        else:
-            await message.reply_text("调试日记未找到")
+            return
+        for name in names:
+            file_name = error_log if name == "error" else debug_log
+            if text := await self.send_log_file(update, name, file_name, query):
+                await message.reply_text(text)
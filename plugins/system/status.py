@@ -12,11 +12,26 @@ from git import Repo
 from git.exc import GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 
 from core.plugin import Plugin, handler
+from utils.http_client import HTTPClientPool
+from utils.loop_watchdog import event_loop_lag, loop_watchdog
+from utils.metrics import metrics, metrics_config
+from utils.tiered_cache import TieredCache
 from utils.log import logger
 
 if TYPE_CHECKING:
     from telegram.ext import ContextTypes
 
+METRICS_SUMMARY = (
+    ("handler_duration_seconds", "Handler"),
+    ("job_duration_seconds", "定时任务"),
+    ("template_render_duration_seconds", "模板渲染"),
+    ("http_request_duration_seconds", "HTTP 请求"),
+)
+
+
+def escape_markdown(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("`", "\\`")
+
 
 class StatisticsHandler(BaseHandler):
     def __init__(self, plugin: "Status"):
@@ -49,6 +64,18 @@ class Status(Plugin):
     async def initialize(self) -> None:
         self.type_handler = StatisticsHandler(self)
         self.application.telegram.add_handler(self.type_handler, group=-10)
+        messages_gauge = metrics.gauge("telegram_messages_total", "收发消息数", ("direction",))
+        messages_gauge.function = lambda: {("recv",): self.recv_num, ("send",): self.send_num}
+        web_app = getattr(self.application, "web_app", None)
+        if metrics_config.web_enable and web_app is not None:
+            from fastapi.responses import PlainTextResponse
+
+            web_app.add_api_route(
+                metrics_config.web_path,
+                lambda: PlainTextResponse(metrics.exposition(), media_type="text/plain; version=0.0.4"),
+                methods=["GET"],
+                include_in_schema=False,
+            )
 
         @self.application.on_called_api
         async def call(endpoint: str, _, __):
@@ -98,6 +125,54 @@ class Status(Plugin):
             f"运行时间: `{self.get_bot_uptime(start_time)}` \n"
             f"收发消息: ⬇️ {self.recv_num} ⬆️ {self.send_num} \n"
         )
+        http_statistics = sorted(HTTPClientPool.get_statistics().values(), key=lambda x: x.requests, reverse=True)
+        if http_statistics:
+            text += "HTTP 请求 \\(进行中/总数/错误/平均耗时\\): \n"
+            for statistics in http_statistics[:5]:
+                text += (
+                    f"`{statistics.host}`: `{statistics.in_flight}/{statistics.requests}/{statistics.errors}/"
+                    f"{statistics.avg_latency * 1000:.0f}ms` \n"
+                )
+        if loop_watchdog.running:
+            text += (
+                f"事件循环延迟 \\(p50/p95/p99/阻塞次数\\): `{event_loop_lag.quantile(0.5) * 1000:.0f}/"
+                f"{event_loop_lag.quantile(0.95) * 1000:.0f}/{event_loop_lag.quantile(0.99) * 1000:.0f}ms/"
+                f"{loop_watchdog.blocked}` \n"
+            )
+        handler_summary = metrics.summary("handler_duration_seconds", limit=5)
+        if handler_summary:
+            text += "最慢的 Handler \\(p50/p95/p99/次数\\): \n"
+            text += self.format_summary(handler_summary)
+        cache_statistics = sorted(TieredCache.get_statistics().values(), key=lambda x: x.requests, reverse=True)
+        if cache_statistics and cache_statistics[0].requests:
+            text += "缓存 \\(本地命中率/命中率/请求数\\): \n"
+            for statistics in cache_statistics[:5]:
+                if statistics.requests:
+                    text += (
+                        f"`{statistics.name}`: `{statistics.local_hit_ratio:.0%}/{statistics.hit_ratio:.0%}"
+                        f"/{statistics.requests}` \n"
+                    )
+        await message.reply_markdown_v2(text)
+
+    @staticmethod
+    def format_summary(summary) -> str:
+        return "".join(
+            f"`{escape_markdown(labels[0])}`: `{p50 * 1000:.0f}/{p95 * 1000:.0f}/{p99 * 1000:.0f}ms/{count}` \n"
+            for labels, count, p50, p95, p99 in summary
+        )
+
+    @handler.command(command="metrics", block=False, admin=True)
+    async def send_metrics(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
+        user = update.effective_user
+        logger.info("用户 %s[%s] metrics 命令请求", user.full_name, user.id)
+        message = update.effective_message
+        args = self.get_args(context)
+        limit = int(args[0]) if args and args[0].isdigit() else 10
+        text = "耗时统计 \\(p50/p95/p99/次数\\)\n"
+        for name, title in METRICS_SUMMARY:
+            summary = metrics.summary(name, limit=limit)
+            if summary:
+                text += f"*{title}*\n" + self.format_summary(summary)
         await message.reply_markdown_v2(text)
 
     def get_bot_uptime(self, start_time: float) -> str:
@@ -1,9 +1,10 @@
 import asyncio
 import collections.abc
+import itertools
 from contextlib import asynccontextmanager
 from datetime import datetime, time, timedelta
 import random
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
 from typing import TYPE_CHECKING, Union
 
 from pydantic import ValidationError
@@ -32,6 +33,7 @@ from sqlmodel import (
     delete,
     func,
     select,
+    tuple_,
 )
 from sqlmodel.ext.asyncio.session import AsyncSession
 from telegram.ext import ContextTypes
@@ -48,6 +50,7 @@ from core.services.users.services import UserService
 from gram_core.services.cookies.models import CookiesStatusEnum
 from modules.errorpush import SentryClient
 from utils.log import logger
+from utils.tiered_cache import TieredCache
 
 if TYPE_CHECKING:
     from sqlalchemy import Table
@@ -77,6 +80,11 @@ class CharacterDetailsSQLModel(SQLModel, table=True):
 
 
 class CharacterDetails(Plugin):
+    FLUSH_SIZE = 200
+    """待写入数据库的数据达到该数量时立即写入"""
+    MAX_PENDING = 5000
+    """数据库不可用时缓冲区的最大数量，超过时丢弃最早的数据，Redis 中仍有缓存"""
+
     def __init__(
         self,
         database: Database,
@@ -85,6 +93,15 @@ class CharacterDetails(Plugin):
         self.database = database
         self.redis = redis.client
         self.expire = 60 * 60
+        self._pending: Dict[Tuple[int, int], str] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self.details_cache: TieredCache["CalculatorCharacterDetails"] = TieredCache(
+            self.redis,
+            "plugin:character_details",
+            CalculatorCharacterDetails.parse_raw,
+            copy=lambda x: x.copy(deep=True),
+        )
 
     async def initialize(self) -> None:
         def fetch_and_update_objects(connection):
@@ -97,6 +114,13 @@ class CharacterDetails(Plugin):
         async with self.database.engine.begin() as conn:
             await conn.run_sync(fetch_and_update_objects)
 
+    async def shutdown(self) -> None:
+        await self.flush_character_details()
+
+    @job.run_repeating(interval=timedelta(seconds=30), name="FlushCharacterDetailsJob")
+    async def flush_character_details_job(self, _: "ContextTypes.DEFAULT_TYPE"):
+        await self.flush_character_details()
+
     @job.run_daily(time=time(hour=12, minute=0), name="DeleteOldCharacterDetailsJob")
     @SentryClient.monitor(monitor_slug="DeleteOldCharacterDetailsJob")
     async def del_old_data_job(self, _: "ContextTypes.DEFAULT_TYPE"):
@@ -117,39 +141,73 @@ class CharacterDetails(Plugin):
         uid: int,
         character_id: int,
     ) -> Optional["CalculatorCharacterDetails"]:
-        name = self.get_qname(uid, character_id)
-        data = await self.redis.get(name)
-        if data is None:
-            return None
-        json_data = str(data, encoding="utf-8")
-        return CalculatorCharacterDetails.parse_raw(json_data)
+        return await self.details_cache.get(self.get_qname(uid, character_id))
+
+    async def get_character_details_for_redis_many(
+        self, uid: int, character_ids: Iterable[int]
+    ) -> Dict[int, "CalculatorCharacterDetails"]:
+        names = {self.get_qname(uid, character_id): character_id for character_id in character_ids}
+        data = await self.details_cache.get_many(list(names))
+        return {names[name]: detail for name, detail in data.items()}
 
     async def set_character_details(self, player_id: int, character_id: int, data: str):
+        """写入 Redis，数据库由 flush_character_details 批量写入"""
         randint = random.randint(1, 30)  # nosec
-        await self.redis.set(
+        await self.details_cache.set(
             self.get_qname(player_id, character_id), data, ex=self.expire + randint * 60
         )  # 使用随机数防止缓存雪崩
+        key = (player_id, character_id)
+        self._pending.pop(key, None)  # 重新插入到末尾，丢弃时按更新时间从旧到新
+        self._pending[key] = data
+        self._trim_pending()
+        if len(self._pending) >= self.FLUSH_SIZE and not self._flush_lock.locked():
+            task = asyncio.create_task(self.flush_character_details())
+            self._flush_tasks.add(task)  # 保留引用，避免任务在执行中被回收
+            task.add_done_callback(self._flush_tasks.discard)
+
+    def _trim_pending(self):
+        if (overflow := len(self._pending) - self.MAX_PENDING) <= 0:
+            return
+        for key in list(itertools.islice(self._pending, overflow)):
+            del self._pending[key]
+        logger.warning("角色详细信息写入缓冲区已满，丢弃了 %s 条最早的数据", overflow)
+
+    async def flush_character_details(self):
+        """将缓冲区中的角色详细信息批量写入数据库"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                await self._upsert_character_details(pending)
+            except SQLAlchemyError as exc:
+                logger.error("写入到数据库失败 code[%s]", exc.code)
+                logger.debug("写入到数据库失败", exc_info=exc)
+                pending.update(self._pending)  # 放回缓冲区等待下次写入，不覆盖更新的数据
+                self._pending = pending
+                self._trim_pending()
+
+    async def _upsert_character_details(self, pending: Dict[Tuple[int, int], str]):
+        now = datetime.now()
+        items = list(pending.items())
         async with AsyncSession(self.database.engine) as session:
-            statement = (
-                select(CharacterDetailsSQLModel)
-                .where(CharacterDetailsSQLModel.player_id == player_id)
-                .where(CharacterDetailsSQLModel.character_id == character_id)
-            )
-            results = await session.exec(statement)
-            sql_data = results.first()
-        if sql_data is None:
-            sql_data = CharacterDetailsSQLModel(
-                player_id=player_id, character_id=character_id, data=data, time_updated=datetime.now()
-            )
-            async with AsyncSession(self.database.engine) as session:
-                session.add(sql_data)
-                await session.commit()
-        else:
-            sql_data.data = data
-            sql_data.time_updated = datetime.now()
-            async with AsyncSession(self.database.engine) as session:
-                session.add(sql_data)
-                await session.commit()
+            for start in range(0, len(items), 500):
+                chunk = dict(items[start : start + 500])
+                statement = select(CharacterDetailsSQLModel).where(
+                    tuple_(CharacterDetailsSQLModel.player_id, CharacterDetailsSQLModel.character_id).in_(list(chunk))
+                )
+                results = await session.exec(statement)
+                for sql_data in results.all():
+                    sql_data.data = chunk.pop((sql_data.player_id, sql_data.character_id))
+                    sql_data.time_updated = now
+                    session.add(sql_data)
+                session.add_all(
+                    CharacterDetailsSQLModel(
+                        player_id=player_id, character_id=character_id, data=data, time_updated=now
+                    )
+                    for (player_id, character_id), data in chunk.items()
+                )
+            await session.commit()
 
     async def set_character_details_task(self, player_id: int, character_id: int, data: str):
         try:
@@ -165,6 +223,8 @@ class CharacterDetails(Plugin):
         uid: int,
         character_id: int,
     ) -> Optional["CalculatorCharacterDetails"]:
+        if (data := self._pending.get((uid, character_id))) is not None:
+            return CalculatorCharacterDetails.parse_raw(data)
         async with AsyncSession(self.database.engine) as session:
             statement = (
                 select(CharacterDetailsSQLModel)
@@ -199,13 +259,43 @@ class CharacterDetails(Plugin):
             detail = await self.get_character_details_for_redis(uid, character_id)
             if detail is not None:
                 return detail
+        return await self._fetch_character_details(client, character_id)
+
+    async def get_character_details_many(
+        self, client: "GenshinClient", characters: "Iterable[Union[int,Character]]", concurrency: int = 4
+    ) -> Dict[int, Optional["CalculatorCharacterDetails"]]:
+        """批量获取角色详细信息，先通过一次 MGET 读取缓存，未命中的角色并发请求
+
+        :param client: 客户端
+        :param characters: 角色或角色 ID
+        :param concurrency: 最大并发请求数
+        :return: 角色 ID 与详细信息
+        """
+        character_ids = list(dict.fromkeys(i.id if isinstance(i, Character) else i for i in characters))
+        result: Dict[int, Optional["CalculatorCharacterDetails"]] = {}
+        if client.player_id is not None:
+            result.update(await self.get_character_details_for_redis_many(client.player_id, character_ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _fetch(_character_id: int):
+            async with semaphore:
+                result[_character_id] = await self._fetch_character_details(client, _character_id)
+
+        await asyncio.gather(*(_fetch(i) for i in character_ids if i not in result))
+        return result
+
+    async def _fetch_character_details(
+        self, client: "GenshinClient", character_id: int
+    ) -> Optional["CalculatorCharacterDetails"]:
+        uid = client.player_id
+        if uid is not None:
             try:
                 detail = await client.get_character_details(character_id)
             except SimnetBadRequest as exc:
                 if "Too Many Requests" in exc.message:
                     return await self.get_character_details_for_mysql(uid, character_id)
                 raise exc
-            asyncio.create_task(self.set_character_details(uid, character_id, detail.json(by_alias=True)))
+            await self.set_character_details_task(uid, character_id, detail.json(by_alias=True))
             return detail
         try:
             return await client.get_character_details(character_id)
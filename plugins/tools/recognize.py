@@ -1,9 +1,10 @@
 from json import JSONDecodeError
 from typing import Optional
 
-from httpx import AsyncClient, TimeoutException
+from httpx import TimeoutException
 
 from core.config import config
+from utils.http_client import HTTPClientPool
 from utils.log import logger
 
 
@@ -34,7 +35,7 @@ class RecognizeSystem:
             "Chrome/107.0.0.0 Safari/537.36",
         }
         try:
-            async with AsyncClient(headers=headers) as client:
+            async with HTTPClientPool.create_client(headers=headers) as client:
                 resp = await client.post(
                     config.pass_challenge_api,
                     params=pass_challenge_params,
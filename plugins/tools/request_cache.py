@@ -0,0 +1,21 @@
+from core.dependence.redisdb import RedisDB
+from core.plugin import Plugin
+from modules.apihelper.client.base.cache import request_cache
+from utils.tiered_cache import TieredCache
+
+__all__ = ("RequestCachePlugin",)
+
+
+class RequestCachePlugin(Plugin):
+    """为公共接口的响应缓存启用 Redis 二级缓存，并订阅进程内缓存的失效通知，使多个进程可以共享缓存"""
+
+    def __init__(self, redis: RedisDB):
+        self.redis = redis
+
+    async def initialize(self) -> None:
+        request_cache.set_redis(self.redis.client)
+        TieredCache.start_invalidation(self.redis.client)
+
+    async def shutdown(self) -> None:
+        request_cache.set_redis(None)
+        await TieredCache.stop_invalidation()
@@ -0,0 +1,107 @@
+import asyncio
+import datetime
+import io
+from typing import Dict, List
+
+import pytest
+import pytest_benchmark.fixture
+from simnet.models.genshin.wish import BannerType
+
+from modules.gacha_log.const import GACHA_TYPE_LIST
+from modules.gacha_log.log import GachaLog
+from modules.gacha_log.models import GachaItem, GachaLogInfo
+
+SIZES = ["gacha_items_10k", "gacha_items_100k"]
+UIGF_HEADER = ["count", "gacha_type", "id", "item_id", "item_type", "lang", "name", "rank_type", "time", "uid"]
+
+
+def new_gacha_log() -> GachaLogInfo:
+    return GachaLogInfo(user_id="0", uid="100000000", update_time=datetime.datetime(2024, 1, 1), item_list={})
+
+
+def import_items(raw_items: List[Dict[str, str]], gacha_log: GachaLogInfo) -> int:
+    """与 ``GachaLog.import_gacha_log_data`` 相同的流程，不读写文件"""
+    all_items = [GachaItem(**i) for i in raw_items]
+    asyncio.run(GachaLog.verify_data(all_items))
+    temp_id_data = {pool_name: {i.id for i in pool_data} for pool_name, pool_data in gacha_log.item_list.items()}
+    new_num = GachaLog.import_data_backend(all_items, gacha_log, temp_id_data)
+    for i in gacha_log.item_list.values():
+        i.sort(key=lambda x: (x.time, x.id))
+    return new_num
+
+
+def uigf_workbook(raw_items: List[Dict[str, str]]) -> bytes:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.active.title = "角色活动祈愿"
+    for title in ("武器活动祈愿", "常驻祈愿", "新手祈愿"):
+        wb.create_sheet(title)
+    ws = wb.create_sheet("原始数据")
+    ws.append(UIGF_HEADER + ["uigf_gacha_type"])
+    for item in raw_items:
+        gacha_type = item["gacha_type"]
+        ws.append(
+            [
+                "1",
+                gacha_type,
+                item["id"],
+                "",
+                item["item_type"],
+                "zh-cn",
+                item["name"],
+                item["rank_type"],
+                item["time"],
+                "100000000",
+                "301" if gacha_type == "400" else gacha_type,
+            ]
+        )
+    file = io.BytesIO()
+    wb.save(file)
+    return file.getvalue()
+
+
+@pytest.mark.parametrize("items", SIZES)
+def test_import(benchmark: pytest_benchmark.fixture.BenchmarkFixture, request: pytest.FixtureRequest, items: str):
+    raw_items = request.getfixturevalue(items)
+    result = benchmark.pedantic(
+        import_items, setup=lambda: ((raw_items, new_gacha_log()), {}), rounds=3, iterations=1, warmup_rounds=1
+    )
+    assert result == len(raw_items)
+
+
+@pytest.mark.parametrize("items", SIZES)
+def test_dedup(benchmark: pytest_benchmark.fixture.BenchmarkFixture, request: pytest.FixtureRequest, items: str):
+    raw_items = request.getfixturevalue(items)
+    half = len(raw_items) // 2
+
+    def setup():
+        gacha_log = new_gacha_log()
+        import_items(raw_items[:half], gacha_log)
+        return (raw_items, gacha_log), {}
+
+    result = benchmark.pedantic(import_items, setup=setup, rounds=3, iterations=1)
+    assert result == len(raw_items) - half
+
+
+@pytest.mark.parametrize("items", SIZES)
+@pytest.mark.parametrize("pool", [BannerType.CHARACTER1, BannerType.WEAPON, BannerType.PERMANENT])
+def test_analysis(
+    benchmark: pytest_benchmark.fixture.BenchmarkFixture, request: pytest.FixtureRequest, items: str, pool: BannerType
+):
+    """抽卡分析模板的数据准备"""
+    gacha_log = new_gacha_log()
+    import_items(request.getfixturevalue(items), gacha_log)
+    service = GachaLog()
+    result = benchmark.pedantic(
+        lambda: asyncio.run(service.get_analysis_data(gacha_log, pool, None)), rounds=5, iterations=1
+    )
+    assert result["allNum"] == len(gacha_log.item_list[GACHA_TYPE_LIST[pool]])
+
+
+def test_convert_xlsx_to_uigf(benchmark: pytest_benchmark.fixture.BenchmarkFixture, gacha_items_10k):
+    data = uigf_workbook(gacha_items_10k)
+    result = benchmark.pedantic(
+        lambda: GachaLog.convert_xlsx_to_uigf(io.BytesIO(data), {}), rounds=3, iterations=1, warmup_rounds=1
+    )
+    assert len(result["hk4e"][0]["list"]) == len(gacha_items_10k)
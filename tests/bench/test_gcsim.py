@@ -0,0 +1,52 @@
+import pytest_benchmark.fixture
+
+from plugins.genshin.model.converters.gcsim import GCSimConverter
+
+TEAM = """
+raiden char lvl=90/90 cons=0 talent=9,9,10;
+raiden add weapon="engulfinglightning" refine=1 lvl=90/90;
+raiden add set="emblemofseveredfate" count=4;
+raiden add stats hp=4780 atk=311 er=0.518 electro%=0.466 cr=0.311; # main
+raiden add stats def%=0.124 def=39.36 hp=507.88 hp%=0.0992 atk=33.08 atk%=0.1984 er=0.1102 em=39.64 cr=0.331 cd=0.7944;
+
+xingqiu char lvl=90/90 cons=6 talent=9,9,10;
+xingqiu add weapon="sacrificialsword" refine=5 lvl=90/90;
+xingqiu add set="emblemofseveredfate" count=4;
+xingqiu add stats hp=4780 atk=311 atk%=0.466 hydro%=0.466 cr=0.311;
+xingqiu add stats def%=0.124 def=39.36 hp=507.88 hp%=0.0992 atk=33.08 atk%=0.1984 er=0.1102 em=39.64 cr=0.331 cd=0.7944;
+
+bennett char lvl=90/90 cons=6 talent=9,9,10;
+bennett add weapon="skywardblade" refine=1 lvl=90/90;
+bennett add set="noblesseoblige" count=4;
+bennett add stats hp=4780 atk=311 er=0.518 hp%=0.466 heal=0.359;
+bennett add stats def%=0.124 def=39.36 hp=507.88 hp%=0.0992 atk=33.08 atk%=0.1984 er=0.1102 em=39.64 cr=0.331 cd=0.7944;
+
+xiangling char lvl=90/90 cons=6 talent=9,9,10;
+xiangling add weapon="thecatch" refine=5 lvl=90/90;
+xiangling add set="emblemofseveredfate" count=4;
+xiangling add stats hp=4780 atk=311 er=0.518 pyro%=0.466 cr=0.311;
+xiangling add stats def%=0.124 def=39.36 hp=507.88 hp%=0.0992 atk=33.08 atk%=0.1984 er=0.1102 em=39.64 cr=0.331 cd=0.7944;
+
+options iteration=1000 duration=90 swap_delay=12;
+target lvl=100 resist=0.1 radius=2 pos=2.1,0;
+energy every interval=480,720 amount=1;
+
+active raiden;
+
+for let i = 0; i < 4; i = i + 1 {
+  raiden skill;
+  xingqiu burst, attack, skill, dash, attack;
+  bennett burst, attack, skill;
+  xiangling attack, burst, attack, skill;
+  raiden burst;
+  while !.status.raidenburst == 0 {
+    raiden attack;
+  }
+}
+"""
+
+
+def test_from_gcsim_script(benchmark: pytest_benchmark.fixture.BenchmarkFixture):
+    result = benchmark(GCSimConverter.from_gcsim_script, TEAM)
+    assert len(result.characters) == 4
+    assert result.active_character == "raiden"
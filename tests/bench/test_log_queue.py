@@ -0,0 +1,39 @@
+import logging
+
+import pytest
+import pytest_benchmark.fixture
+
+from utils.log._handler import FileHandler
+from utils.log._queue import LogWriter, QueueHandler
+
+
+@pytest.fixture()
+def file_handler(tmp_path):
+    handler = FileHandler(path=tmp_path / "bench.log", width=180)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    yield handler
+    handler.close()
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    bench_logger = logging.getLogger(name)
+    bench_logger.propagate = False
+    bench_logger.handlers = [handler]
+    bench_logger.setLevel(logging.INFO)
+    return bench_logger
+
+
+def test_direct_logging(benchmark: pytest_benchmark.fixture.BenchmarkFixture, file_handler):
+    bench_logger = make_logger("bench.direct", file_handler)
+    benchmark(bench_logger.info, "用户 %s 签到成功 奖励 %s", 10001, "原石 x60")
+
+
+def test_queue_logging(benchmark: pytest_benchmark.fixture.BenchmarkFixture, file_handler):
+    writer = LogWriter([file_handler], maxsize=100000, policy="block")
+    writer.start()
+    bench_logger = make_logger("bench.queue", QueueHandler(writer))
+    try:
+        benchmark(bench_logger.info, "用户 %s 签到成功 奖励 %s", 10001, "原石 x60")
+    finally:
+        writer.stop(timeout=None)
+    assert writer.dropped == 0
@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+import pytest_benchmark.fixture
+from enkanetwork import Assets
+
+from modules.playercards.models import EnkaNetworkResponse
+from modules.playercards.to_enka import HashMapRev, from_simnet_to_enka
+from plugins.genshin.player_cards import RenderTemplate
+from tests.bench.test_to_enka import character
+
+UID = 100000001
+
+
+class DataTemplateService:
+    """不启动浏览器，直接返回模板数据"""
+
+    async def render(self, template_name: str, template_data: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        return template_data
+
+
+class OfflineRenderTemplate(RenderTemplate):
+    async def cache_images(self) -> None:
+        """缓存图片依赖网络，不计入模板数据准备的耗时"""
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def characters():
+    HashMapRev.reload_assets()
+    artifact_ids = [int(i) for i in list(Assets.DATA["artifacts"])[:5]]
+    data = from_simnet_to_enka(SimpleNamespace(characters=[character(artifact_ids) for _ in range(8)]))
+    return EnkaNetworkResponse.parse_obj(data).characters
+
+
+def test_player_card_render_data(benchmark: pytest_benchmark.fixture.BenchmarkFixture, loop, characters):
+    template_service = DataTemplateService()
+
+    async def prepare():
+        return [await OfflineRenderTemplate(UID, i, {}, {}, template_service).render() for i in characters]
+
+    result = benchmark(lambda: loop.run_until_complete(prepare()))
+    assert len(result) == len(characters)
+    assert all(len(i["artifacts"]) == 5 and i["weapon"] is not None for i in result)
@@ -0,0 +1,71 @@
+import asyncio
+import random
+
+import pytest
+import pytest_benchmark.fixture
+
+from core.services.search.models import StrategyEntry, WeaponEntry
+from core.services.search.services import SearchServices
+from metadata.shortname import roles, weapons
+
+QUERIES = ["雾切", "绫华 攻略", "护摩之杖", "雷电将军培养", "不存在的条目"]
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def search_service(loop, tmp_path_factory) -> SearchServices:
+    rng = random.Random(0)
+    service = SearchServices()
+    service.entry_data_path = tmp_path_factory.mktemp("entry")
+    service.entry_log_path = service.entry_data_path / "entry.jsonl"
+    entries = []
+    for name, alias in weapons.items():
+        entries.append(
+            WeaponEntry(key=f"weapon:{name}", title=name, description=f"{name} 武器图鉴 {' '.join(alias)}", tags=alias)
+        )
+    for cid, names in roles.items():
+        for index in range(3):
+            entries.append(
+                StrategyEntry(
+                    key=f"strategy:{cid}:{index}",
+                    title=f"{names[0]}角色攻略 {index}",
+                    description=f"{names[0]}的培养、配队与武器推荐 {rng.randint(0, 1000)}",
+                    tags=names,
+                )
+            )
+
+    async def add_all():
+        for entry in entries:
+            await service.add_entry(entry)
+
+    loop.run_until_complete(add_all())
+    return service
+
+
+def test_search_cold(benchmark: pytest_benchmark.fixture.BenchmarkFixture, loop, search_service: SearchServices):
+    """每次查询前清空查询缓存"""
+
+    async def run():
+        result = []
+        for query in QUERIES:
+            search_service._query_cache.clear()  # pylint: disable=W0212
+            result.append(await search_service.search(query, 5))
+        return result
+
+    result = benchmark(lambda: loop.run_until_complete(run()))
+    assert result[0]
+
+
+def test_search_cached(benchmark: pytest_benchmark.fixture.BenchmarkFixture, loop, search_service: SearchServices):
+    async def run():
+        return [await search_service.search(query, 5) for query in QUERIES]
+
+    loop.run_until_complete(run())
+    result = benchmark(lambda: loop.run_until_complete(run()))
+    assert result[0]
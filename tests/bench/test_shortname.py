@@ -0,0 +1,63 @@
+import functools
+import random
+
+import pytest_benchmark.fixture
+
+from metadata.shortname import roleToId, roleToName, roles, weaponToId, weapons
+from modules.gacha_log.models import GachaItem
+
+ROLE_NAMES = [value[0] for key, value in roles.items() if key != 20000000]
+
+
+# Old implementation
+@functools.lru_cache()
+def old_role_to_id(name: str):
+    name = str.casefold(name)
+    return next((key for key, value in roles.items() for n in value if n == name), None)
+
+
+def gen_gacha_items(count: int):
+    rng = random.Random(0)
+    return [
+        {
+            "id": str(1000000000000000000 + i),
+            "name": rng.choice(ROLE_NAMES),
+            "gacha_type": "301",
+            "item_type": "角色",
+            "rank_type": rng.choice(["3", "4", "5"]),
+            "time": "2024-01-01 00:00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def test_old_role_to_id(benchmark: pytest_benchmark.fixture.BenchmarkFixture):
+    def run():
+        old_role_to_id.cache_clear()
+        return [old_role_to_id(name) for name in ROLE_NAMES]
+
+    result = benchmark(run)
+    assert result == [roleToId(name) for name in ROLE_NAMES]
+
+
+def test_new_role_to_id(benchmark: pytest_benchmark.fixture.BenchmarkFixture):
+    result = benchmark(lambda: [roleToId(name) for name in ROLE_NAMES])
+    assert None not in result
+
+
+def test_role_to_name_alias(benchmark: pytest_benchmark.fixture.BenchmarkFixture):
+    aliases = [name for value in roles.values() for name in value]
+    result = benchmark(lambda: [roleToName(name) for name in aliases])
+    assert len(result) == len(aliases)
+
+
+def test_weapon_to_id(benchmark: pytest_benchmark.fixture.BenchmarkFixture):
+    aliases = [name for key, value in weapons.items() for name in (key, *value)]
+    result = benchmark(lambda: [weaponToId(name) for name in aliases])
+    assert len(result) == len(aliases)
+
+
+def test_validate_100k_gacha_items(benchmark: pytest_benchmark.fixture.BenchmarkFixture):
+    items = gen_gacha_items(100_000)
+    result = benchmark.pedantic(lambda: [GachaItem.model_validate(i) for i in items], rounds=3, iterations=1)
+    assert len(result) == len(items)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+import pytest_benchmark.fixture
+from enkanetwork import Assets
+
+from modules.playercards.to_enka import HashMapRev, from_simnet_to_enka
+
+# 神里绫华
+AVATAR_ID = 10000002
+SKILLS = [
+    (10024, "普通攻击·神里流·倾", 1),
+    (10018, "神里流·冰华", 1),
+    (10019, "神里流·霜灭", 1),
+    (1002, "天罪国罪镇词", 2),
+]
+WEAPON_ID = 11509
+
+
+def prop(property_type: int, final: str) -> SimpleNamespace:
+    return SimpleNamespace(property_type=property_type, final=final, value=final)
+
+
+def character(artifact_ids) -> SimpleNamespace:
+    """与 simnet ``GenshinDetailCharacter`` 属性相同的角色数据"""
+    artifacts = [
+        SimpleNamespace(
+            id=artifact_id,
+            level=20,
+            set=SimpleNamespace(name="冰风迷途的勇士"),
+            main_property=prop(2000, "4780"),
+            sub_property_list=[prop(20, "10.5%"), prop(22, "21.0%"), prop(6, "5.8%"), prop(28, "23")],
+        )
+        for artifact_id in artifact_ids
+    ]
+    return SimpleNamespace(
+        base=SimpleNamespace(id=AVATAR_ID, friendship=10, level=90),
+        artifacts=artifacts,
+        weapon=SimpleNamespace(
+            id=WEAPON_ID,
+            refinement=1,
+            level=90,
+            ascension=6,
+            main_property=prop(4, "674"),
+            sub_property=prop(22, "44.1%"),
+        ),
+        base_properties=[prop(2000, "20000"), prop(2001, "2000"), prop(2002, "800")],
+        extra_properties=[prop(20, "60.5%"), prop(22, "180.2%"), prop(23, "120.0%")],
+        element_properties=[prop(46, "61.6%")],
+        skills=[SimpleNamespace(id=i, name=name, skill_type=t, level=10) for i, name, t in SKILLS],
+        constellations=[
+            SimpleNamespace(id=21 + i, activated=i < 3, effect="神里流·冰华的技能等级提高3级。" if i == 2 else "")
+            for i in range(6)
+        ],
+    )
+
+
+@pytest.fixture(scope="module")
+def characters() -> SimpleNamespace:
+    HashMapRev.reload_assets()
+    artifact_ids = [int(i) for i in list(Assets.DATA["artifacts"])[:5]]
+    return SimpleNamespace(characters=[character(artifact_ids) for _ in range(8)])
+
+
+def test_from_simnet_to_enka(benchmark: pytest_benchmark.fixture.BenchmarkFixture, characters):
+    result = benchmark(from_simnet_to_enka, characters)
+    assert len(result["avatarInfoList"]) == len(characters.characters)
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+import pytest_benchmark.fixture
+
+from modules.wish.banner import GachaBanner, GenshinBannerType
+from modules.wish.player.info import PlayerGachaInfo
+from modules.wish.system import BannerSystem
+
+PULLS = 1000
+
+
+def event_banner() -> GachaBanner:
+    return GachaBanner(
+        title="角色活动祈愿",
+        banner_type=GenshinBannerType.EVENT,
+        wish_max_progress=1,
+        rate_up_items5=[10000052],
+        fallback_items5_pool1=[10000003, 10000016, 10000041, 10000035, 10000042, 10000079],
+        rate_up_items4=[10000025, 10000023, 10000031],
+        fallback_items4_pool1=[10000032, 10000036, 10000043, 10000024, 10000014],
+        fallback_items4_pool2=[11401, 12401, 13401, 14401, 15401],
+    )
+
+
+def weapon_banner() -> GachaBanner:
+    return GachaBanner(
+        title="武器活动祈愿",
+        banner_type=GenshinBannerType.WEAPON,
+        wish_max_progress=2,
+        event_chance5=75,
+        event_chance4=75,
+        rate_up_items5=[13509, 11509],
+        fallback_items5_pool2=[11501, 11502, 12501, 12502, 13502, 13505, 14501, 14502, 15501, 15502],
+        rate_up_items4=[11401, 12401, 13407, 14401, 15401],
+        fallback_items4_pool1=[10000032, 10000036, 10000043],
+        fallback_items4_pool2=[11402, 12402, 14402, 15402],
+    )
+
+
+@pytest.mark.parametrize("banner", [event_banner, weapon_banner])
+def test_wish_simulation(benchmark: pytest_benchmark.fixture.BenchmarkFixture, banner):
+    system = BannerSystem()
+    gacha_banner = banner()
+
+    def run():
+        random.seed(0)
+        player = PlayerGachaInfo()
+        return [item for _ in range(PULLS // 10) for item in system.do_pulls(player, gacha_banner, 10)]
+
+    result = benchmark(run)
+    assert len(result) == PULLS
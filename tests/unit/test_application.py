@@ -0,0 +1,33 @@
+from utils.http_client import HTTPClientPool
+from utils.loop_watchdog import loop_watchdog
+from utils.patch import application as application_patch
+from utils.patch.methods import patch
+
+
+class Application:
+    """与 gram_core 相同，``shutdown()`` 逐个关闭组件"""
+
+    def __init__(self):
+        self.watchdog_running = None
+        self.pool_open = None
+
+    async def initialize(self):
+        self.watchdog_running = loop_watchdog.running
+
+    async def shutdown(self):
+        # 组件关闭时仍然可以使用共享连接池
+        self.pool_open = HTTPClientPool._transport is not None  # pylint: disable=W0212
+
+
+patch(Application)(application_patch.Application)
+
+
+async def test_application_lifecycle():
+    HTTPClientPool.get_transport()
+    application = Application()
+    await application.initialize()
+    assert application.watchdog_running
+    await application.shutdown()
+    assert application.pool_open
+    assert HTTPClientPool._transport is None  # pylint: disable=W0212
+    assert not loop_watchdog.running
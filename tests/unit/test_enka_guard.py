@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from enkanetwork.exception import EnkaPlayerNotFound, EnkaServerRateLimit, NetworkError
+
+from utils.enkanetwork import EnkaRequestGuard
+
+
+async def test_single_flight():
+    guard = EnkaRequestGuard()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"uid": 1}
+
+    results = await asyncio.gather(*(guard.call(1, fetch) for _ in range(5)), guard.call(1, fetch, kind="other"))
+    assert calls == 2
+    assert results[0] == results[-1] == {"uid": 1}
+    assert not guard._inflight  # pylint: disable=W0212
+
+
+async def test_single_flight_error():
+    guard = EnkaRequestGuard()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise NetworkError("offline")
+
+    results = await asyncio.gather(*(guard.call(2, fetch) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(i, NetworkError) for i in results)
+    assert len({id(i) for i in results}) == 3
+
+
+async def test_negative_cache(monkeypatch):
+    guard = EnkaRequestGuard()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        raise EnkaPlayerNotFound("not found")
+
+    with pytest.raises(EnkaPlayerNotFound):
+        await guard.call(3, fetch)
+    cached, _ = guard._negative["3"]  # pylint: disable=W0212
+    traceback = cached.__traceback__
+    errors = []
+    for _ in range(3):
+        with pytest.raises(EnkaPlayerNotFound, match="not found") as exc_info:
+            await guard.call(3, fetch)
+        errors.append(exc_info.value)
+    assert calls == 1
+    assert len({id(i) for i in errors}) == 3 and cached not in errors
+    assert cached.__traceback__ is traceback
+
+    monkeypatch.setitem(guard.NEGATIVE_TTL, EnkaPlayerNotFound, 0.01)
+    guard._negative.clear()  # pylint: disable=W0212
+    with pytest.raises(EnkaPlayerNotFound):
+        await guard.call(3, fetch)
+    await asyncio.sleep(0.02)
+    with pytest.raises(EnkaPlayerNotFound):
+        await guard.call(3, fetch)
+    assert calls == 3
+
+
+async def test_breaker():
+    guard = EnkaRequestGuard()
+
+    async def limited():
+        raise EnkaServerRateLimit("rate limit")
+
+    async def fetch():
+        return {}
+
+    with pytest.raises(EnkaServerRateLimit):
+        await guard.call(4, limited)
+    assert guard.breaker_open
+    with pytest.raises(EnkaServerRateLimit):
+        await guard.call(5, fetch)
+    guard._breaker = (guard._breaker[0], 0)  # pylint: disable=W0212
+    assert await guard.call(5, fetch) == {}
+    assert not guard.breaker_open
@@ -0,0 +1,53 @@
+import pytest
+
+from utils import fuzzy
+from utils.fuzzy import FuzzyIndex, edit_distance
+
+
+def test_edit_distance():
+    assert edit_distance("刻晴", "刻晴", 1) == 0
+    assert edit_distance("刻情", "刻晴", 1) == 1
+    assert edit_distance("雷电将军", "雷", 1) == 2
+
+
+def test_fuzzy_index_search():
+    index: FuzzyIndex[int] = FuzzyIndex()
+    index.update([("雷电将军", 1), ("雷神", 1), ("刻晴", 2), ("Keqing", 2), ("雾切之回光", 3)])
+    assert index.search("keqing", limit=1) == [(2, 100.0)]
+    assert index.search("雷电将君", limit=1)[0][0] == 1
+    assert index.search("雾切", limit=1)[0][0] == 3
+    assert index.search("雷神将军", limit=1)[0][0] == 1
+    assert index.search("1000000001") == []
+
+
+def test_fuzzy_index_min_score():
+    index: FuzzyIndex[str] = FuzzyIndex()
+    index.update([("胡桃", "胡桃"), ("可莉", "可莉"), ("刻晴", "刻晴"), ("雷电将军", "雷电将军")])
+    assert index.search("刻") == []
+    assert index.search("雷") == []
+    assert index.search("胡须桃子") == []
+    assert index.search("胡子", min_score=75) == []
+
+
+def test_fuzzy_index_typo(monkeypatch):
+    monkeypatch.setattr(fuzzy, "lazy_pinyin", None)
+    index: FuzzyIndex[str] = FuzzyIndex()
+    index.update(
+        [("胡桃", "胡桃"), ("可莉", "可莉"), ("刻晴", "刻晴"), ("雷电将军", "雷电将军"), ("护摩之杖", "护摩之杖")]
+    )
+    # 两个字的名称错一个字与四个字的名称错一个字得分相同
+    assert index.search("刻情") == [("刻晴", 70.0)]
+    assert index.search("可梨") == [("可莉", 70.0)]
+    assert index.search("雷电将君") == [("雷电将军", 70.0)]
+    assert index.search("护摩之仗") == [("护摩之杖", 70.0)]
+
+
+def test_fuzzy_index_pinyin():
+    pytest.importorskip("pypinyin")
+    index: FuzzyIndex[str] = FuzzyIndex()
+    index.update([("胡桃", "胡桃"), ("胡子", "胡子"), ("可莉", "可莉"), ("刻晴", "刻晴")])
+    # 同音字优先于字形相近的名称
+    assert index.search("胡淘", limit=1) == [("胡桃", 95.0)]
+    assert index.search("刻情", limit=1) == [("刻晴", 95.0)]
+    assert index.search("kq", limit=1) == [("刻晴", 100.0)]
+    assert index.search("刻") == []
@@ -0,0 +1,97 @@
+import sys
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from telegram import Update
+from telegram.ext import ApplicationBuilder, CallbackContext, filters
+
+from utils.lazy_plugin import LazyJob, LazyPlugin, LazyPluginFinder, PluginDeclaration
+
+PLUGIN_SOURCE = """
+from collections import Counter
+
+from telegram.ext import MessageHandler, filters
+
+IMPORTED = True
+
+
+class FakePlugin:
+    def __init__(self, counter: Counter):
+        self.counter = counter
+        self.application = None
+        self.updates = []
+        self.jobs = 0
+
+    def set_application(self, application):
+        self.application = application
+
+    async def install(self):
+        telegram = self.application.telegram
+        telegram.add_handler(MessageHandler(filters.Regex("^lazy"), self.on_message))
+        telegram.job_queue.run_once(self.on_job, 3600, name="lazy_job")
+
+    async def on_message(self, update, _):
+        self.updates.append(update.effective_message.text)
+
+    async def on_job(self, _):
+        self.jobs += 1
+"""
+
+
+@pytest.fixture
+def finder(tmp_path, monkeypatch):
+    tmp_path.joinpath("lazy_fake_plugin.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    finder = LazyPluginFinder(["lazy_fake_plugin"])
+    finder.install()
+    yield finder
+    sys.meta_path.remove(finder)
+    sys.modules.pop("lazy_fake_plugin", None)
+
+
+def make_update(bot, text: str) -> Update:
+    message = {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 1, "type": "private"},
+        "from": {"id": 1, "is_bot": False, "first_name": "a"},
+        "text": text,
+    }
+    return Update.de_json({"update_id": 1, "message": message}, bot)
+
+
+async def test_load_on_first_trigger(finder):
+    import lazy_fake_plugin  # pylint: disable=C0415
+
+    assert finder.is_placeholder("lazy_fake_plugin")
+    assert "IMPORTED" not in lazy_fake_plugin.__dict__
+
+    telegram = ApplicationBuilder().token("1:a").build()
+    counter = Counter()
+    managers = SimpleNamespace(plugins_map={}, services_map={Counter: counter})
+    application = SimpleNamespace(telegram=telegram, managers=managers)
+    declaration = PluginDeclaration(
+        "lazy_fake_plugin", messages=(filters.Regex("^lazy"),), jobs=(LazyJob("lazy_job", "run_once", {"when": 60}),)
+    )
+    lazy = LazyPlugin(declaration, application, lambda: [sys.modules["lazy_fake_plugin"].FakePlugin], finder)
+    lazy.install()
+    assert telegram.handlers[0] == lazy.handlers
+    placeholder = lazy.jobs[0]
+
+    # 定时任务触发时加载插件，并执行插件注册的同名任务
+    await lazy.on_job(SimpleNamespace(job=placeholder))
+    module = sys.modules["lazy_fake_plugin"]
+    assert module.IMPORTED and not finder.is_placeholder("lazy_fake_plugin")
+    plugin = managers.plugins_map[module.FakePlugin]
+    assert plugin.counter is counter
+    assert plugin.jobs == 1
+    assert lazy.handlers[0] not in telegram.handlers[0]
+    assert [i.name for i in telegram.job_queue.jobs()] == ["lazy_job"]
+    assert telegram.job_queue.jobs()[0] is not placeholder
+
+    # 已经加载后交给插件自己的 handler 处理
+    await lazy.on_update(make_update(telegram.bot, "lazy card"), CallbackContext(telegram))
+    await lazy.on_update(make_update(telegram.bot, "other"), CallbackContext(telegram))
+    assert plugin.updates == ["lazy card"]
+    assert len(managers.plugins_map) == 1
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from tools.loadtest.runner import percentile
+from tools.loadtest.telegram import FakeBotAPI, parse_body
+
+
+def test_parse_multipart_body():
+    body = (
+        b"--XX\r\n"
+        b'Content-Disposition: form-data; name="chat_id"\r\n\r\n42\r\n'
+        b"--XX\r\n"
+        b'Content-Disposition: form-data; name="photo"; filename="a.png"\r\n'
+        b"Content-Type: image/png\r\n\r\n\x89PNG\r\n"
+        b"--XX--\r\n"
+    )
+    assert parse_body("multipart/form-data; boundary=XX", body) == {"chat_id": "42"}
+    assert parse_body("application/x-www-form-urlencoded", b"chat_id=5&text=%E4%BD%A0") == {
+        "chat_id": "5",
+        "text": "你",
+    }
+
+
+async def test_wait_idle():
+    api = FakeBotAPI()
+    start = api.inject(42, "/ping")
+    updates = await api._get_updates({"offset": "0"})  # pylint: disable=W0212
+    assert updates[0]["message"]["entities"][0]["length"] == 5
+
+    async def reply():
+        await asyncio.sleep(0.02)
+        api._record("sendMessage", {"chat_id": "42", "text": "pong"})  # pylint: disable=W0212
+        await asyncio.sleep(0.05)
+        api._record("deleteMessage", {"chat_id": "42"})  # pylint: disable=W0212
+
+    task = asyncio.create_task(reply())
+    first, last, calls = await api.wait_idle(42, start, settle=0.1, timeout=2)
+    await task
+    assert [i.method for i in calls] == ["sendMessage", "deleteMessage"]
+    assert first - start >= 0.02
+    assert last > first
+
+    start = api.inject(43, "/ping")
+    assert await api.wait_idle(43, start, settle=0.1, timeout=0.1) == (None, None, [])
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 50.5
+    assert percentile(values, 0.99) == pytest.approx(99.01)
+    assert percentile([], 0.5) == 0.0
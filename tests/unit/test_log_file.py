@@ -0,0 +1,55 @@
+import gzip
+import threading
+import time
+
+from utils.log import _file
+from utils.log._file import FileIO
+
+
+def read_lines(path) -> list:
+    lines = []
+    for file in path.iterdir():
+        if file.name.endswith(".log.gz"):
+            with gzip.open(file, "rt", encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        elif file.name.endswith(".log"):
+            lines.extend(file.read_text(encoding="utf-8").splitlines())
+    return lines
+
+
+def test_rotate_shared_file(tmp_path, monkeypatch):
+    """两个实例模拟两个进程写入同一个文件，转存与压缩时不能丢失任何一行"""
+    monkeypatch.setattr(_file, "SYNC_INTERVAL", 0.1)
+    path = tmp_path / "log.log"
+    writers = [FileIO(path, max_bytes=2000), FileIO(path, max_bytes=2000)]
+
+    def write(index: int, writer: FileIO):
+        for i in range(300):
+            writer.write(f"writer {index} line {i:04d} 日志\n")
+            writer.flush()
+            time.sleep(0.001)
+
+    threads = [threading.Thread(target=write, args=(index, writer)) for index, writer in enumerate(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time.sleep(_file._archive_delay() + 0.3)  # pylint: disable=W0212
+    writers[0].write("last\n")
+    for writer in writers:
+        writer.close()
+    time.sleep(0.2)
+
+    assert any(file.name.endswith(".log.gz") for file in tmp_path.iterdir())
+    expected = {f"writer {index} line {i:04d} 日志" for index in range(2) for i in range(300)}
+    lines = read_lines(tmp_path)
+    assert len(lines) == len(expected) + 1
+    assert set(lines) == expected | {"last"}
+
+
+def test_write_counts_bytes(tmp_path):
+    file = FileIO(tmp_path / "log.log")
+    assert file.write("日志\n") == 3
+    file.flush()
+    assert file._size == (tmp_path / "log.log").stat().st_size == 7  # pylint: disable=W0212
+    file.close()
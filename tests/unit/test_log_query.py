@@ -0,0 +1,86 @@
+import gzip
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+from utils.log._query import LogQuery, compress_lines, query_log
+
+HOLE_SIZE = 3 * 1024**3
+
+
+def record(time: str, level: str, message: str) -> str:
+    return f"[{time}] {level:<8} {message:<60} plugins.test:1\n"
+
+
+@pytest.fixture(scope="module")
+def big_log(tmp_path_factory):
+    """开头与末尾是日志，中间是 3GB 的空洞"""
+    path = tmp_path_factory.mktemp("log") / "debug.log"
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(record("2024-01-01 00:00:00", "INFO", "start"))
+        file.seek(HOLE_SIZE)
+        file.write("\n")
+        for i in range(2000):
+            time = f"2024-01-02 10:{i // 60 % 60:02d}:{i % 60:02d}"
+            level = "ERROR" if i % 100 == 0 else "INFO"
+            file.write(record(time, level, f"message {i}"))
+            if level == "ERROR":
+                file.write("Traceback (most recent call last):\n")
+                file.write("ZeroDivisionError: division by zero\n")
+            file.write(record("", "DEBUG", f"repeat {i}").replace("[]", "  "))
+    return path
+
+
+def test_tail(big_log):
+    tracemalloc.start()
+    lines = query_log(big_log, LogQuery(lines=100))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(lines) == 100
+    assert "repeat 1999" in lines[-1]
+    assert peak < 8 * 1024**2
+
+
+def test_level_and_keyword(big_log):
+    lines = query_log(big_log, LogQuery(lines=9, level="ERROR"))
+    assert len(lines) == 9
+    assert "message 1700" in lines[0]
+    assert lines[-1] == "ZeroDivisionError: division by zero"
+    lines = query_log(big_log, LogQuery(lines=10, keyword="message 1234"))
+    assert len(lines) == 1 and "message 1234" in lines[0]
+
+
+def test_time_range(big_log):
+    query = LogQuery(
+        lines=1000,
+        since=datetime(2024, 1, 2, 10, 30, 0),
+        until=datetime(2024, 1, 2, 10, 30, 1),
+    )
+    tracemalloc.start()
+    lines = query_log(big_log, query)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    messages = [line for line in lines if "message" in line or "repeat" in line]
+    assert len(messages) == 4
+    assert "message 1800" in messages[0] and "repeat 1801" in messages[-1]
+    assert peak < 8 * 1024**2
+
+
+def test_compress_lines():
+    lines = ["第一行", "second"]
+    buffer = compress_lines(lines, "debug.log")
+    assert buffer.name == "debug.log.gz"
+    assert gzip.decompress(buffer.read()).decode("utf-8") == "第一行\nsecond\n"
+
+
+def test_time_from_filtered_record(tmp_path):
+    """被 level 过滤掉的 record 仍然是之后省略了时间的 record 的时间"""
+    path = tmp_path / "debug.log"
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(record("2024-01-02 10:00:00", "ERROR", "too early"))
+        file.write(record("2024-01-02 10:00:05", "INFO", "anchor"))
+        file.write(record("", "ERROR", "err").replace("[]", "  "))
+    query = LogQuery(level="ERROR", since=datetime(2024, 1, 2, 10, 0, 3))
+    lines = query_log(path, query)
+    assert len(lines) == 1 and "err" in lines[0]
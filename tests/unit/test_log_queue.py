@@ -0,0 +1,55 @@
+import logging
+
+from utils.log._handler import FileHandler, Handler
+from utils.log._queue import LogWriter, QueueHandler
+
+
+def test_prepare_extracts_trace():
+    """局部变量在入队时提取，写线程渲染时不受之后修改的影响"""
+    handler = Handler()
+    queue_handler = QueueHandler(LogWriter([handler]))
+    value = ["before"]
+    try:
+        raise ValueError(value)
+    except ValueError as exc:
+        record = logging.LogRecord(
+            "test", logging.ERROR, __file__, 0, "error", None, (ValueError, exc, exc.__traceback__)
+        )
+    queue_handler.prepare(record)
+    value[0] = "after"
+    frame = record.rich_traces[handler].stacks[0].frames[-1]
+    assert "before" in repr(frame.locals["value"])
+    assert "after" not in repr(frame.locals["value"])
+
+
+def test_queued_trace_per_handler(tmp_path):
+    """写线程中每个文件 handler 的输出与直接写出时相同"""
+
+    def make_handlers(name: str):
+        options = {"log_time_format": "[time]", "width": 120}
+        return [
+            FileHandler(path=tmp_path / name / "debug.log", locals_max_depth=1, **options),
+            FileHandler(path=tmp_path / name / "error.log", locals_max_depth=None, **options),
+        ]
+
+    def make_record():
+        nested = {"a": {"b": {"c": "dee" + "p"}}}  # noqa: F841  pylint: disable=W0612
+        try:
+            raise ValueError("error")
+        except ValueError as exc:
+            return logging.LogRecord(
+                "test", logging.ERROR, __file__, 0, "error", None, (ValueError, exc, exc.__traceback__)
+            )
+
+    direct = make_handlers("direct")
+    for handler in direct:
+        handler.handle(make_record())
+    writer = LogWriter(make_handlers("queued"))
+    writer.start()
+    QueueHandler(writer).handle(make_record())
+    writer.stop()
+    for name in ("debug.log", "error.log"):
+        text = (tmp_path / "direct" / name).read_text(encoding="utf-8")
+        assert (tmp_path / "queued" / name).read_text(encoding="utf-8") == text
+    assert "deep" not in (tmp_path / "direct" / "debug.log").read_text(encoding="utf-8")
+    assert "deep" in (tmp_path / "direct" / "error.log").read_text(encoding="utf-8")
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from utils import loop_watchdog as loop_watchdog_module
+from utils.loop_watchdog import LoopWatchdog
+
+
+async def blocking_handler():
+    time.sleep(0.35)
+
+
+async def test_blocked_report(monkeypatch):
+    reports = []
+    monkeypatch.setattr(
+        loop_watchdog_module, "logger", SimpleNamespace(warning=lambda msg, *args: reports.append(msg % args))
+    )
+    # 把测试文件所在目录当作插件目录
+    monkeypatch.setattr(loop_watchdog_module, "PLUGINS_ROOT", str(Path(__file__).parent))
+    watchdog = LoopWatchdog(interval=0.05, threshold=0.1, report_interval=60)
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert watchdog.blocked == 0
+
+        await asyncio.create_task(blocking_handler())
+        await asyncio.sleep(0.1)
+        assert watchdog.blocked == 1
+        assert len(reports) == 1
+        assert "协程[blocking_handler]" in reports[0]
+        assert f"插件[blocking_handler {__file__}:" in reports[0]
+
+        # report_interval 内的阻塞只计数不输出
+        await asyncio.create_task(blocking_handler())
+        await asyncio.sleep(0.1)
+        assert watchdog.blocked == 2
+        assert watchdog.suppressed == 1
+        assert len(reports) == 1
+
+        watchdog.report_interval = 0
+        await asyncio.create_task(blocking_handler())
+        await asyncio.sleep(0.1)
+        assert watchdog.blocked == 3
+        assert len(reports) == 2
+        assert "期间省略了 1 次报告" in reports[1]
+    finally:
+        await watchdog.stop()
+    assert not watchdog.running
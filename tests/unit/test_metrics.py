@@ -0,0 +1,56 @@
+import pytest
+from telegram.ext import ApplicationBuilder, Job
+
+import utils.patch.telegram  # noqa: F401  pylint: disable=W0611
+from utils.log._context import callback_name
+from utils.metrics import MetricsRegistry, job_duration, metrics_config
+
+
+def test_histogram_quantile():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("duration_seconds", "耗时", ("handler",), buckets=(0.1, 0.2, 0.5, 1.0))
+    for _ in range(90):
+        histogram.observe(0.05, "a")
+    for _ in range(10):
+        histogram.observe(0.8, "a")
+    assert histogram.quantile(0.5, "a") == pytest.approx(0.1 * 50 / 90)
+    assert 0.5 < histogram.quantile(0.95, "a") <= 1.0
+    histogram.observe(5, "b")
+    assert histogram.quantile(0.99, "b") == 1.0
+    assert histogram.quantile(0.5, "c") == 0.0
+    assert [labels for labels, *_ in registry.summary("duration_seconds")] == [("b",), ("a",)]
+
+
+def test_exposition():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "错误", ("host",)).inc('a"b')
+    registry.histogram("latency_seconds", "耗时", buckets=(1.0,)).observe(0.5)
+    registry.gauge("messages", "消息", ("direction",), function=lambda: {("recv",): 3})
+    text = registry.exposition()
+    assert 'errors_total{host="a\\"b"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "latency_seconds_count 1" in text
+    assert 'messages{direction="recv"} 3' in text
+
+
+def test_registry_type_conflict():
+    registry = MetricsRegistry()
+    assert registry.counter("a", "a") is registry.counter("a", "a")
+    with pytest.raises(ValueError):
+        registry.histogram("a", "a")
+    with pytest.raises(ValueError):
+        registry.counter("a", "a").inc("label")
+
+
+async def test_job_duration_by_callback(monkeypatch):
+    monkeypatch.setattr(metrics_config, "enable", True)
+    job_duration.clear()
+
+    async def auth_kick(_):
+        pass
+
+    application = ApplicationBuilder().token("1:a").build()
+    for name in ("1|2|auth_kick", "3|4|auth_kick"):
+        await Job(auth_kick, name=name).run(application)
+    assert [(labels, value.count) for labels, value in job_duration.items()] == [((callback_name(auth_kick),), 2)]
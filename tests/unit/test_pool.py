@@ -0,0 +1,17 @@
+import datetime
+
+from simnet.models.base import add_timezone
+
+from metadata.pool.pool import get_banner_at, get_banners, get_pool_by_id
+
+
+def test_banners_keep_order():
+    for pool_type in (100, 200, 301, 302, 400, 500, 1000, 2000):
+        assert [i.name for i in get_banners(pool_type)] == [i["name"] for i in get_pool_by_id(pool_type)]
+
+
+def test_get_banner_at():
+    for banner in get_banners(301):
+        for time in (banner.from_time, banner.to_time, banner.from_time + (banner.to_time - banner.from_time) / 2):
+            assert banner in get_banners(301).get_all_at(time)
+    assert get_banner_at(301, add_timezone(datetime.datetime(2000, 1, 1))) is None
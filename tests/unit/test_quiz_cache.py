@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from core.services.quiz.cache import QuizCache
+from core.services.quiz.models import Answer, Question
+
+
+@pytest.fixture()
+def redis():
+    return FakeAsyncRedis()
+
+
+@pytest.fixture()
+def cache(redis):
+    return QuizCache(SimpleNamespace(client=redis))
+
+
+def question(question_id: int) -> Question:
+    return Question(question_id=question_id, text=f"问题{question_id}")
+
+
+def answer(answer_id: int, question_id: int) -> Answer:
+    return Answer(answer_id=answer_id, question_id=question_id, text=f"答案{answer_id}")
+
+
+@pytest.mark.asyncio
+async def test_hash_layout(cache, redis):
+    assert await cache.add_question([question(1), question(2)]) == 2
+    assert await cache.add_answer([answer(10, 1)]) == 1
+    assert sorted(await redis.keys("quiz:*")) == [b"quiz:answer", b"quiz:question"]
+    assert await redis.type("quiz:question") == b"hash"
+    assert sorted(await cache.get_all_question_id_list()) == [b"1", b"2"]
+    # 旧版本读取不存在的 key，总是返回空列表
+    assert sorted(i.question_id for i in await cache.get_all_question()) == [1, 2]
+    assert (await cache.get_one_question(2)).text == "问题2"
+    assert (await cache.get_one_answer(10)).question_id == 1
+
+
+@pytest.mark.asyncio
+async def test_replace_all(cache, redis):
+    await cache.add_question([question(1), question(2), question(3)])
+    await cache.add_answer([answer(10, 1), answer(20, 2)])
+    assert await cache.replace_all([question(4)], [answer(40, 4)]) == 1
+    assert await cache.get_all_question_id_list() == [b"4"]
+    assert await redis.hkeys("quiz:answer") == [b"40"]
+
+    assert await cache.replace_all([], []) == 0
+    assert not await redis.exists("quiz:question", "quiz:answer")
+
+
+@pytest.mark.asyncio
+async def test_del_legacy(cache, redis):
+    # 旧版本每个问题一个 key，并在 id_list 中保存全部 ID
+    await redis.rpush("quiz:question:id_list", *range(1500))
+    await redis.mset({f"quiz:question:{i}": question(i).json() for i in range(1500)})
+    await redis.set("quiz:answer:1", answer(1, 1).json())
+    await cache.add_question([question(1)])
+
+    await cache.del_all_question()
+    assert await redis.keys("quiz:question*") == []
+    assert await redis.exists("quiz:answer:1")
+
+    # 没有旧版本 ID 列表时不扫描
+    await redis.set("quiz:question:legacy", "1")
+    await cache.del_all_question()
+    assert await redis.exists("quiz:question:legacy")
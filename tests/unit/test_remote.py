@@ -0,0 +1,81 @@
+import hashlib
+from typing import List, Union
+
+import httpx
+import pytest
+
+from modules.apihelper.client.components import remote
+from modules.apihelper.client.components.remote import Remote
+from utils.http_client import HTTPClientPool
+
+URL = "https://example.com/FightPropRule_genshin.json"
+NAME = "fight_prop_rule"
+DATA = {"rule": {"FIGHT_PROP_CRITICAL": 1}}
+CONTENT = b'{"rule": {"FIGHT_PROP_CRITICAL": 1}}'
+
+
+class MockRemote:
+    """按顺序返回响应或者抛出异常，并记录收到的请求"""
+
+    def __init__(self):
+        self.responses: List[Union[httpx.Response, Exception]] = []
+        self.requests: List[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def get(self, response: Union[httpx.Response, Exception]):
+        self.responses.append(response)
+        return await Remote._get_json(URL, NAME)  # pylint: disable=W0212
+
+
+@pytest.fixture
+def mock_remote(tmp_path, monkeypatch) -> MockRemote:
+    monkeypatch.setattr(remote, "REMOTE_CACHE_DIR", tmp_path)
+    mock = MockRemote()
+    monkeypatch.setattr(
+        HTTPClientPool,
+        "create_client",
+        lambda **kwargs: httpx.AsyncClient(transport=httpx.MockTransport(mock.handler), **kwargs),
+    )
+    return mock
+
+
+async def test_cache_written_and_revalidated(mock_remote, tmp_path):
+    headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    assert await mock_remote.get(httpx.Response(200, content=CONTENT, headers=headers)) == DATA
+    assert tmp_path.joinpath(f"{NAME}.json").read_bytes() == CONTENT
+    cache = await Remote._read_cache(NAME)  # pylint: disable=W0212
+    assert cache["etag"] == '"v1"'
+    assert cache["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+
+    # 304 时使用本地缓存
+    assert await mock_remote.get(httpx.Response(304)) == DATA
+    request = mock_remote.requests[-1]
+    assert request.headers["If-None-Match"] == '"v1"'
+    assert request.headers["If-Modified-Since"] == headers["Last-Modified"]
+
+
+@pytest.mark.parametrize(
+    "failure", [httpx.ReadTimeout("timeout"), httpx.Response(503)], ids=["timeout", "server_error"]
+)
+async def test_fallback_to_cache(mock_remote, failure):
+    await mock_remote.get(httpx.Response(200, content=CONTENT, headers={"ETag": '"v1"'}))
+    assert await mock_remote.get(failure) == DATA
+
+
+async def test_corrupt_cache_rejected(mock_remote, tmp_path):
+    await mock_remote.get(httpx.Response(200, content=CONTENT, headers={"ETag": '"v1"'}))
+    tmp_path.joinpath(f"{NAME}.json").write_bytes(b'{"rule": {}}')
+    assert await Remote._read_cache(NAME) is None  # pylint: disable=W0212
+
+    # 校验失败的缓存既不用于条件请求，也不用于回退
+    assert await mock_remote.get(httpx.Response(503)) == {}
+    assert "If-None-Match" not in mock_remote.requests[-1].headers
+    # 重新下载后覆盖损坏的缓存
+    assert await mock_remote.get(httpx.Response(200, content=CONTENT, headers={"ETag": '"v1"'})) == DATA
+    assert tmp_path.joinpath(f"{NAME}.json").read_bytes() == CONTENT
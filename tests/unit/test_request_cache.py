@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from modules.apihelper.client.base.cache import RequestCache
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    cache = RequestCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"calls": calls}
+
+    results = await asyncio.gather(*[cache.get_or_fetch("key", fetch, ttl=60) for _ in range(10)])
+    assert calls == 1
+    assert all(result == {"calls": 1} for result in results)
+    assert await cache.get_or_fetch("key", fetch, ttl=60) == {"calls": 1}
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate():
+    cache = RequestCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await cache.get_or_fetch("key", fetch, ttl=0.01, stale_ttl=60) == 1
+    await asyncio.sleep(0.02)
+    assert await cache.get_or_fetch("key", fetch, ttl=0.01, stale_ttl=60) == 1
+    await asyncio.sleep(0)
+    assert calls == 2
+    assert await cache.get_or_fetch("key", fetch, ttl=60) == 2
+
+
+@pytest.mark.asyncio
+async def test_result_is_copied():
+    cache = RequestCache()
+
+    async def fetch():
+        return {"list": [1]}
+
+    result = await cache.get_or_fetch("key", fetch, ttl=60)
+    result["list"].append(2)
+    assert await cache.get_or_fetch("key", fetch, ttl=60) == {"list": [1]}
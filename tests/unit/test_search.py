@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from core.services.search.models import StrategyEntry, WeaponEntry, WeaponsEntry
+from core.services.search.services import SearchServices
+
+
+def make_service(path) -> SearchServices:
+    service = SearchServices()
+    service.entry_data_path = path
+    service.entry_log_path = path / "entry.jsonl"
+    service.weapons_entry_data_path = path / "weapon.json"
+    service.strategy_entry_data_path = path / "strategy.json"
+    return service
+
+
+def weapon(name: str, description: str = "武器图鉴") -> WeaponEntry:
+    return WeaponEntry(key=f"weapon:{name}", title=name, description=description, tags=[name])
+
+
+@pytest.fixture()
+def entry_path(tmp_path):
+    legacy = WeaponsEntry(data=[weapon("雾切之回光"), weapon("护摩之杖")])
+    (tmp_path / "weapon.json").write_text(json.dumps(legacy.dict(), ensure_ascii=False), encoding="utf-8")
+    return tmp_path
+
+
+async def test_round_trip(entry_path):
+    service = make_service(entry_path)
+    await service.load_data()
+    assert [i.title for i in await service.search("雾切之回光", 1)] == ["雾切之回光"]
+
+    await service.add_entry(weapon("天空之刃"))
+    await service.add_entry(weapon("护摩之杖", "更新后的描述"), update=True)
+    await service.add_entry(
+        StrategyEntry(key="strategy:刻晴", title="刻晴", description="刻晴 角色攻略", tags=["刻晴"])
+    )
+    assert service._index.generation == service.generation  # pylint: disable=W0212
+    assert len(entry_path.joinpath("entry.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+    await service.save_entry()
+    assert not entry_path.joinpath("weapon.json").exists()
+    lines = entry_path.joinpath("entry.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+
+    loaded = make_service(entry_path)
+    await loaded.load_data()
+    entries = {i.key: i for i in await loaded.search(None)}
+    assert set(entries) == {"weapon:雾切之回光", "weapon:护摩之杖", "weapon:天空之刃", "strategy:刻晴"}
+    assert entries["weapon:护摩之杖"].description == "更新后的描述"
+    assert isinstance(entries["strategy:刻晴"], StrategyEntry)
+
+
+async def test_query_cache(entry_path):
+    service = make_service(entry_path)
+    await service.load_data()
+    results = await service.search("护摩之杖")
+    assert (await service.search("护摩之杖", 1)) == results[:1]
+    assert list(service._query_cache) == ["护摩之杖"]  # pylint: disable=W0212
+    await service.add_entry(weapon("天空之刃"))
+    assert not service._query_cache  # pylint: disable=W0212
+
+
+class RecordingPostings(dict):
+    def __init__(self, postings):
+        super().__init__(postings)
+        self.tokens = []
+
+    def get(self, key, default=None):
+        self.tokens.append(key)
+        return super().get(key, default)
+
+
+async def test_prefix_counts(entry_path):
+    service = make_service(entry_path)
+    await service.load_data()
+    await service.add_entry(weapon("雾切"))
+    index = service._index  # pylint: disable=W0212
+    assert [i.title for i in await service.search("雾切之")][:1] == ["雾切之回光"]
+    index.postings = postings = RecordingPostings(index.postings)
+    results = await service.search("雾切之回")
+    # 只查找相对 "雾切之" 新增的双字
+    assert postings.tokens == ["之回"]
+    fresh = type(index)(index.entries, index.generation)
+    assert index.counts("雾切之回") == fresh.counts("雾切之回")
+    assert results[0].title == "雾切之回光"
@@ -0,0 +1,234 @@
+import asyncio
+import gc
+import time
+
+import pytest
+
+from utils.patch import startup as startup_patch
+from utils.patch.methods import patch
+from utils.startup import (
+    StartupCycleError,
+    StartupDependencyError,
+    StartupScheduler,
+    _constructor_types,
+    startup_config,
+)
+
+
+class Database:
+    async def initialize(self):
+        await asyncio.sleep(0.1)
+
+
+class Redis:
+    async def initialize(self):
+        await asyncio.sleep(0.1)
+
+
+class UserService:
+    def __init__(self, database: Database, redis: Redis):
+        self.database = database
+        self.redis = redis
+        self.ready = False
+
+    async def initialize(self):
+        self.ready = True
+
+
+class Plugin:
+    def __init__(self, user_service: UserService):
+        self.user_service = user_service
+
+    async def initialize(self):
+        assert self.user_service.ready
+
+
+class Broken:
+    def __init__(self, database: Database):
+        self.database = database
+
+    async def initialize(self):
+        raise RuntimeError("broken")
+
+
+class BrokenDependent:
+    def __init__(self, broken: Broken):
+        self.broken = broken
+
+    async def initialize(self):
+        pass
+
+
+class Slow:
+    cancelled = False
+
+    async def initialize(self):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            Slow.cancelled = True
+            raise
+
+
+class CycleA:
+    def __init__(self, b: "CycleB"):
+        self.b = b
+
+
+class CycleB:
+    def __init__(self, a: CycleA):
+        self.a = a
+
+
+async def test_concurrent_initialize():
+    database, redis = Database(), Redis()
+    user_service = UserService(database, redis)
+    plugin = Plugin(user_service)
+    scheduler = StartupScheduler([plugin, user_service, redis, database])
+    assert scheduler.timings[id(user_service)].dependencies == ["Database", "Redis"]
+    await scheduler.run()
+    database_timing = scheduler.timings[id(database)]
+    redis_timing = scheduler.timings[id(redis)]
+    # 两个互不依赖的组件同时开始
+    assert abs(database_timing.start - redis_timing.start) < 0.05
+    assert scheduler.timings[id(user_service)].start >= max(database_timing.end, redis_timing.end)
+    assert "UserService" in scheduler.report()
+
+
+async def test_fail_fast():
+    database = Database()
+    scheduler = StartupScheduler([database, Broken(database), Slow()])
+    with pytest.raises(RuntimeError, match="broken"):
+        await scheduler.run()
+    assert Slow.cancelled
+
+
+async def test_failed_exceptions_retrieved():
+    loop = asyncio.get_running_loop()
+    contexts = []
+    loop.set_exception_handler(lambda _, context: contexts.append(context))
+    try:
+        database = Database()
+        broken = Broken(database)
+        dependent = BrokenDependent(broken)
+        scheduler = StartupScheduler([database, broken, dependent])
+        with pytest.raises(RuntimeError, match="broken"):
+            await scheduler.run()
+        del scheduler
+        gc.collect()
+        assert not contexts
+
+        scheduler = StartupScheduler([database, broken, dependent, Redis()])
+        errors = await scheduler.run(fail_fast=False)
+        assert isinstance(errors[id(broken)], RuntimeError)
+        assert isinstance(errors[id(dependent)], StartupDependencyError)
+        assert errors[id(dependent)].dependencies == ["Broken"]
+        assert len(errors) == 2
+        del scheduler, errors
+        gc.collect()
+        assert not contexts
+    finally:
+        loop.set_exception_handler(None)
+
+
+def test_cycle_report():
+    a = CycleA.__new__(CycleA)
+    b = CycleB.__new__(CycleB)
+    with pytest.raises(StartupCycleError) as exc_info:
+        StartupScheduler([a, b]).order()
+    assert exc_info.value.cycle == ["CycleA", "CycleB", "CycleA"]
+
+
+class ServiceManager:
+    """与 gram_core 相同，逐个实例化服务并等待 ``initialize()``"""
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.services = {}
+
+    async def _initialize_service(self, target):
+        instance = target(*(self.services[i] for i in _constructor_types(target)))
+        await instance.initialize()
+        return instance
+
+    async def start_services(self):
+        for target in self.targets:
+            self.services[target] = await self._initialize_service(target)
+
+
+patch(ServiceManager)(startup_patch.ServiceManager)
+
+
+async def test_patched_start_services(monkeypatch):
+    manager = ServiceManager([Database, Redis, UserService])
+    start = time.perf_counter()
+    await manager.start_services()
+    # Database 与 Redis 并发初始化
+    assert time.perf_counter() - start < 0.18
+    assert manager.services[UserService].ready
+    assert "initialize" in Database.__dict__
+
+    monkeypatch.setattr(startup_config, "parallel", False)
+    manager = ServiceManager([Database, Redis, UserService])
+    start = time.perf_counter()
+    await manager.start_services()
+    assert time.perf_counter() - start >= 0.2
+    assert manager.services[UserService].ready
+
+
+class FakePlugin:
+    """与 gram_core 相同，``install()`` 先等待 ``initialize()`` 再注册 handler"""
+
+    handlers = []
+
+    async def initialize(self):
+        pass
+
+    async def install(self):
+        await self.initialize()
+        FakePlugin.handlers.append(type(self).__name__)
+
+    async def uninstall(self):
+        FakePlugin.handlers.remove(type(self).__name__)
+
+
+class SlowPlugin(FakePlugin):
+    async def initialize(self):
+        await asyncio.sleep(0.1)
+
+
+class OtherSlowPlugin(SlowPlugin):
+    pass
+
+
+class BrokenPlugin(FakePlugin):
+    async def initialize(self):
+        raise RuntimeError("broken")
+
+
+class PluginManager:
+    """与 gram_core 相同，逐个安装插件，安装失败时只记录日志"""
+
+    def __init__(self, targets):
+        self.targets = targets
+
+    async def install_plugins(self):
+        for target in self.targets:
+            try:
+                await target().install()
+            except Exception:  # pylint: disable=W0703
+                pass
+
+
+patch(FakePlugin)(startup_patch.Plugin)
+patch(PluginManager)(startup_patch.PluginManager)
+
+
+async def test_patched_install_plugins():
+    FakePlugin.handlers = []
+    manager = PluginManager([SlowPlugin, BrokenPlugin, OtherSlowPlugin])
+    start = time.perf_counter()
+    await manager.install_plugins()
+    assert time.perf_counter() - start < 0.18
+    # handler 按原顺序注册，初始化失败的插件被卸载
+    assert FakePlugin.handlers == ["SlowPlugin", "OtherSlowPlugin"]
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from utils.tiered_cache import TieredCache
+
+
+@pytest.fixture()
+def redis():
+    return FakeAsyncRedis()
+
+
+@pytest.mark.asyncio
+async def test_local_hit_and_invalidate(redis):
+    cache = TieredCache(redis, "test:tiered", bytes.decode)
+    assert await cache.get("test:tiered:1") is None
+    await cache.set("test:tiered:1", "a")
+    assert await cache.get("test:tiered:1") == "a"
+    assert await cache.get("test:tiered:1") == "a"
+    assert cache.statistics.remote_hits == 1
+    await cache.set("test:tiered:1", "b")
+    assert await cache.get("test:tiered:1") == "b"
+    await cache.delete("test:tiered:1")
+    assert await cache.get("test:tiered:1") is None
+    assert cache.statistics.local_hits == 1
+    assert cache.statistics.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_local_ttl_follows_redis(redis):
+    cache = TieredCache(redis, "test:tiered:ttl", bytes.decode, ttl=30)
+    await cache.set("test:tiered:ttl:1", "a", ex=2)
+    await cache.set("test:tiered:ttl:2", "b")
+    assert await cache.get_many(["test:tiered:ttl:1", "test:tiered:ttl:2"]) == {
+        "test:tiered:ttl:1": "a",
+        "test:tiered:ttl:2": "b",
+    }
+    now = time.monotonic()
+    assert cache._data["test:tiered:ttl:1"][1] - now <= 2  # pylint: disable=W0212
+    assert cache._data["test:tiered:ttl:2"][1] - now > 2  # pylint: disable=W0212
+
+
+@pytest.mark.asyncio
+async def test_same_name_and_copy(redis):
+    first = TieredCache(redis, "test:tiered:shared", lambda data: [bytes.decode(data)], copy=list)
+    second = TieredCache(redis, "test:tiered:shared", lambda data: [bytes.decode(data)], copy=list)
+    await redis.set("test:tiered:shared:1", "a")
+    value = await first.get("test:tiered:shared:1")
+    value.append("b")
+    assert await first.get("test:tiered:shared:1") == ["a"]
+    assert await second.get("test:tiered:shared:1") == ["a"]
+    statistics = TieredCache.get_statistics()["test:tiered:shared"]
+    assert (statistics.local_hits, statistics.remote_hits) == (1, 2)
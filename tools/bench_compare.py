@@ -0,0 +1,122 @@
+"""对比基准测试结果与基线
+
+先运行 ``python -m pytest tests/bench --benchmark-json=.benchmarks/current.json`` 生成结果，再运行：
+
+- ``python -m tools.bench_compare .benchmarks/current.json --update`` 把结果保存为基线
+- ``python -m tools.bench_compare .benchmarks/current.json [--tolerance 0.1]`` 输出对比报告，
+  耗时超过基线 ``tolerance`` 比例的测试标记为退化，存在退化时退出码为 1
+
+基线与运行的机器有关，更换机器或者 Python 版本后需要重新生成。
+``--baseline`` 也可以直接使用 ``--benchmark-json`` 的输出，
+CI 的 benchmark 工作流就是在同一台机器上先运行目标分支生成基线，再运行当前提交对比。
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+DEFAULT_BASELINE = PROJECT_ROOT / "tests" / "bench" / "baseline.json"
+STATS = ("min", "median", "mean", "stddev")
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+    def regressed(self, tolerance: float) -> bool:
+        return self.change is not None and self.change > tolerance
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, float]]:
+    """读取 ``--benchmark-json`` 的输出或者基线文件，返回 ``{测试名: {统计量: 秒}}``"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if "benchmarks" not in data:
+        return data["results"]
+    return {i["fullname"]: {k: i["stats"][k] for k in STATS} for i in data["benchmarks"]}
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path, source: Path):
+    machine_info = json.loads(source.read_text(encoding="utf-8")).get("machine_info", {})
+    data = {
+        "machine_info": {k: machine_info.get(k) for k in ("node", "processor", "machine", "python_version")},
+        "results": results,
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]], stat: str) -> List[Comparison]:
+    names = sorted(set(baseline) | set(current))
+    return [
+        Comparison(
+            name,
+            baseline[name][stat] if name in baseline else None,
+            current[name][stat] if name in current else None,
+        )
+        for name in names
+    ]
+
+
+def format_time(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value >= 1:
+        return f"{value:.3f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.3f}ms"
+    return f"{value * 1e6:.3f}us"
+
+
+def report(comparisons: List[Comparison], tolerance: float) -> str:
+    width = max((len(i.name) for i in comparisons), default=4)
+    lines = [f"{'name':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}"]
+    for item in comparisons:
+        if item.change is None:
+            change = "new" if item.baseline is None else "missing"
+        else:
+            change = f"{item.change:+.1%}"
+        flag = "  REGRESSION" if item.regressed(tolerance) else ""
+        lines.append(
+            f"{item.name:<{width}}  {format_time(item.baseline):>12}  {format_time(item.current):>12}  {change:>8}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="对比基准测试结果与基线")
+    parser.add_argument("result", type=Path, help="pytest --benchmark-json 输出的文件")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="基线文件")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="允许的耗时增加比例")
+    parser.add_argument("--stat", choices=STATS[:3], default="median", help="用于对比的统计量")
+    parser.add_argument("--update", action="store_true", help="把结果保存为基线")
+    args = parser.parse_args(argv)
+
+    current = load_results(args.result)
+    if args.update:
+        save_baseline(current, args.baseline, args.result)
+        print(f"已保存 {len(current)} 项基线到 {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"基线文件 {args.baseline} 不存在，请先使用 --update 生成", file=sys.stderr)
+        return 2
+
+    comparisons = compare(load_results(args.baseline), current, args.stat)
+    print(report(comparisons, args.tolerance))
+    regressions = [i for i in comparisons if i.regressed(args.tolerance)]
+    if regressions:
+        print(f"\n{len(regressions)} 项测试的 {args.stat} 耗时超过基线 {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
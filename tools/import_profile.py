@@ -0,0 +1,109 @@
+"""统计插件的导入耗时
+
+每个插件模块在独立的解释器中使用 ``python -X importtime`` 导入，
+按累计耗时排序输出插件，并列出自身耗时最高的模块，用于找出拖慢冷启动的依赖。
+
+用法：``python -m tools.import_profile [--top 20] [plugins.genshin.wish ...]``
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class PluginProfile(NamedTuple):
+    module: str
+    cumulative_us: int
+    records: List[ImportRecord]
+    error: Optional[str]
+
+
+def discover_plugins(root: Path = PROJECT_ROOT) -> List[str]:
+    modules = []
+    for path in sorted(root.joinpath("plugins").rglob("*.py")):
+        if path.name.startswith("_"):
+            continue
+        modules.append(".".join(path.relative_to(root).with_suffix("").parts))
+    return modules
+
+
+def parse_import_time(output: str) -> List[ImportRecord]:
+    records = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_module(module: str) -> PluginProfile:
+    """在独立的解释器中导入模块"""
+    process = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", f"import utils.patch, {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    records = parse_import_time(process.stderr)
+    total = next((i.cumulative_us for i in reversed(records) if i.module == module), 0)
+    error = None
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else f"exit {process.returncode}"
+    return PluginProfile(module, total, records, error)
+
+
+def heaviest_modules(profiles: List[PluginProfile]) -> List[Tuple[str, int, int]]:
+    """所有插件共同导入的模块按自身耗时排序，同一个模块只计算一次
+
+    :return: ``(模块, 自身耗时, 导入它的插件数量)``
+    """
+    self_time: Dict[str, int] = {}
+    used_by: Dict[str, int] = defaultdict(int)
+    for profile in profiles:
+        for record in profile.records:
+            self_time[record.module] = max(self_time.get(record.module, 0), record.self_us)
+            used_by[record.module] += 1
+    return sorted(((k, v, used_by[k]) for k, v in self_time.items()), key=lambda x: x[1], reverse=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="统计插件的导入耗时")
+    parser.add_argument("modules", nargs="*", help="需要统计的模块，默认为 plugins 下的全部模块")
+    parser.add_argument("--top", type=int, default=20, help="输出的数量")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or discover_plugins()
+    profiles = []
+    for module in modules:
+        profile = profile_module(module)
+        profiles.append(profile)
+        print(f"{module}: {profile.cumulative_us / 1000:.1f}ms" + (f" ({profile.error})" if profile.error else ""))
+
+    print("\n插件累计导入耗时（包含共用依赖）")
+    for profile in sorted(profiles, key=lambda x: x.cumulative_us, reverse=True)[: args.top]:
+        print(f"{profile.cumulative_us / 1000:10.1f}ms  {profile.module}")
+
+    print("\n自身导入耗时最高的模块")
+    for module, self_us, count in heaviest_modules(profiles)[: args.top]:
+        print(f"{self_us / 1000:10.1f}ms  {module}  被 {count} 个插件导入")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""离线压测
+
+在本地启动模拟的 Telegram Bot API、HoYoLAB 与 Enka.Network 接口，机器人在子进程中运行，
+使用 fakeredis 与 SQLite（或者通过 ``--database-url`` 指定的 MySQL）存储，
+虚拟用户按场景发送命令，最后输出每个命令的吞吐量、延迟分位数与错误率。
+
+用法：``python -m tools.loadtest --users 200 --duration 60 [--scenario scenario.json]``
+"""
+
+HOST_HEADER = "X-Loadtest-Host"
+"""被转发请求的原始域名"""
@@ -0,0 +1,44 @@
+"""压测使用的机器人进程
+
+由 ``tools.loadtest`` 启动，启动机器人之前：
+
+- 所有 HTTP 请求转发到 ``LOADTEST_BASE_URL`` 下的模拟服务
+- Redis 替换为 fakeredis
+- 数据库连接替换为 ``LOADTEST_DATABASE_URL``
+"""
+
+import os
+
+
+def use_fakeredis():
+    import fakeredis
+    import redis.asyncio
+
+    redis.asyncio.Redis = fakeredis.FakeAsyncRedis
+
+
+def use_database(url: str):
+    import sqlalchemy.ext.asyncio
+
+    create_async_engine = sqlalchemy.ext.asyncio.create_async_engine
+
+    def _create_async_engine(_, *args, **kwargs):
+        return create_async_engine(url, *args, **kwargs)
+
+    sqlalchemy.ext.asyncio.create_async_engine = _create_async_engine
+
+
+def main():
+    from tools.loadtest import redirect
+
+    redirect.configure(os.environ["LOADTEST_BASE_URL"])
+    use_fakeredis()
+    use_database(os.environ["LOADTEST_DATABASE_URL"])
+
+    from run import run
+
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""模拟 HoYoLAB / 米游社与 Enka.Network 接口
+
+接口按请求路径返回 ``responses`` 目录中的固定数据，没有对应数据的路径返回 ``retcode=0`` 的空结果。
+被转发到 ``/blocked`` 的其他域名统一返回 503，并按域名计数。
+"""
+
+import asyncio
+import copy
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+from tools.loadtest import HOST_HEADER
+
+__all__ = ("RESPONSES_PATH", "FakeHoyolab", "FakeEnka", "BlockedHosts")
+
+RESPONSES_PATH = Path(__file__).parent / "responses"
+EMPTY_RESPONSE = {"retcode": 0, "message": "OK", "data": {}}
+
+
+def load_responses(name: str) -> Dict[str, Any]:
+    with open(RESPONSES_PATH / name, "r", encoding="utf-8") as f:
+        return jsonlib.load(f)
+
+
+class _LatencyMixin:
+    latency: float
+    jitter: float
+    random: random.Random
+
+    async def delay(self):
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class FakeHoyolab(_LatencyMixin):
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0, responses: Optional[Dict] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.responses: Dict[str, Any] = load_responses("hoyolab.json") if responses is None else responses
+        self.requests: Counter = Counter()
+        self.app = FastAPI()
+        self.app.add_api_route("/{path:path}", self.handle, methods=["GET", "POST"])
+
+    async def handle(self, path: str, request: Request):
+        path = "/" + path.strip("/")
+        self.requests[f"{request.headers.get(HOST_HEADER, '')}{path}"] += 1
+        await self.delay()
+        return self.responses.get(path, EMPTY_RESPONSE)
+
+
+class FakeEnka(_LatencyMixin):
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0, response: Optional[Dict] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.response: Dict[str, Any] = load_responses("enka.json") if response is None else response
+        self.requests: Counter = Counter()
+        self.app = FastAPI()
+        for path in ("/api/uid/{uid}", "/api/uid/{uid}/"):
+            self.app.add_api_route(path, self.handle, methods=["GET"])
+
+    async def handle(self, uid: str):
+        self.requests["/api/uid"] += 1
+        await self.delay()
+        data = copy.deepcopy(self.response)
+        data["uid"] = uid
+        return data
+
+
+class BlockedHosts:
+    def __init__(self):
+        self.requests: Counter = Counter()
+        self.app = FastAPI()
+        self.app.add_api_route("/{path:path}", self.handle, methods=["GET", "POST", "PUT", "DELETE", "HEAD"])
+
+    async def handle(self, path: str, request: Request):  # pylint: disable=W0613
+        self.requests[request.headers.get(HOST_HEADER, "")] += 1
+        return JSONResponse({"detail": "blocked by load test"}, status_code=503)
@@ -0,0 +1,59 @@
+"""把机器人进程发出的 HTTP 请求转发到本地的模拟服务
+
+只在压测启动的机器人进程中导入，所有 ``httpx.AsyncClient`` 的请求按域名改写到 ``base_url`` 下的对应路径，
+原始域名放在 ``X-Loadtest-Host`` 请求头中，未知的域名转发到 ``/blocked``，保证压测期间不会访问外部服务。
+"""
+
+from typing import Optional, Tuple
+
+import httpx
+
+from tools.loadtest import HOST_HEADER
+from utils.patch.methods import patch, patchable
+
+__all__ = ("configure", "resolve")
+
+TELEGRAM_HOSTS = ("api.telegram.org",)
+HOYOLAB_SUFFIXES = ("mihoyo.com", "miyoushe.com", "hoyolab.com", "hoyoverse.com", "mhyurl.cn")
+ENKA_HOSTS = ("enka.network",)
+LOCAL_HOSTS = ("127.0.0.1", "localhost")
+
+_base_url: Optional[httpx.URL] = None
+
+
+def configure(base_url: str):
+    global _base_url
+    _base_url = httpx.URL(base_url)
+
+
+def resolve(host: str) -> Optional[str]:
+    """域名对应的模拟服务前缀，不需要转发时返回 ``None``"""
+    if host in LOCAL_HOSTS:
+        return None
+    if host in TELEGRAM_HOSTS:
+        return "/telegram"
+    if host in ENKA_HOSTS:
+        return "/enka"
+    if any(host == i or host.endswith(f".{i}") for i in HOYOLAB_SUFFIXES):
+        return "/hoyolab"
+    return "/blocked"
+
+
+def rewrite(url: httpx.URL) -> Tuple[httpx.URL, Optional[str]]:
+    prefix = resolve(url.host) if _base_url is not None else None
+    if prefix is None:
+        return url, None
+    path = _base_url.path.rstrip("/") + prefix + url.path
+    return _base_url.copy_with(path=path, query=url.query or None), url.host
+
+
+@patch(httpx.AsyncClient)
+class AsyncClient:
+    @patchable
+    async def send(self, request: httpx.Request, **kwargs):
+        url, host = rewrite(request.url)
+        if host is not None:
+            request.url = url
+            request.headers["Host"] = url.netloc.decode("ascii")
+            request.headers[HOST_HEADER] = host
+        return await self.old_send(request, **kwargs)
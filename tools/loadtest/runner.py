@@ -0,0 +1,266 @@
+"""压测场景
+
+每个虚拟用户循环执行：按权重随机选择一条命令注入，等待机器人回复完成，再等待 ``think`` 秒。
+从注入到第一个回复的时间记为首次响应延迟，到最后一个回复的时间记为完成延迟，
+超时没有回复或者回复了错误信息时记为错误。
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+from tools.loadtest.hoyolab import BlockedHosts, FakeEnka, FakeHoyolab
+from tools.loadtest.storage import prepare_database
+from tools.loadtest.telegram import FakeBotAPI
+from utils.const import PROJECT_ROOT
+
+__all__ = ("Command", "CommandStats", "Scenario", "LoadTest", "main")
+
+FIRST_USER_ID = 2000000000
+BOT_TOKEN = "1000000000:loadtest"
+ERROR_PREFIX = "出错了呜呜呜"
+"""与 ``ErrorHandler.ERROR_MSG_PREFIX`` 一致"""
+
+
+@dataclass
+class Command:
+    text: str
+    weight: float = 1.0
+
+    @property
+    def name(self) -> str:
+        return self.text.split()[0]
+
+
+DEFAULT_COMMANDS = [
+    Command("/ping", 3),
+    Command("/start", 2),
+    Command("/help_raw", 1),
+    Command("/dailynote", 2),
+    Command("/player_card", 2),
+]
+
+
+@dataclass
+class Scenario:
+    commands: List[Command]
+
+    @classmethod
+    def load(cls, path: Optional[Path]) -> "Scenario":
+        """``{"commands": [{"text": "/dailynote", "weight": 2}]}``"""
+        if path is None:
+            return cls(list(DEFAULT_COMMANDS))
+        with open(path, "r", encoding="utf-8") as f:
+            data = jsonlib.load(f)
+        return cls([Command(**i) for i in data["commands"]])
+
+    def choose(self, rng: random.Random) -> Command:
+        return rng.choices(self.commands, weights=[i.weight for i in self.commands])[0]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = q * (len(values) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (index - lower)
+
+
+@dataclass
+class CommandStats:
+    first: List[float] = field(default_factory=list)
+    done: List[float] = field(default_factory=list)
+    count: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.timeouts + self.errors) / self.count if self.count else 0.0
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.scenario = Scenario.load(args.scenario)
+        self.telegram = FakeBotAPI(args.telegram_latency, args.telegram_jitter, args.seed)
+        self.hoyolab = FakeHoyolab(args.hoyolab_latency, args.hoyolab_jitter, args.seed)
+        self.enka = FakeEnka(args.enka_latency, args.enka_jitter, args.seed)
+        self.blocked = BlockedHosts()
+        self.stats: Dict[str, CommandStats] = {i.name: CommandStats() for i in self.scenario.commands}
+        self.elapsed = 0.0
+        self.app = FastAPI()
+        self.app.mount("/telegram", self.telegram.app)
+        self.app.mount("/hoyolab", self.hoyolab.app)
+        self.app.mount("/enka", self.enka.app)
+        self.app.mount("/blocked", self.blocked.app)
+
+    @property
+    def user_ids(self) -> List[int]:
+        return [FIRST_USER_ID + i for i in range(self.args.users)]
+
+    async def wait_bot_ready(self, bot: subprocess.Popen) -> bool:
+        """等待机器人开始拉取 update，机器人进程提前退出时返回 ``False``"""
+        deadline = time.perf_counter() + self.args.startup_timeout
+        while time.perf_counter() < deadline and bot.poll() is None:
+            if self.telegram.ready.is_set():
+                return True
+            await asyncio.sleep(0.2)
+        return False
+
+    def start_bot(self, base_url: str, database_url: str, log_file) -> subprocess.Popen:
+        env = {
+            **os.environ,
+            "LOADTEST_BASE_URL": base_url,
+            "LOADTEST_DATABASE_URL": database_url,
+            "BOT_TOKEN": BOT_TOKEN,
+            "BOT_IS_WEBHOOK": "false",
+            "AUTO_RELOAD": "false",
+        }
+        return subprocess.Popen(  # nosec B603
+            [sys.executable, "-m", "tools.loadtest.bot"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+        )
+
+    async def user(self, user_id: int, deadline: float, rng: random.Random):
+        args = self.args
+        while time.perf_counter() < deadline:
+            command = self.scenario.choose(rng)
+            stats = self.stats[command.name]
+            start = self.telegram.inject(user_id, command.text)
+            first, last, calls = await self.telegram.wait_idle(user_id, start, args.settle, args.timeout)
+            stats.count += 1
+            if first is None:
+                stats.timeouts += 1
+            else:
+                stats.first.append(first - start)
+                stats.done.append(last - start)
+                if any(i.text.startswith(ERROR_PREFIX) for i in calls):
+                    stats.errors += 1
+            if args.think:
+                await asyncio.sleep(rng.uniform(0, args.think * 2))
+
+    async def drive(self):
+        rng = random.Random(self.args.seed)
+        start = time.perf_counter()
+        deadline = start + self.args.duration
+        users = []
+        for user_id in self.user_ids:
+            users.append(asyncio.create_task(self.user(user_id, deadline, random.Random(rng.random()))))
+            if self.args.ramp_up:
+                await asyncio.sleep(self.args.ramp_up / self.args.users)
+        await asyncio.gather(*users)
+        self.elapsed = time.perf_counter() - start
+
+    async def run(self) -> int:
+        args = self.args
+        with tempfile.TemporaryDirectory(prefix="loadtest-") as temp_dir:
+            database_url = args.database_url or f"sqlite+aiosqlite:///{Path(temp_dir) / 'loadtest.db'}"
+            await prepare_database(database_url, self.user_ids)
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", args.port))
+                port = sock.getsockname()[1]
+            server = uvicorn.Server(
+                uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+            )
+            server_task = asyncio.create_task(server.serve())
+            log_path = args.log or PROJECT_ROOT / "logs" / "loadtest_bot.log"
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, "wb") as log_file:
+                bot = self.start_bot(f"http://127.0.0.1:{port}", database_url, log_file)
+                try:
+                    if not await self.wait_bot_ready(bot):
+                        print(f"机器人没有开始拉取 update，请检查日志 {log_path}", file=sys.stderr)
+                        return 2
+                    await asyncio.sleep(args.warmup)
+                    await self.drive()
+                finally:
+                    if bot.poll() is None:
+                        bot.send_signal(signal.SIGINT)
+                        try:
+                            # 机器人退出时仍然会请求 Bot API，不能阻塞事件循环
+                            await asyncio.to_thread(bot.wait, 30)
+                        except subprocess.TimeoutExpired:
+                            bot.kill()
+                    server.should_exit = True
+                    await server_task
+        print(self.report())
+        return 0
+
+    def report(self) -> str:
+        elapsed = self.elapsed or 1.0
+        lines = [
+            f"{self.args.users} 个用户，持续 {elapsed:.1f}s",
+            f"{'command':<16} {'count':>7} {'rps':>8} {'err%':>6} {'timeout':>7} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8} {'done p95':>9}",
+        ]
+        total = CommandStats()
+        for name, stats in self.stats.items():
+            total.count += stats.count
+            total.errors += stats.errors
+            total.timeouts += stats.timeouts
+            total.first.extend(stats.first)
+            total.done.extend(stats.done)
+            lines.append(self._format_stats(name, stats, elapsed))
+        lines.append(self._format_stats("total", total, elapsed))
+        lines.append("")
+        lines.append("Bot API 请求：" + ", ".join(f"{k}={v}" for k, v in self.telegram.methods.most_common()))
+        lines.append("HoYoLAB 请求：" + ", ".join(f"{k}={v}" for k, v in self.hoyolab.requests.most_common(10)))
+        lines.append(f"Enka 请求：{sum(self.enka.requests.values())}")
+        if self.blocked.requests:
+            lines.append("被拦截的外部请求：" + ", ".join(f"{k}={v}" for k, v in self.blocked.requests.most_common()))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_stats(name: str, stats: CommandStats, elapsed: float) -> str:
+        return (
+            f"{name:<16} {stats.count:>7} {stats.count / elapsed:>8.2f} {stats.error_rate * 100:>5.1f}% "
+            f"{stats.timeouts:>7} {percentile(stats.first, 0.5) * 1000:>6.0f}ms "
+            f"{percentile(stats.first, 0.95) * 1000:>6.0f}ms {percentile(stats.first, 0.99) * 1000:>6.0f}ms "
+            f"{percentile(stats.done, 0.95) * 1000:>7.0f}ms"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="离线压测")
+    parser.add_argument("--users", type=int, default=100, help="虚拟用户数")
+    parser.add_argument("--duration", type=float, default=60, help="压测时长")
+    parser.add_argument("--ramp-up", type=float, default=10, help="在多少秒内启动全部用户")
+    parser.add_argument("--think", type=float, default=1.0, help="用户两次命令之间的平均间隔")
+    parser.add_argument("--settle", type=float, default=0.5, help="多少秒没有新的回复认为命令完成")
+    parser.add_argument("--timeout", type=float, default=30, help="命令超时时间")
+    parser.add_argument("--warmup", type=float, default=5, help="机器人启动后等待多少秒再开始")
+    parser.add_argument("--startup-timeout", type=float, default=180, help="等待机器人启动的时间")
+    parser.add_argument("--scenario", type=Path, help="场景文件")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0, help="模拟服务端口，默认随机")
+    parser.add_argument("--database-url", help="数据库地址，默认使用临时的 SQLite 数据库")
+    parser.add_argument("--log", type=Path, help="机器人日志文件")
+    for name, latency in (("telegram", 0.05), ("hoyolab", 0.2), ("enka", 0.3)):
+        parser.add_argument(f"--{name}-latency", type=float, default=latency, help=f"{name} 接口的固定延迟")
+        parser.add_argument(f"--{name}-jitter", type=float, default=latency / 2, help=f"{name} 接口的随机延迟上限")
+    args = parser.parse_args(argv)
+    return asyncio.run(LoadTest(args).run())
@@ -0,0 +1,69 @@
+"""压测使用的数据库
+
+创建全部数据表，并为每个虚拟用户绑定一个国服账号与 Cookies，需要账号的命令可以直接执行。
+"""
+
+import importlib
+import pkgutil
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.basemodel import RegionEnum
+from utils.const import PROJECT_ROOT
+
+__all__ = ("import_models", "prepare_database")
+
+PLAYER_ID_BASE = 100000000
+
+
+def import_models():
+    """导入 ``core.services`` 下所有的数据模型，``SQLModel.metadata`` 才能包含全部数据表"""
+    services_path = PROJECT_ROOT / "core" / "services"
+    for module in pkgutil.iter_modules([str(services_path)]):
+        if services_path.joinpath(module.name, "models.py").exists():
+            importlib.import_module(f"core.services.{module.name}.models")
+
+
+async def prepare_database(url: str, user_ids: Iterable[int]):
+    from core.services.cookies.models import CookiesDataBase, CookiesStatusEnum
+    from core.services.players.models import PlayersDataBase
+
+    import_models()
+    user_ids = list(user_ids)
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            statement = select(PlayersDataBase.user_id).where(PlayersDataBase.user_id.in_(user_ids))
+            exists = set((await session.execute(statement)).scalars())
+            for index, user_id in enumerate(user_ids, 1):
+                if user_id in exists:
+                    continue
+                player_id = PLAYER_ID_BASE + index
+                session.add(
+                    PlayersDataBase(
+                        user_id=user_id,
+                        account_id=player_id,
+                        player_id=player_id,
+                        region=RegionEnum.HYPERION,
+                        is_chosen=True,
+                    )
+                )
+                session.add(
+                    CookiesDataBase(
+                        user_id=user_id,
+                        account_id=player_id,
+                        data={"ltuid": str(player_id), "ltoken": "loadtest", "cookie_token": "loadtest"},
+                        region=RegionEnum.HYPERION,
+                        status=CookiesStatusEnum.STATUS_SUCCESS,
+                        is_share=False,
+                    )
+                )
+            await session.commit()
+    finally:
+        await engine.dispose()
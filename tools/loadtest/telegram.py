@@ -0,0 +1,217 @@
+"""模拟 Telegram Bot API
+
+机器人通过 ``getUpdates`` 拉取注入的 update，其余请求按 chat 记录下来并返回最小可用的结果，
+每个请求在返回前等待 ``latency + uniform(0, jitter)`` 秒，模拟 Bot API 的网络延迟。
+"""
+
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter, defaultdict
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, Request
+
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+__all__ = ("RecordedCall", "FakeBotAPI")
+
+BOT_ID = 1000000000
+BOT_USER = {"id": BOT_ID, "is_bot": True, "first_name": "LoadTest", "username": "loadtest_bot"}
+MESSAGE_METHODS = {
+    "sendMessage",
+    "sendPhoto",
+    "sendDocument",
+    "sendSticker",
+    "sendAnimation",
+    "sendVideo",
+    "sendAudio",
+    "sendVoice",
+    "sendLocation",
+    "sendPoll",
+    "sendDice",
+    "editMessageText",
+    "editMessageCaption",
+    "editMessageMedia",
+    "editMessageReplyMarkup",
+}
+IGNORED_METHODS = {"getUpdates", "getMe", "sendChatAction"}
+
+
+class RecordedCall(NamedTuple):
+    method: str
+    chat_id: Optional[int]
+    time: float
+    text: str
+
+
+def parse_body(content_type: str, body: bytes) -> Dict[str, str]:
+    """PTB 使用表单或者 multipart 发送参数，文件内容不需要保留"""
+    if not body:
+        return {}
+    if content_type.startswith("application/json"):
+        return {k: v if isinstance(v, str) else jsonlib.dumps(v) for k, v in jsonlib.loads(body).items()}
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        params = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name and part.get_filename() is None:
+                params[name] = part.get_payload(decode=True).decode("utf-8", "replace")
+        return params
+    return dict(parse_qsl(body.decode("utf-8"), keep_blank_values=True))
+
+
+def _chat_id(params: Dict[str, str]) -> Optional[int]:
+    try:
+        return int(params["chat_id"])
+    except (KeyError, ValueError):
+        return None
+
+
+class FakeBotAPI:
+    """
+    :param latency: 每个请求的固定延迟
+    :param jitter: 额外的随机延迟上限
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.calls: Dict[Optional[int], List[RecordedCall]] = defaultdict(list)
+        self.methods: Counter = Counter()
+        self.ready = asyncio.Event()
+        self._updates: List[Dict[str, Any]] = []
+        self._update_id = itertools.count(1)
+        self._message_id = itertools.count(1)
+        self._new_update = asyncio.Event()
+        self._chat_events: Dict[int, asyncio.Event] = defaultdict(asyncio.Event)
+        self._results: Dict[str, Callable[[Dict[str, str]], Any]] = {
+            "getMe": lambda _: {**BOT_USER, "can_join_groups": True, "can_read_all_group_messages": False},
+            "getWebhookInfo": lambda _: {"url": "", "has_custom_certificate": False, "pending_update_count": 0},
+            "getMyCommands": lambda _: [],
+            "getChatAdministrators": lambda _: [],
+            "getChat": lambda p: {**self.chat(_chat_id(p) or 0), "accent_color_id": 0, "max_reaction_count": 11},
+            "getChatMember": lambda p: {"status": "member", "user": self.user(int(p.get("user_id", 0)))},
+            "getFile": lambda p: {"file_id": p.get("file_id", ""), "file_unique_id": "0", "file_path": "file"},
+            "copyMessage": lambda _: {"message_id": next(self._message_id)},
+            "sendMediaGroup": lambda p: [self.message("sendPhoto", _chat_id(p) or 0, p)],
+        }
+        self.app = FastAPI()
+        self.app.add_api_route("/bot{token}/{method}", self.handle, methods=["GET", "POST"])
+
+    @staticmethod
+    def user(user_id: int) -> Dict[str, Any]:
+        return {"id": user_id, "is_bot": False, "first_name": f"user{user_id}", "language_code": "zh-hans"}
+
+    @staticmethod
+    def chat(chat_id: int) -> Dict[str, Any]:
+        return {"id": chat_id, "type": "private", "first_name": f"user{chat_id}"}
+
+    def message(self, method: str, chat_id: int, params: Dict[str, str]) -> Dict[str, Any]:
+        message_id = params.get("message_id")
+        message = {
+            "message_id": int(message_id) if message_id else next(self._message_id),
+            "date": int(time.time()),
+            "chat": self.chat(chat_id),
+            "from": BOT_USER,
+            "text": params.get("text") or None,
+        }
+        # 模板渲染结果会缓存返回的 file_id
+        file = {"file_id": f"loadtest-{message['message_id']}", "file_unique_id": str(message["message_id"])}
+        if method == "sendPhoto":
+            message["photo"] = [{**file, "width": 1, "height": 1}]
+        elif method == "sendDocument":
+            message["document"] = file
+        return message
+
+    def inject(self, user_id: int, text: str, chat_id: Optional[int] = None) -> float:
+        """注入一条用户消息，返回注入时间"""
+        chat_id = user_id if chat_id is None else chat_id
+        message = {
+            "message_id": next(self._message_id),
+            "date": int(time.time()),
+            "chat": self.chat(chat_id),
+            "from": self.user(user_id),
+            "text": text,
+        }
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        self._updates.append({"update_id": next(self._update_id), "message": message})
+        self._new_update.set()
+        return time.perf_counter()
+
+    def _record(self, method: str, params: Dict[str, str]):
+        self.methods[method] += 1
+        if method in IGNORED_METHODS:
+            return
+        chat_id = _chat_id(params)
+        self.calls[chat_id].append(
+            RecordedCall(method, chat_id, time.perf_counter(), params.get("text") or params.get("caption") or "")
+        )
+        if chat_id is not None:
+            self._chat_events[chat_id].set()
+
+    async def _get_updates(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        self.ready.set()
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        timeout = float(params.get("timeout") or 0)
+        self._updates = [i for i in self._updates if i["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._new_update.clear()
+            try:
+                await asyncio.wait_for(self._new_update.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._updates[:limit]
+
+    async def handle(self, method: str, request: Request, token: str):  # pylint: disable=W0613
+        params = parse_body(request.headers.get("content-type", ""), await request.body())
+        params.update(request.query_params)
+        self._record(method, params)
+        if method == "getUpdates":
+            return {"ok": True, "result": await self._get_updates(params)}
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if method in self._results:
+            result = self._results[method](params)
+        elif method in MESSAGE_METHODS:
+            result = self.message(method, _chat_id(params) or 0, params)
+        else:
+            result = True
+        return {"ok": True, "result": result}
+
+    async def wait_idle(
+        self, chat_id: int, since: float, settle: float, timeout: float
+    ) -> Tuple[Optional[float], Optional[float], List[RecordedCall]]:
+        """等待机器人回复并在 ``settle`` 秒内不再有新的请求
+
+        :return: ``(第一个回复的时间, 最后一个回复的时间, 回复)``，超时没有回复时时间为 ``None``
+        """
+        deadline = since + timeout
+        event = self._chat_events[chat_id]
+        # 之前命令的记录不再需要
+        self.calls[chat_id] = [i for i in self.calls.get(chat_id, ()) if i.time >= since]
+        while True:
+            calls = [i for i in self.calls.get(chat_id, ()) if i.time >= since]
+            now = time.perf_counter()
+            if calls and now - calls[-1].time >= settle:
+                return calls[0].time, calls[-1].time, calls
+            if now >= deadline:
+                return (calls[0].time, calls[-1].time, calls) if calls else (None, None, calls)
+            wait = min(deadline, calls[-1].time + settle) - now if calls else deadline - now
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), max(wait, 0.001))
+            except asyncio.TimeoutError:
+                pass
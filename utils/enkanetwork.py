@@ -1,13 +1,25 @@
+import asyncio
 import logging
+import time
 import warnings
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple, Type, TypeVar, TYPE_CHECKING
 
 from cachetools import TTLCache
 from enkanetwork.assets import Assets
 from enkanetwork.cache import Cache
 from enkanetwork.client import EnkaNetworkAPI as _EnkaNetworkAPI
 from enkanetwork.config import Config
-from enkanetwork.exception import TimedOut, NetworkError, EnkaServerError, ERROR_ENKA
+from enkanetwork.exception import (
+    TimedOut,
+    NetworkError,
+    EnkaServerError,
+    ERROR_ENKA,
+    EnkaPlayerNotFound,
+    EnkaServerMaintanance,
+    EnkaServerRateLimit,
+    EnkaServerUnknown,
+    VaildateUIDError,
+)
 from enkanetwork.http import HTTPClient as _HTTPClient, Route
 from httpx import AsyncClient, TimeoutException, HTTPError, Timeout
 
@@ -16,10 +28,23 @@ try:
 except ImportError:
     import json as jsonlib
 
+from utils.log import logger
+from utils.tiered_cache import TieredCache
+
 if TYPE_CHECKING:
     from redis import asyncio as aioredis
 
-__all__ = ("RedisCache", "StaticCache", "HTTPClient", "EnkaNetworkAPI")
+__all__ = ("RedisCache", "StaticCache", "HTTPClient", "EnkaNetworkAPI", "EnkaRequestGuard", "enka_guard")
+
+T = TypeVar("T")
+
+
+def _clone_exception(exc: Exception) -> Exception:
+    """复制异常，不同调用方抛出各自的实例，traceback 不会在缓存的异常上累积"""
+    clone = BaseException.__new__(type(exc), *exc.args)
+    clone.__dict__.update(exc.__dict__)
+    clone.__cause__ = exc.__cause__
+    return clone
 
 
 class StaticCache(Cache):
@@ -39,22 +64,24 @@ class RedisCache(Cache):
         self.redis = redis
         self.ex = ex
         self.key = key
+        # 本地只缓存原始 JSON 文本，每次读取都重新解析，避免调用方修改缓存的数据
+        self.local: TieredCache[str] = TieredCache(
+            redis, key or "enka_network", lambda data: str(data, encoding="utf-8"), ttl=min(ex, 30)
+        )
 
     def get_qname(self, key):
         return f"{self.key}:{key}" if self.key else f"enka_network:{key}"
 
     async def get(self, key) -> Optional[Dict[str, Any]]:
-        qname = self.get_qname(key)
-        data = await self.redis.get(qname)
-        if data:
-            json_data = str(data, encoding="utf-8")
+        json_data = await self.local.get(self.get_qname(key))
+        if json_data:
             return jsonlib.loads(json_data)
         return None
 
     async def set(self, key, value) -> None:
         qname = self.get_qname(key)
         data = jsonlib.dumps(value)
-        await self.redis.set(qname, data, ex=self.ex)
+        await self.local.set(qname, data, ex=self.ex)
 
     async def exists(self, key) -> int:
         qname = self.get_qname(key)
@@ -138,3 +165,99 @@ class EnkaNetworkAPI(_EnkaNetworkAPI):
         # http client
         self.__http = HTTPClient(key=key, agent=user_agent, timeout=timeout)  # skipcq: PTC-W0037
         self._closed = False
+
+
+class EnkaRequestGuard:
+    """Enka.Network 请求保护
+
+    - 同一个 key 的并发请求只会发出一次
+    - 按错误类型缓存失败结果，有效期内直接抛出相同类型与内容的异常
+    - 服务维护或触发速率限制时熔断，熔断期间所有请求直接失败，由调用方使用本地数据
+    """
+
+    NEGATIVE_TTL: Dict[Type[Exception], float] = {
+        VaildateUIDError: 60 * 60,
+        EnkaPlayerNotFound: 60 * 10,
+        EnkaServerUnknown: 60,
+        EnkaServerError: 30,
+        TimedOut: 15,
+        NetworkError: 15,
+    }
+    BREAKER_TTL: Dict[Type[Exception], float] = {
+        EnkaServerMaintanance: 60 * 30,
+        EnkaServerRateLimit: 60,
+    }
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+        self._negative: Dict[str, Tuple[Exception, float]] = {}
+        self._breaker: Optional[Tuple[Exception, float]] = None
+
+    @staticmethod
+    def _get_ttl(table: Dict[Type[Exception], float], exc: Exception) -> float:
+        for exc_type, ttl in table.items():
+            if isinstance(exc, exc_type):
+                return ttl
+        return 0
+
+    @property
+    def breaker_open(self) -> bool:
+        return self._breaker is not None and self._breaker[1] > time.monotonic()
+
+    def check(self, uid: Any):
+        """熔断或存在失败缓存时抛出对应的异常"""
+        if self._breaker is not None:
+            exc, expires = self._breaker
+            if expires > time.monotonic():
+                raise _clone_exception(exc)
+            self._breaker = None
+        if (negative := self._negative.get(str(uid))) is not None:
+            exc, expires = negative
+            if expires > time.monotonic():
+                raise _clone_exception(exc)
+            del self._negative[str(uid)]
+
+    def record(self, uid: Any, exc: Exception):
+        now = time.monotonic()
+        if ttl := self._get_ttl(self.BREAKER_TTL, exc):
+            logger.warning("Enka.Network 请求熔断 %s 秒: %s", ttl, exc.__class__.__name__)
+            self._breaker = (exc, now + ttl)
+        elif ttl := self._get_ttl(self.NEGATIVE_TTL, exc):
+            self._negative[str(uid)] = (exc, now + ttl)
+            if len(self._negative) > 4096:
+                self._negative = {k: v for k, v in self._negative.items() if v[1] > now}
+
+    async def _run(self, uid: Any, fetch: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await fetch()
+        except Exception as exc:
+            self.record(uid, exc)
+            raise
+
+    async def call(self, uid: Any, fetch: Callable[[], Awaitable[T]], kind: str = "") -> T:
+        """执行请求
+
+        :param uid: 玩家 UID，失败缓存按 UID 记录
+        :param fetch: 实际发出请求的方法
+        :param kind: 请求类型，不同类型的请求不会合并
+        """
+        self.check(uid)
+        key = f"{kind}:{uid}"
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(uid, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.shield(task)
+        except Exception as exc:
+            raise _clone_exception(exc) from exc.__cause__  # 合并的请求不共用同一个异常实例
+
+    def _done(self, key: str, task: "asyncio.Task"):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # 所有调用方都已取消时避免出现未获取异常的警告
+
+
+enka_guard = EnkaRequestGuard()
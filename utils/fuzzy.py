@@ -0,0 +1,178 @@
+"""基于 n-gram 倒排索引的模糊搜索
+
+先通过 n-gram 倒排索引筛选出候选，再用有界编辑距离打分，不需要遍历全部条目。
+安装了 ``pypinyin`` （``pinyin`` 可选依赖）时，中文条目还会额外索引全拼与拼音首字母，中文查询也会按全拼搜索。
+"""
+
+from typing import Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:
+    Style = lazy_pinyin = None
+
+__all__ = ("FuzzyIndex", "MIN_SCORE", "edit_distance", "ngrams", "pinyin_keys")
+
+T = TypeVar("T")
+
+MIN_SCORE = 60.0
+"""默认的最低分数，低于该分数的结果认为不相关"""
+
+
+def ngrams(text: str, n: int = 2) -> Set[str]:
+    """生成带边界标记的 n-gram"""
+    text = f"\x02{text}\x03"
+    if len(text) <= n:
+        return {text}
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """有界编辑距离，超过 ``max_distance`` 时返回 ``max_distance + 1``"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, char_b in enumerate(b, 1):
+        current = [i]
+        for j, char_a in enumerate(a, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+def pinyin_keys(text: str) -> List[str]:
+    """获取中文文本的全拼与拼音首字母，未安装 pypinyin 或不含中文时返回空列表"""
+    if lazy_pinyin is None or text.isascii():
+        return []
+    full = "".join(lazy_pinyin(text))
+    first = "".join(lazy_pinyin(text, style=Style.FIRST_LETTER))
+    return [key for key in dict.fromkeys((full, first)) if key and key != text]
+
+
+class FuzzyIndex(Generic[T]):
+    """别名到目标值的模糊搜索索引
+
+    同一个别名只保留第一次添加的目标值，搜索结果按目标值去重并按分数排序。
+    """
+
+    __slots__ = ("n", "_keys", "_values", "_exact", "_grams")
+
+    def __init__(self, n: int = 2):
+        self.n = n
+        self._keys: List[str] = []
+        self._values: List[T] = []
+        self._exact: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _add_key(self, key: str, value: T):
+        if not key or key in self._exact:
+            return
+        idx = len(self._keys)
+        self._keys.append(key)
+        self._values.append(value)
+        self._exact[key] = idx
+        for gram in ngrams(key, self.n):
+            self._grams.setdefault(gram, []).append(idx)
+
+    def add(self, key: str, value: T, pinyin: bool = True):
+        key = str.casefold(key)
+        self._add_key(key, value)
+        if pinyin:
+            for pinyin_key in pinyin_keys(key):
+                self._add_key(pinyin_key, value)
+
+    def update(self, items: Iterable[Tuple[str, T]], pinyin: bool = True):
+        for key, value in items:
+            self.add(key, value, pinyin)
+
+    @staticmethod
+    def _max_distance(query: str) -> int:
+        if len(query) <= 1:
+            return 0
+        if len(query) <= 5:
+            return 1
+        return 2
+
+    def _score(self, query: str, key: str, max_distance: int) -> Optional[float]:
+        # 单个字符几乎是所有名称的子串，只允许精确匹配
+        if len(query) > 1 and query in key:
+            return 90.0 + 10.0 * len(query) / len(key)
+        if len(key) > 1 and key in query:
+            return 80.0 + 10.0 * len(key) / len(query)
+        distance = edit_distance(query, key, max_distance)
+        if distance > max_distance:
+            return None
+        # 允许的编辑距离由查询长度决定，两个字的名称错一个字与长名称错一个字得分相近
+        return 80.0 - 20.0 * distance / (max_distance + 1)
+
+    def _collect(
+        self,
+        query: str,
+        max_distance: int,
+        min_score: float,
+        results: Dict[object, Tuple[T, float, int]],
+        max_score: float = 100.0,
+    ):
+        query_grams = ngrams(query, self.n)
+        counter: Dict[int, int] = {}
+        for gram in query_grams:
+            for key_idx in self._grams.get(gram, ()):
+                counter[key_idx] = counter.get(key_idx, 0) + 1
+        # 每次编辑最多破坏 n 个 n-gram，公共 n-gram 少于下限的一定不满足编辑距离，但可能是子串
+        need = max(1, len(query_grams) - self.n * max_distance)
+        for key_idx, count in counter.items():
+            key = self._keys[key_idx]
+            if count < need and query not in key and key not in query:
+                continue
+            score = 100.0 if key == query else self._score(query, key, max_distance)
+            if score is None:
+                continue
+            score = min(score, max_score)
+            if score < min_score:
+                continue
+            value = self._values[key_idx]
+            value_id = id(value) if not isinstance(value, (int, str)) else value
+            if value_id not in results or results[value_id][1:] < (score, count):
+                results[value_id] = (value, score, count)
+
+    def search(
+        self, query: str, limit: int = 5, max_distance: Optional[int] = None, min_score: float = MIN_SCORE
+    ) -> List[Tuple[T, float]]:
+        """搜索与 ``query`` 相近的条目
+
+        中文查询还会用全拼再搜索一次，输入法打出的同音字也能匹配，这部分结果最高 95 分。
+
+        :param query: 搜索文本
+        :param limit: 最多返回的数量
+        :param max_distance: 允许的最大编辑距离，默认按查询长度决定
+        :param min_score: 最低分数，低于该分数的结果不返回
+        :return: ``(目标值, 分数)`` 列表，分数 ∈[min_score,100]
+        """
+        query = str.casefold(query).strip()
+        if not query:
+            return []
+        if (idx := self._exact.get(query)) is not None and limit == 1:
+            return [(self._values[idx], 100.0)]
+        results: Dict[object, Tuple[T, float, int]] = {}
+        self._collect(query, self._max_distance(query) if max_distance is None else max_distance, min_score, results)
+        # 单个汉字的拼音是很多名称拼音的子串
+        if len(query) > 1:
+            for pinyin_key in pinyin_keys(query)[:1]:
+                distance = self._max_distance(pinyin_key) if max_distance is None else max_distance
+                self._collect(pinyin_key, distance, min_score, results, max_score=95.0)
+        # 分数相同时公共 n-gram 多的排在前面
+        ranked = sorted(results.values(), key=lambda item: item[1:], reverse=True)
+        return [(value, score) for value, score, _ in ranked[:limit]]
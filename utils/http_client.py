@@ -0,0 +1,153 @@
+"""共享的 HTTP 连接池
+
+所有组件通过 ``HTTPClientPool.create_client`` 获取 ``httpx.AsyncClient``，
+这些客户端共用同一个 transport，从而按 host 复用连接、共享连接数限制与超时配置。
+"""
+
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from core.config import config
+from gram_core.basemodel import Settings, SettingsConfigDict
+from utils.metrics import http_request_duration, http_request_errors, metrics_config
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+__all__ = ("HTTPClientConfig", "HostStatistics", "HTTPClientPool", "http_client_config", "timeout")
+
+
+class HTTPClientConfig(Settings):
+    """共享 HTTP 客户端配置"""
+
+    http2: bool = False
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: float = 30.0
+
+    model_config = SettingsConfigDict(env_prefix="http_client_")
+
+
+http_client_config = HTTPClientConfig()
+
+timeout = httpx.Timeout(
+    timeout=config.timeout,
+    read=config.read_timeout,
+    write=config.write_timeout,
+    connect=config.connect_timeout,
+    pool=config.pool_timeout,
+)
+
+
+class HostStatistics:
+    """单个 host 的请求统计"""
+
+    __slots__ = ("host", "in_flight", "requests", "errors", "total_latency", "max_latency")
+
+    def __init__(self, host: str):
+        self.host = host
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.total_latency / self.requests
+
+    def record(self, latency: float, error: bool = False):
+        self.requests += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if error:
+            self.errors += 1
+
+
+class StatisticsTransport(httpx.AsyncBaseTransport):
+    """记录请求统计的 transport
+
+    关闭由 ``HTTPClientPool`` 统一管理，借用它的客户端关闭时不会关闭连接池。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, statistics: Dict[str, HostStatistics]):
+        self._transport = transport
+        self._statistics = statistics
+
+    def get_statistics(self, host: str) -> HostStatistics:
+        statistics = self._statistics.get(host)
+        if statistics is None:
+            statistics = self._statistics[host] = HostStatistics(host)
+        return statistics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        statistics = self.get_statistics(request.url.host)
+        statistics.in_flight += 1
+        start = time.perf_counter()
+        error = True
+        try:
+            response = await self._transport.handle_async_request(request)
+            error = response.is_server_error
+            return response
+        finally:
+            latency = time.perf_counter() - start
+            statistics.in_flight -= 1
+            statistics.record(latency, error)
+            if metrics_config.enable:
+                http_request_duration.observe(latency, request.url.host)
+                if error:
+                    http_request_errors.inc(request.url.host)
+
+    async def aclose(self) -> None:
+        """借用的客户端不允许关闭共享连接池"""
+
+    async def shutdown(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientPool:
+    """全局共享的 HTTP 连接池"""
+
+    _transport: Optional[StatisticsTransport] = None
+    statistics: Dict[str, HostStatistics] = {}
+
+    @classmethod
+    def get_transport(cls) -> StatisticsTransport:
+        if cls._transport is None:
+            limits = httpx.Limits(
+                max_connections=http_client_config.max_connections or config.connection_pool_size,
+                max_keepalive_connections=http_client_config.max_keepalive_connections or config.connection_pool_size,
+                keepalive_expiry=http_client_config.keepalive_expiry,
+            )
+            transport = httpx.AsyncHTTPTransport(
+                http2=http_client_config.http2 and h2 is not None,
+                limits=limits,
+            )
+            cls._transport = StatisticsTransport(transport, cls.statistics)
+        return cls._transport
+
+    @classmethod
+    def create_client(cls, *args, **kwargs) -> httpx.AsyncClient:
+        """创建一个使用共享连接池的客户端
+
+        客户端本身很轻量，可以按需创建或在组件中长期持有，关闭它不会影响连接池。
+        """
+        kwargs.setdefault("timeout", timeout)
+        return httpx.AsyncClient(*args, transport=cls.get_transport(), **kwargs)
+
+    @classmethod
+    def get_statistics(cls) -> Dict[str, HostStatistics]:
+        return dict(cls.statistics)
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        if cls._transport is None:
+            return
+        transport, cls._transport = cls._transport, None
+        await transport.shutdown()
@@ -0,0 +1,294 @@
+"""按需加载插件
+
+启用后，``DECLARATIONS`` 中声明的插件模块在启动时被替换为空模块，只按声明注册轻量的 handler 与定时任务。
+第一次收到匹配的 update 或者定时任务触发时才在线程中导入插件模块，实例化并安装插件，
+再把触发加载的 update 交给插件自己的 handler 处理。
+
+在加载之前 ``plugins_map`` 中没有这些插件，所以只能声明不被其他组件依赖、也不提供 inline 或迁移数据的插件。
+"""
+
+import asyncio
+import importlib
+import importlib.abc
+import importlib.machinery
+import inspect
+import sys
+import time
+import typing
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from telegram.ext import BaseHandler, CallbackQueryHandler, CommandHandler, MessageHandler, filters
+
+from gram_core.basemodel import Settings, SettingsConfigDict
+
+from utils.log import logger
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import Application, ContextTypes, Job
+
+__all__ = (
+    "LazyPluginConfig",
+    "LazyJob",
+    "PluginDeclaration",
+    "LazyPluginFinder",
+    "LazyPlugin",
+    "DECLARATIONS",
+    "lazy_plugins",
+    "lazy_plugin_config",
+    "lazy_plugin_finder",
+)
+
+
+class LazyPluginConfig(Settings):
+    """按需加载插件配置"""
+
+    enable: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="lazy_plugin_")
+
+
+lazy_plugin_config = LazyPluginConfig()
+
+
+@dataclass
+class LazyJob:
+    """定时任务声明
+
+    ``method`` 与 ``kwargs`` 对应 ``JobQueue`` 的方法与参数，``name`` 需要与插件注册的定时任务名称一致。
+    """
+
+    name: str
+    method: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PluginDeclaration:
+    """插件声明
+
+    :param module: 插件模块
+    :param commands: 触发加载的命令
+    :param messages: 触发加载的消息 filter
+    :param callback_patterns: 触发加载的 callback data 正则
+    :param jobs: 触发加载的定时任务
+    """
+
+    module: str
+    commands: Sequence[str] = ()
+    messages: Sequence[filters.BaseFilter] = ()
+    callback_patterns: Sequence[str] = ()
+    jobs: Sequence[LazyJob] = ()
+
+    def build_handlers(self, callback) -> List[BaseHandler]:
+        handlers: List[BaseHandler] = []
+        if self.commands:
+            handlers.append(CommandHandler(list(self.commands), callback, block=False))
+        handlers.extend(MessageHandler(i, callback, block=False) for i in self.messages)
+        handlers.extend(CallbackQueryHandler(callback, pattern=i, block=False) for i in self.callback_patterns)
+        return handlers
+
+
+DECLARATIONS = (
+    PluginDeclaration(
+        "plugins.genshin.player_cards",
+        commands=("player_card", "player_cards"),
+        messages=(filters.Regex("^角色卡片查询(.*)"),),
+        callback_patterns=(r"^update_player_card\|", r"^get_player_card\|"),
+    ),
+    PluginDeclaration(
+        "plugins.genshin.wish",
+        commands=("wish", "set_wish"),
+        messages=(filters.Regex("^抽卡模拟器(.*)"), filters.Regex("^非首模拟器定轨(.*)")),
+    ),
+    PluginDeclaration("plugins.genshin.help_raw", commands=("help_raw",)),
+)
+
+
+class LazyPluginFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """把声明的插件模块替换为空模块，访问空模块的属性时立即导入真正的模块"""
+
+    def __init__(self, modules: Iterable[str]):
+        self.modules: Set[str] = set(modules)
+        self.loaded: Set[str] = set()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def find_spec(self, fullname, path=None, target=None):  # pylint: disable=W0613
+        if fullname not in self.modules or fullname in self.loaded:
+            return None
+        return importlib.machinery.ModuleSpec(fullname, self)
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module: ModuleType):
+        def __getattr__(name: str):
+            if name.startswith("__"):
+                raise AttributeError(name)
+            logger.warning("插件模块 %s 在加载前被访问，已立即导入", module.__name__)
+            return getattr(self.load(module.__name__), name)
+
+        module.__getattr__ = __getattr__
+
+    def is_placeholder(self, fullname: str) -> bool:
+        module = sys.modules.get(fullname)
+        return module is not None and getattr(module.__spec__, "loader", None) is self
+
+    def load(self, fullname: str) -> ModuleType:
+        """导入真正的模块"""
+        if not self.is_placeholder(fullname):
+            return importlib.import_module(fullname)
+        self.loaded.add(fullname)
+        placeholder = sys.modules.pop(fullname)
+        try:
+            return importlib.import_module(fullname)
+        except BaseException:
+            self.loaded.discard(fullname)
+            sys.modules[fullname] = placeholder
+            raise
+
+
+lazy_plugin_finder = LazyPluginFinder(i.module for i in DECLARATIONS)
+
+
+def _components(managers) -> List[object]:
+    result: List[object] = []
+    for name in ("dependency_map", "components_map", "services_map", "plugins_map"):
+        result.extend(getattr(managers, name, {}).values())
+    return result
+
+
+def _build_plugin(cls: type, components: List[object]):
+    """按构造函数的类型注解注入依赖"""
+    try:
+        hints = typing.get_type_hints(cls.__init__)
+    except Exception:  # pylint: disable=W0703
+        hints = getattr(cls.__init__, "__annotations__", {})
+    kwargs = {}
+    for name, parameter in inspect.signature(cls.__init__).parameters.items():
+        if name == "self" or parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        annotation = hints.get(name)
+        instance = None
+        if isinstance(annotation, type):
+            instance = next((i for i in components if isinstance(i, annotation)), None)
+        if instance is not None:
+            kwargs[name] = instance
+        elif parameter.default is parameter.empty:
+            raise TypeError(f"插件 {cls.__name__} 的参数 {name} 没有可以注入的依赖")
+    return cls(**kwargs)
+
+
+class LazyPlugin:
+    """一个按需加载的插件
+
+    :param declaration: 插件声明
+    :param application: gram_core 的 ``Application``
+    :param plugin_classes: 返回全部插件类的函数，一般为 ``get_all_plugins``
+    :param finder: 替换插件模块的 ``LazyPluginFinder``
+    """
+
+    def __init__(
+        self,
+        declaration: PluginDeclaration,
+        application,
+        plugin_classes: Callable[[], Iterable[type]],
+        finder: Optional[LazyPluginFinder] = None,
+    ):
+        self.declaration = declaration
+        self.application = application
+        self.plugin_classes = plugin_classes
+        self.finder = finder or lazy_plugin_finder
+        self.handlers = declaration.build_handlers(self.on_update)
+        self.group = 0
+        self.jobs: List["Job"] = []
+        self.instances: List[object] = []
+        self.loaded = False
+        self._new_handlers: Dict[int, List[BaseHandler]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def telegram(self) -> "Application":
+        return self.application.telegram
+
+    def install(self, group: int = 0):
+        """注册声明的 handler 与定时任务"""
+        self.group = group
+        for handler in self.handlers:
+            self.telegram.add_handler(handler, group)
+        for job in self.declaration.jobs:
+            method = getattr(self.telegram.job_queue, job.method)
+            self.jobs.append(method(self.on_job, name=job.name, **job.kwargs))
+
+    def uninstall(self):
+        for handler in self.handlers:
+            self.telegram.remove_handler(handler, self.group)
+        for job in self.jobs:
+            job.schedule_removal()
+        self.jobs.clear()
+
+    async def load(self) -> Dict[int, List[BaseHandler]]:
+        """导入插件模块并安装插件
+
+        :return: 插件注册的 handler，按 group 分组
+        """
+        async with self._lock:
+            if self.loaded:
+                return self._new_handlers
+            start = time.perf_counter()
+            before = {group: list(handlers) for group, handlers in self.telegram.handlers.items()}
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.finder.load, self.declaration.module)
+            managers = self.application.managers
+            plugins_map = getattr(managers, "plugins_map", None)
+            for cls in [i for i in self.plugin_classes() if i.__module__ == self.declaration.module]:
+                if isinstance(plugins_map, dict) and cls in plugins_map:
+                    continue
+                instance = _build_plugin(cls, _components(managers))
+                if hasattr(instance, "set_application"):
+                    instance.set_application(self.application)
+                await instance.install()
+                self.instances.append(instance)
+                if isinstance(plugins_map, dict):
+                    plugins_map[cls] = instance
+            for group, handlers in self.telegram.handlers.items():
+                new = [i for i in handlers if i not in before.get(group, ()) and i not in self.handlers]
+                if new:
+                    self._new_handlers[group] = new
+            self.uninstall()
+            self.loaded = True
+            logger.success('插件 "%s" 按需加载完成 耗时 %.3fs', self.declaration.module, time.perf_counter() - start)
+            return self._new_handlers
+
+    async def on_update(self, update: "Update", context: "ContextTypes.DEFAULT_TYPE"):
+        """加载插件并按 group 顺序交给第一个匹配的 handler 处理"""
+        handlers = await self.load()
+        for group in sorted(handlers):
+            for handler in handlers[group]:
+                check = handler.check_update(update)
+                if check is not None and check is not False:
+                    await handler.handle_update(update, self.telegram, check, context)
+                    break
+
+    async def on_job(self, context: "ContextTypes.DEFAULT_TYPE"):
+        """加载插件并执行一次插件注册的同名定时任务"""
+        job = context.job
+        await self.load()
+        for item in self.telegram.job_queue.get_jobs_by_name(job.name):
+            if item is not job:
+                await item.run(self.telegram)
+                return
+        logger.warning('插件 "%s" 没有注册定时任务 %s', self.declaration.module, job.name)
+
+
+def lazy_plugins(
+    application, plugin_classes: Callable[[], Iterable[type]], finder: Optional[LazyPluginFinder] = None
+) -> List[LazyPlugin]:
+    """为仍然是空模块的插件创建 ``LazyPlugin``"""
+    finder = finder or lazy_plugin_finder
+    return [LazyPlugin(i, application, plugin_classes, finder) for i in DECLARATIONS if finder.is_placeholder(i.module)]
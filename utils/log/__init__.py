@@ -1,15 +1,53 @@
 import re
 from functools import lru_cache
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal, Union
 
 from core.config import config
+from gram_core.basemodel import Settings, SettingsConfigDict
 from utils.log._config import LoggerConfig
 from utils.log._logger import LogFilter, Logger
+from utils.log._query import LogQuery, compress_lines, query_log
 
 if TYPE_CHECKING:
     from logging import LogRecord
 
-__all__ = ("logger",)
+__all__ = ("logger", "LogQuery", "compress_lines", "query_log")
+
+
+class LoggerQueueConfig(Settings):
+    """log 写线程配置"""
+
+    enable: bool = False
+    size: int = 10000
+    policy: Literal["drop", "block"] = "drop"
+    block_timeout: float = 1.0
+
+    model_config = SettingsConfigDict(env_prefix="logger_queue_")
+
+
+class LoggerRotateConfig(Settings):
+    """log 文件转存配置"""
+
+    max_bytes: int = 0
+    backup_count: int = 0
+    max_total_size: int = 0
+    compress: bool = True
+
+    model_config = SettingsConfigDict(env_prefix="logger_rotate_")
+
+
+class LoggerJsonConfig(Settings):
+    """结构化 log 配置"""
+
+    enable: bool = False
+    level: Union[str, int] = "INFO"
+
+    model_config = SettingsConfigDict(env_prefix="logger_json_")
+
+
+queue_config = LoggerQueueConfig()
+json_config = LoggerJsonConfig()
+rotate_config = LoggerRotateConfig()
 
 logger = Logger(
     LoggerConfig(
@@ -22,6 +60,16 @@ logger = Logger(
         traceback_locals_max_depth=config.logger.locals_max_depth,
         traceback_locals_max_length=config.logger.locals_max_length,
         traceback_locals_max_string=config.logger.locals_max_string,
+        queue=queue_config.enable,
+        queue_size=queue_config.size,
+        queue_policy=queue_config.policy,
+        queue_block_timeout=queue_config.block_timeout,
+        json_log=json_config.enable,
+        json_log_level=json_config.level,
+        rotate_max_bytes=rotate_config.max_bytes,
+        rotate_backup_count=rotate_config.backup_count,
+        rotate_max_total_size=rotate_config.max_total_size,
+        rotate_compress=rotate_config.compress,
     )
 )
 
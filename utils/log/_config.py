@@ -45,6 +45,29 @@ class LoggerConfig(BaseSettings):
     project_root: Union[str, Path] = PROJECT_ROOT
     """项目根目录"""
 
+    queue: bool = False
+    """是否在独立线程中写出 log，drop 策略下队列已满时会丢弃 WARNING 以下的 log"""
+    queue_size: int = 10000
+    """log 队列的最大长度"""
+    queue_policy: Literal["drop", "block"] = "drop"
+    """队列已满时的策略：丢弃 WARNING 以下的 log，或者一直等待"""
+    queue_block_timeout: float = 1.0
+    """drop 策略下 WARNING 及以上的 log 最多等待的秒数"""
+
+    json_log: bool = False
+    """是否额外输出 JSON 格式的结构化 log"""
+    json_log_level: Union[str, int] = "INFO"
+    """结构化 log 的 level"""
+
+    rotate_max_bytes: int = 0
+    """单个 log 文件的最大字节数，0 表示只按天转存"""
+    rotate_backup_count: int = 0
+    """最多保留的转存文件数量，0 表示不限制"""
+    rotate_max_total_size: int = 0
+    """转存文件的最大总字节数，0 表示不限制"""
+    rotate_compress: bool = True
+    """是否压缩转存文件"""
+
     traceback_max_frames: int = 20
     traceback_locals_max_depth: Optional[int] = None
     traceback_locals_max_length: int = 10
@@ -0,0 +1,58 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Optional
+
+__all__ = ("get_log_context", "bind_update", "reset_log_context", "callback_name")
+
+_log_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("log_context", default=None)
+
+
+def get_log_context() -> Optional[Dict[str, Any]]:
+    """获取当前 update 的上下文，不在 handler 中时返回 None"""
+    return _log_context.get()
+
+
+def _unwrap(callback: Callable) -> Callable:
+    while hasattr(callback, "__wrapped__"):
+        callback = callback.__wrapped__
+    return callback
+
+
+def callback_name(callback: Callable) -> str:
+    """回调的名称，用作日志与指标的标签"""
+    callback = _unwrap(callback)
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+def _callback_info(callback: Callable) -> Dict[str, Optional[str]]:
+    owner = getattr(_unwrap(callback), "__self__", None)
+    return {
+        "plugin": type(owner).__name__ if owner is not None else None,
+        "handler": callback_name(callback),
+    }
+
+
+def bind_update(update: object, callback: Callable) -> Optional[Token]:
+    """绑定 update 与 handler 的上下文
+
+    嵌套的 handler 只更新最外层上下文中的 plugin 与 handler，返回 None；
+    最外层返回 Token，需要调用 ``reset_log_context`` 恢复。
+    """
+    context = _log_context.get()
+    if context is not None:
+        context.update(_callback_info(callback))
+        return None
+    user = getattr(update, "effective_user", None)
+    chat = getattr(update, "effective_chat", None)
+    context = {
+        "update_id": getattr(update, "update_id", None),
+        "user_id": user.id if user is not None else None,
+        "chat_id": chat.id if chat is not None else None,
+        **_callback_info(callback),
+        "start": time.perf_counter(),
+    }
+    return _log_context.set(context)
+
+
+def reset_log_context(token: Token):
+    _log_context.reset(token)
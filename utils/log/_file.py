@@ -1,47 +1,207 @@
+import gzip
 import os
-from datetime import date
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from types import TracebackType
 from typing import IO, AnyStr, Iterable, Iterator, List, Optional, Type
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 __all__ = ["FileIO"]
 
+SYNC_INTERVAL = 60
+"""检查日志文件是否已被其他进程转存的间隔（秒）"""
+BACKUP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}(\.\d+)?\.log(\.gz)?$")
+
+
+def _archive_delay() -> float:
+    """其他进程最迟在 ``SYNC_INTERVAL`` 秒后才会发现文件已被转存，在此之前仍可能写入转存文件"""
+    return SYNC_INTERVAL * 2
+
+
+@contextmanager
+def _process_lock(path: Path):
+    """多个进程共用一个日志目录时，转存需要持有的文件锁"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a+", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
 
 # noinspection SpellCheckingInspection
 class FileIO(IO[str]):
-    def __init__(self, path: Path):
+    """按天或按大小转存的日志文件
+
+    写入的字节数与下一次按天转存的时间都记录在内存中，写入时不需要 stat 文件；
+    每隔 ``SYNC_INTERVAL`` 秒才检查一次文件是否已被其他进程转存。
+    其他进程在这段时间内仍会写入转存文件，所以转存文件在超过两倍 ``SYNC_INTERVAL`` 没有写入后
+    才在后台线程中压缩，并按数量与总大小清理旧文件。
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        max_total_size: int = 0,
+        compress: bool = True,
+    ):
+        """
+        :param path: 日志文件路径
+        :param max_bytes: 单个文件的最大字节数，0 表示只按天转存
+        :param backup_count: 最多保留的转存文件数量，0 表示不限制
+        :param max_total_size: 转存文件的最大总字节数，0 表示不限制
+        :param compress: 是否使用 gzip 压缩转存文件
+        """
         self.path = path.parent.resolve()
         self.file = path
-        self.file_stream: Optional[IO[str]] = None
-
-    def _get_file(self) -> IO[str]:
-        today = date.today()
-        if self.file.exists():
-            if not self.file.is_file():
-                raise FileExistsError(f'Log file conflict, please delete the folder "{str(self.file.resolve())}"')
-            if self.file_stream is None or self.file_stream.closed:
-                self.file_stream = self.file.open(mode="a+", encoding="utf-8")
-            modify_date = date.fromtimestamp(os.stat(self.file).st_mtime)
+        self.file_stream: Optional[IO[bytes]] = None
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_total_size = max_total_size
+        self.compress = compress
+        self._lock = threading.RLock()
+        self._size = 0
+        self._date = date.today()
+        self._rollover_at = 0.0
+        self._next_sync = 0.0
+
+    def _open(self):
+        if self.file.exists() and not self.file.is_file():
+            raise FileExistsError(f'Log file conflict, please delete the folder "{str(self.file.resolve())}"')
+        self.file_stream = self.file.open(mode="ab+")
+        stat = os.fstat(self.file_stream.fileno())
+        self._size = stat.st_size
+        self._date = date.fromtimestamp(stat.st_mtime) if stat.st_size else date.today()
+        self._rollover_at = datetime.combine(self._date + timedelta(days=1), datetime.min.time()).timestamp()
+        self._next_sync = time.monotonic() + SYNC_INTERVAL
+
+    def _sync(self):
+        """文件已被其他进程转存时重新打开，否则以实际大小为准"""
+        try:
+            stat = os.stat(self.file)
+        except FileNotFoundError:
+            stat = None
+        current = os.fstat(self.file_stream.fileno())
+        if stat is None or (stat.st_ino, stat.st_dev) != (current.st_ino, current.st_dev):
+            self.file_stream.close()
+            self._open()
         else:
-            self.file_stream = self.file.open(mode="a+", encoding="utf-8")
-            modify_date = today
-        if modify_date < today:
-            if self.file_stream is not None and not self.file_stream.closed:
+            self._size = stat.st_size
+            self._next_sync = time.monotonic() + SYNC_INTERVAL
+
+    def _backup_name(self, day: date) -> Path:
+        name = day.strftime("%Y-%m-%d")
+        backup, index = self.path.joinpath(f"{name}.log"), 0
+        while backup.exists() or backup.with_name(f"{backup.name}.gz").exists():
+            index += 1
+            backup = self.path.joinpath(f"{name}.{index}.log")
+        return backup
+
+    def _rotate(self):
+        with self._lock, _process_lock(self.path.joinpath(".rotate.lock")):
+            self._sync()
+            if not self._should_rotate(time.time()):
+                return
+            if self._size == 0:
                 self.file_stream.close()
-            log_path = self.path.joinpath(f'{modify_date.strftime("%Y-%m-%d")}.log')
-            if log_path.exists():
-                # 转存日志
-                with open(log_path, mode="a+", encoding="utf-8") as file:
-                    file.write("\n")
-                    with open(self.file, mode="r+", encoding="utf-8") as f:
-                        file.writelines(f.readlines())
-            else:
-                self.file.rename(self.path.joinpath(f'{modify_date.strftime("%Y-%m-%d")}.log'))
-            self.file_stream = self.file.open(mode="a+", encoding="utf-8")
+                self._open()
+                return
+            backup = self._backup_name(self._date)
+            self.file_stream.close()
+            self.file.rename(backup)
+            # 以转存时间作为修改时间，其他进程之后写入时会继续更新
+            os.utime(backup)
+            self._open()
+        timer = threading.Timer(_archive_delay(), self._archive)
+        timer.name = "LogArchive"
+        timer.daemon = True
+        timer.start()
+
+    def _archive(self):
+        """压缩已经没有进程写入的转存文件并清理旧文件"""
+        try:
+            if self.compress:
+                deadline = time.time() - _archive_delay()
+                for backup in self.path.iterdir():
+                    if not BACKUP_PATTERN.match(backup.name) or backup.suffix != ".log":
+                        continue
+                    try:
+                        if backup.stat().st_mtime <= deadline:
+                            self._compress(backup)
+                    except FileNotFoundError:
+                        continue  # 已被其他进程压缩
+            self._cleanup()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _compress(backup: Path):
+        # 多个进程可能同时压缩同一个文件，临时文件需要区分进程
+        temp = backup.with_name(f"{backup.name}.gz.{os.getpid()}.tmp")
+        try:
+            with open(backup, "rb") as src, gzip.open(temp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(temp, backup.with_name(f"{backup.name}.gz"))
+            backup.unlink()
+        except FileNotFoundError:
+            temp.unlink(missing_ok=True)
+
+    def _cleanup(self):
+        if not (self.backup_count or self.max_total_size):
+            return
+        backups = []
+        for backup in self.path.iterdir():
+            if not BACKUP_PATTERN.match(backup.name):
+                continue
+            try:
+                stat = backup.stat()
+            except FileNotFoundError:
+                continue
+            backups.append((stat.st_mtime, stat.st_size, backup))
+        backups.sort(key=lambda x: x[0], reverse=True)
+        total = 0
+        for count, (_, size, backup) in enumerate(backups, 1):
+            total += size
+            if (self.backup_count and count > self.backup_count) or (
+                self.max_total_size and total > self.max_total_size
+            ):
+                try:
+                    backup.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _should_rotate(self, now: float) -> bool:
+        return now >= self._rollover_at or bool(self.max_bytes and self._size >= self.max_bytes)
+
+    def _get_file(self) -> IO[bytes]:
+        if self.file_stream is None or self.file_stream.closed:
+            with self._lock:
+                if self.file_stream is None or self.file_stream.closed:
+                    self._open()
+        if self._should_rotate(time.time()):
+            self._rotate()
+        elif time.monotonic() >= self._next_sync:
+            with self._lock:
+                self._sync()
         return self.file_stream
 
     def close(self) -> None:
-        return self._get_file().close()
+        if self.file_stream is not None:
+            self.file_stream.close()
 
     def fileno(self) -> int:
         return self._get_file().fileno()
@@ -80,10 +240,14 @@ class FileIO(IO[str]):
         return self._get_file().writable()
 
     def write(self, __s: AnyStr) -> int:
-        return self._get_file().write(__s)
+        data = __s.encode("utf-8") if isinstance(__s, str) else __s
+        self._get_file().write(data)
+        self._size += len(data)
+        return len(__s)
 
     def writelines(self, __lines: Iterable[AnyStr]) -> None:
-        return self._get_file().writelines(__lines)
+        for line in __lines:
+            self.write(line)
 
     def __next__(self) -> AnyStr:
         return self._get_file().__next__()
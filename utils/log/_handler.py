@@ -10,6 +10,7 @@ from typing import (
     Literal,
     Optional,
     TYPE_CHECKING,
+    Tuple,
     Union,
 )
 
@@ -36,6 +37,7 @@ if TYPE_CHECKING:
         RenderableType,
     )
     from logging import LogRecord
+    from rich.traceback import Trace
 
 __all__ = ["LogRender", "Handler", "FileHandler"]
 
@@ -212,6 +214,33 @@ class Handler(DefaultRichHandler):
 
         return message_text
 
+    def trace_options(self, record: "LogRecord") -> Tuple[bool, int, int, Optional[int]]:
+        """提取局部变量的参数，参数相同的 handler 可以共用提取的调用栈"""
+        return (
+            getattr(record, "show_locals", None) or self.tracebacks_show_locals,
+            getattr(record, "locals_max_length", None) or self.locals_max_length,
+            getattr(record, "locals_max_string", None) or self.locals_max_string,
+            getattr(record, "locals_max_depth", self.locals_max_depth),
+        )
+
+    def extract_trace(self, record: "LogRecord") -> Optional["Trace"]:
+        """提取 record 中异常的调用栈与局部变量"""
+        if not (self.rich_tracebacks and record.exc_info and record.exc_info != (None, None, None)):
+            return None
+        exc_type, exc_value, exc_traceback = record.exc_info
+        if exc_type is None or exc_value is None:
+            raise ValueError(record)
+        show_locals, locals_max_length, locals_max_string, locals_max_depth = self.trace_options(record)
+        return Traceback.extract(
+            exc_type,
+            exc_value,
+            exc_traceback,
+            show_locals=show_locals,
+            locals_max_length=locals_max_length,
+            locals_max_string=locals_max_string,
+            locals_max_depth=locals_max_depth,
+        )
+
     def emit(self, record: "LogRecord") -> None:
         message = self.format(record)
         _traceback = None
@@ -233,6 +262,7 @@ class Handler(DefaultRichHandler):
                     locals_max_depth=getattr(record, "locals_max_depth", self.locals_max_depth),
                     suppress=self.tracebacks_suppress,
                     max_frames=self.tracebacks_max_frames,
+                    trace=getattr(record, "rich_traces", {}).get(self),
                 )
             except ImportError:
                 return
@@ -269,8 +299,15 @@ class FileHandler(Handler):
         *args,
         width: int = None,
         path: Path,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        max_total_size: int = 0,
+        compress: bool = True,
         **kwargs,
     ) -> None:
         super().__init__(*args, **kwargs)
         path.parent.mkdir(exist_ok=True, parents=True)
-        self.console = Console(width=width, file=FileIO(path), theme=Theme(DEFAULT_STYLE))
+        file = FileIO(
+            path, max_bytes=max_bytes, backup_count=backup_count, max_total_size=max_total_size, compress=compress
+        )
+        self.console = Console(width=width, file=file, theme=Theme(DEFAULT_STYLE))
@@ -11,6 +11,8 @@ from typing import Any, Callable, List, Mapping, Optional, TYPE_CHECKING, Tuple,
 from typing_extensions import Self
 
 from utils.log._handler import FileHandler, Handler
+from utils.log._queue import LogWriter, QueueHandler
+from utils.log._structured import JsonHandler, install_context_factory, make_duration_record, structured_only_filter
 from utils.typedefs import LogFilterType
 
 if TYPE_CHECKING:
@@ -60,34 +62,84 @@ class Logger(logging.Logger):  # skipcq: PY-A6006
             "project_root": self.config.project_root,
             "log_time_format": self.config.time_format,
         }
+        rotate_config = {
+            "max_bytes": self.config.rotate_max_bytes,
+            "backup_count": self.config.rotate_backup_count,
+            "max_total_size": self.config.rotate_max_total_size,
+            "compress": self.config.rotate_compress,
+        }
         handler, debug_handler, error_handler = (
             # 控制台 log 配置
             Handler(color_system=self.config.color_system, **handler_config),
             # debug.log 配置
-            FileHandler(level=10, path=log_path.joinpath("debug/debug.log"), locals_max_depth=1, **handler_config),
+            FileHandler(
+                level=10,
+                path=log_path.joinpath("debug/debug.log"),
+                locals_max_depth=1,
+                **handler_config,
+                **rotate_config,
+            ),
             # error.log 配置
             FileHandler(
                 level=40,
                 path=log_path.joinpath("error/error.log"),
                 locals_max_depth=self.config.traceback_locals_max_depth,
                 **handler_config,
+                **rotate_config,
             ),
         )
+        handlers: List[logging.Handler] = [handler, debug_handler, error_handler]
+        warnings_handlers: List[logging.Handler] = [handler, debug_handler]
+        self.json_handler: Optional[JsonHandler] = None
+        if self.config.json_log:
+            install_context_factory()
+            for _handler in handlers:
+                _handler.addFilter(structured_only_filter)
+            self.json_handler = JsonHandler(
+                log_path.joinpath("json/json.log"), level=self.config.json_log_level, **rotate_config
+            )
+            handlers.append(self.json_handler)
+            warnings_handlers.append(self.json_handler)
+        self.writer: Optional[LogWriter] = None
+        if self.config.queue:
+            # 渲染与文件 I/O 交给写线程，调用方只负责入队
+            formatter = logging.Formatter("%(message)s", datefmt=self.config.time_format)
+            for _handler in handlers:
+                _handler.setFormatter(formatter)
+            self.writer = LogWriter(
+                handlers,
+                maxsize=self.config.queue_size,
+                policy=self.config.queue_policy,
+                block_timeout=self.config.queue_block_timeout,
+            )
+            self.writer.start()
+            handlers = warnings_handlers = [QueueHandler(self.writer)]
         logging.basicConfig(
             level=10 if self.config.debug else 20,
             format="%(message)s",
             datefmt=self.config.time_format,
-            handlers=[handler, debug_handler, error_handler],
+            handlers=handlers,
         )
         if self.config.capture_warnings:
             logging.captureWarnings(True)
             warnings_logger = logging.getLogger("py.warnings")
-            warnings_logger.addHandler(handler)
-            warnings_logger.addHandler(debug_handler)
-
-        self.addHandler(handler)
-        self.addHandler(debug_handler)
-        self.addHandler(error_handler)
+            for _handler in warnings_handlers:
+                warnings_logger.addHandler(_handler)
+
+        for _handler in handlers:
+            self.addHandler(_handler)
+
+    def handler_finished(self, duration: float, error: Optional[BaseException] = None) -> None:
+        """记录 handler 的处理耗时，只写入 JSON log"""
+        if self.json_handler is None:
+            return
+        self.handle(make_duration_record(self.name, duration, error))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """等待队列中的 log 全部写出，未启用队列时直接返回"""
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
 
     def success(
         self,
@@ -0,0 +1,156 @@
+import gzip
+import io
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+__all__ = ("LogQuery", "iter_lines_reverse", "query_log", "compress_lines")
+
+CHUNK_SIZE = 64 * 1024
+MAX_LINE_LENGTH = 64 * 1024
+"""超过该长度的单行只保留末尾部分"""
+MAX_RECORD_LINES = 1000
+"""单条 record 除第一行外最多保留的行数，只保留末尾部分"""
+
+_LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+_HEADER = re.compile(rf"^(?P<time>\[[^\]]*\]|\s*)\s(?P<level>{'|'.join(_LEVELS)})\s")
+
+
+def iter_lines_reverse(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """从文件末尾开始逐行向前读取，内存占用只与 ``chunk_size`` 和 ``MAX_LINE_LENGTH`` 有关"""
+    file.seek(0, os.SEEK_END)
+    position = file.tell()
+    buffer = b""
+    first = True
+    while position > 0:
+        size = min(chunk_size, position)
+        position -= size
+        file.seek(position)
+        buffer = file.read(size) + buffer
+        lines = buffer.split(b"\n")
+        buffer = lines.pop(0)
+        if first:
+            first = False
+            if lines and lines[-1] == b"":
+                lines.pop()
+        yield from reversed(lines)
+        if len(buffer) > MAX_LINE_LENGTH:
+            buffer = buffer[-MAX_LINE_LENGTH:]
+    if buffer or not first:
+        yield buffer
+
+
+@dataclass
+class LogQuery:
+    """日志查询条件"""
+
+    lines: int = 1000
+    """最多返回的行数"""
+    level: Optional[Union[str, int]] = None
+    """最低 level"""
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    keyword: Optional[str] = None
+    """record 中需要包含的文本"""
+    time_format: str = "[%Y-%m-%d %X]"
+    _level: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        if isinstance(self.level, str):
+            self._level = logging.getLevelName(self.level.upper())
+            if not isinstance(self._level, int):
+                raise ValueError(f"unknown log level {self.level}")
+        elif self.level is not None:
+            self._level = self.level
+
+    @property
+    def filtered(self) -> bool:
+        return bool(self._level or self.since or self.until or self.keyword)
+
+    def parse_time(self, text: str) -> Optional[datetime]:
+        try:
+            return datetime.strptime(text, self.time_format)
+        except ValueError:
+            return None
+
+
+def _match_record(record: List[str], match: re.Match, query: LogQuery) -> bool:
+    if query._level and logging.getLevelName(match.group("level")) < query._level:
+        return False
+    return not query.keyword or any(query.keyword in i for i in record)
+
+
+def _iter_records(lines: Iterator[str], query: LogQuery) -> Iterator[List[str]]:
+    """把倒序的行组合成倒序的 record
+
+    重复的时间会被省略，这样的 record 使用它之前（倒序读取时之后）第一条带时间的 record 的时间。
+    """
+    record: List[str] = []
+    pending: List[List[str]] = []
+    for line in lines:
+        match = _HEADER.match(line)
+        if match is None:
+            if len(record) < MAX_RECORD_LINES:
+                record.append(line)
+            continue
+        record.append(line)
+        record.reverse()
+        # 先按时间判断，被 level 与关键词过滤掉的 record 仍然决定之前省略了时间的 record 的时间
+        time_text = match.group("time").strip()
+        if query.since or query.until:
+            if not time_text:
+                if _match_record(record, match, query):
+                    pending.append(record)
+                record = []
+                continue
+            time = query.parse_time(time_text)
+            if time is not None and query.until and time > query.until:
+                pending.clear()
+                record = []
+                continue
+            if time is not None and query.since and time < query.since:
+                return
+            yield from pending
+            pending.clear()
+        if _match_record(record, match, query):
+            yield record
+        record = []
+    if record and not query.filtered:
+        record.reverse()
+        yield record
+
+
+def query_log(path: Union[str, Path], query: Optional[LogQuery] = None) -> List[str]:
+    """查询日志文件末尾符合条件的行
+
+    :return: 按原顺序排列的行，最多 ``query.lines`` 行
+    """
+    query = query or LogQuery()
+    result: List[str] = []
+    with open(path, "rb") as file:
+        lines = (line.decode("utf-8", errors="replace").rstrip("\r") for line in iter_lines_reverse(file))
+        for record in _iter_records(lines, query):
+            for line in reversed(record):
+                result.append(line)
+                if len(result) >= query.lines:
+                    break
+            if len(result) >= query.lines:
+                break
+    result.reverse()
+    return result
+
+
+def compress_lines(lines: List[str], name: str = "log") -> io.BytesIO:
+    """使用 gzip 压缩日志，返回可以直接发送的文件对象"""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(filename=name, mode="wb", fileobj=buffer) as file:
+        for line in lines:
+            file.write(line.encode("utf-8"))
+            file.write(b"\n")
+    buffer.seek(0)
+    buffer.name = f"{name}.gz"
+    return buffer
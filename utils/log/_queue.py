@@ -0,0 +1,165 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Hashable, List, Literal, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from logging import LogRecord
+
+    from rich.traceback import Trace
+
+__all__ = ("QueueHandler", "LogWriter")
+
+QueuePolicy = Literal["drop", "block"]
+
+_STOP = object()
+
+
+class LogWriter:
+    """在独立线程中格式化并写出 log
+
+    调用方只需要把 record 放入有界队列，富文本渲染、traceback 与文件 I/O 都在写线程中完成。
+    """
+
+    def __init__(
+        self,
+        handlers: List[logging.Handler],
+        maxsize: int = 10000,
+        policy: QueuePolicy = "drop",
+        block_timeout: float = 1.0,
+    ):
+        self.handlers = handlers
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.queue: "queue.Queue" = queue.Queue(maxsize)
+        self.dropped = 0
+        self._reported = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def put(self, record: "LogRecord"):
+        """放入队列
+
+        ``drop`` 策略下队列已满时直接丢弃 WARNING 以下的 record，更高级别的 record 最多等待 ``block_timeout`` 秒；
+        ``block`` 策略下一直等待写线程腾出空间。
+        """
+        try:
+            if self.policy == "block":
+                self.queue.put(record)
+            elif record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _handle(self, record: "LogRecord"):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _report_dropped(self):
+        with self._lock:
+            dropped = self.dropped - self._reported
+            self._reported = self.dropped
+        if dropped:
+            record = logging.LogRecord(
+                "utils.log", logging.WARNING, __file__, 0, "日志队列已满，丢弃了 %s 条日志", (dropped,), None
+            )
+            self._handle(record)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    break
+                if isinstance(item, threading.Event):
+                    for handler in self.handlers:
+                        handler.flush()
+                    item.set()
+                    continue
+                self._handle(item)
+                if self.dropped != self._reported:
+                    self._report_dropped()
+            except Exception:  # pylint: disable=W0703
+                # 写线程不能退出，单条 record 出错时只打印到 stderr
+                logging.Handler.handleError(self.handlers[0], item)
+            finally:
+                self.queue.task_done()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """等待此前放入队列的 record 全部写出"""
+        if not self.running:
+            return True
+        event = threading.Event()
+        try:
+            self.queue.put(event, timeout=timeout)
+        except queue.Full:
+            return False
+        return event.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """写完队列中剩余的 record 后停止写线程"""
+        if not self.running:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._thread = None
+        self._report_dropped()
+        for handler in self.handlers:
+            handler.flush()
+
+
+class QueueHandler(logging.Handler):
+    """把 record 交给 ``LogWriter`` 的 handler"""
+
+    def __init__(self, writer: LogWriter, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.writer = writer
+
+    def prepare(self, record: "LogRecord") -> "LogRecord":
+        # 参数与栈帧中的局部变量可能在写出之前被修改，入队时就把消息与调用栈提取好，写线程只负责渲染
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # 每个 handler 的局部变量深度等参数可能不同，参数相同的 handler 共用一份调用栈
+            traces: Dict[Hashable, Optional["Trace"]] = {}
+            record.rich_traces = {}
+            for handler in self.writer.handlers:
+                if (trace_options := getattr(handler, "trace_options", None)) is None:
+                    continue
+                options = trace_options(record)
+                if options not in traces:
+                    traces[options] = handler.extract_trace(record)
+                record.rich_traces[handler] = traces[options]
+        return record
+
+    def emit(self, record: "LogRecord"):
+        try:
+            self.writer.put(self.prepare(record))
+        except Exception:  # pylint: disable=W0703
+            self.handleError(record)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.stop()
+        super().close()
@@ -0,0 +1,111 @@
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from utils.log._context import get_log_context
+from utils.log._file import FileIO
+
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+if TYPE_CHECKING:
+    from logging import LogRecord
+
+__all__ = ("JsonFormatter", "JsonHandler", "install_context_factory", "make_duration_record", "structured_only_filter")
+
+CONTEXT_FIELDS = ("update_id", "user_id", "chat_id", "plugin", "handler")
+
+
+def install_context_factory():
+    """在创建 record 时记录当前 update 的上下文
+
+    record 可能交给写线程处理，上下文必须在调用方所在的线程中读取。
+    """
+    old_factory = logging.getLogRecordFactory()
+    if getattr(old_factory, "log_context", False):
+        return
+
+    def factory(*args, **kwargs) -> "LogRecord":
+        record = old_factory(*args, **kwargs)
+        context = get_log_context()
+        if context is not None:
+            record.log_context = {key: context[key] for key in CONTEXT_FIELDS}
+            record.elapsed = time.perf_counter() - context["start"]
+        return record
+
+    factory.log_context = True
+    logging.setLogRecordFactory(factory)
+
+
+def structured_only_filter(record: "LogRecord") -> bool:
+    """只需要写入 JSON log 的 record 不在控制台与文本 log 中输出"""
+    return not getattr(record, "structured_only", False)
+
+
+class JsonFormatter(logging.Formatter):
+    """每条 record 输出为一行 JSON"""
+
+    def format(self, record: "LogRecord") -> str:
+        data: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "file": record.pathname,
+            "line": record.lineno,
+            "func": record.funcName,
+        }
+        if (context := getattr(record, "log_context", None)) is not None:
+            data.update(context)
+        for key in ("elapsed", "duration"):
+            if (value := getattr(record, key, None)) is not None:
+                data[key] = round(value * 1000, 3)
+        if record.exc_info and record.exc_info != (None, None, None):
+            data["exc_info"] = self.formatException(record.exc_info)
+        return jsonlib.dumps(data, ensure_ascii=False, default=str)
+
+
+class JsonHandler(logging.Handler):
+    """结构化 log，写入 ``json/json.log``，转存规则与文本 log 相同"""
+
+    def __init__(self, path: Path, level: int = logging.INFO, **rotate_config):
+        super().__init__(level)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        self.file = FileIO(path, **rotate_config)
+        self.setFormatter(JsonFormatter())
+
+    def emit(self, record: "LogRecord"):
+        try:
+            self.file.write(self.format(record) + "\n")
+        except Exception:  # pylint: disable=W0703
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if self.file.file_stream is not None:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+        super().close()
+
+
+def make_duration_record(name: str, duration: float, error: Optional[BaseException] = None) -> "LogRecord":
+    """handler 处理完成时的 record，只写入 JSON log"""
+    record = logging.getLogRecordFactory()(
+        name,
+        logging.INFO if error is None else logging.ERROR,
+        __file__,
+        0,
+        "handler 处理完成" if error is None else "handler 处理异常 %s",
+        None if error is None else (repr(error),),
+        None,
+    )
+    record.duration = duration
+    record.structured_only = True
+    return record
@@ -115,9 +115,10 @@ class Traceback(BaseTraceback):
         locals_max_depth: Optional[int] = None,
         suppress: Iterable[Union[str, ModuleType]] = (),
         max_frames: int = 100,
+        trace: Optional[Trace] = None,
         **kwargs,
     ) -> "Traceback":
-        rich_traceback = cls.extract(
+        rich_traceback = trace or cls.extract(
             exc_type=exc_type,
             exc_value=exc_value,
             traceback=traceback,
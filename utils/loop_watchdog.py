@@ -0,0 +1,165 @@
+"""事件循环阻塞检测
+
+事件循环中的协程每隔 ``interval`` 秒记录一次心跳，并把调度延迟记录到 ``event_loop_lag_seconds`` 直方图。
+辅助线程发现心跳超过 ``threshold`` 秒没有更新时，说明事件循环正在被阻塞，
+此时抓取事件循环线程的调用栈，找出正在执行的协程与插件并输出到 log，报告按 ``report_interval`` 限流。
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from types import FrameType
+from typing import Optional, Tuple
+
+from gram_core.basemodel import Settings, SettingsConfigDict
+from utils.const import PROJECT_ROOT
+from utils.log import logger
+from utils.metrics import metrics, metrics_config
+
+__all__ = ("LoopWatchdogConfig", "LoopWatchdog", "loop_watchdog", "loop_watchdog_config", "event_loop_lag")
+
+PLUGINS_ROOT = str(Path(PROJECT_ROOT).joinpath("plugins"))
+STACK_LIMIT = 20
+
+event_loop_lag = metrics.histogram(
+    "event_loop_lag_seconds",
+    "事件循环调度延迟",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+class LoopWatchdogConfig(Settings):
+    """事件循环阻塞检测配置"""
+
+    enable: bool = True
+    interval: float = 0.5
+    threshold: float = 1.0
+    report_interval: float = 60.0
+
+    model_config = SettingsConfigDict(env_prefix="loop_watchdog_")
+
+
+loop_watchdog_config = LoopWatchdogConfig()
+
+
+class LoopWatchdog:
+    def __init__(self, interval: float = 0.5, threshold: float = 1.0, report_interval: float = 60.0):
+        self.interval = interval
+        self.threshold = threshold
+        self.report_interval = report_interval
+        self.blocked = 0
+        """检测到的阻塞次数"""
+        self.suppressed = 0
+        """被限流而没有输出的报告数"""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = 0.0
+        self._last_report = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        """在事件循环中调用"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._measure())
+        self._thread = threading.Thread(target=self._watch, name="LoopWatchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if not self.running:
+            return
+        task, self._task = self._task, None
+        self._stop.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+            self._thread = None
+
+    async def _measure(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            if metrics_config.enable:
+                event_loop_lag.observe(max(0.0, now - start - self.interval))
+
+    def _watch(self):
+        reported_heartbeat = None
+        while not self._stop.wait(self.interval / 2):
+            heartbeat = self._heartbeat
+            lag = time.monotonic() - heartbeat - self.interval
+            if lag < self.threshold or heartbeat == reported_heartbeat:
+                continue
+            # 同一次阻塞只报告一次
+            reported_heartbeat = heartbeat
+            self.blocked += 1
+            now = time.monotonic()
+            if now - self._last_report < self.report_interval:
+                self.suppressed += 1
+                continue
+            self._last_report = now
+            self._report(lag)
+
+    def _current_task_name(self) -> str:
+        try:
+            # 在其他线程读取，只用于报告
+            task = asyncio.tasks._current_tasks.get(self._loop)  # pylint: disable=W0212
+        except AttributeError:
+            task = None
+        if task is None:
+            return "<unknown>"
+        coro = task.get_coro()
+        return getattr(coro, "__qualname__", None) or repr(coro)
+
+    @staticmethod
+    def _find_plugin(frame: Optional[FrameType]) -> Optional[Tuple[str, str, int]]:
+        """从栈顶向下查找第一个属于插件的栈帧"""
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(PLUGINS_ROOT):
+                owner = frame.f_locals.get("self")
+                name = f"{type(owner).__name__}.{frame.f_code.co_name}" if owner is not None else frame.f_code.co_name
+                return name, filename, frame.f_lineno
+            frame = frame.f_back
+        return None
+
+    def _report(self, lag: float):
+        frame = sys._current_frames().get(self._loop_thread_id)  # pylint: disable=W0212
+        if frame is None:
+            return
+        plugin = self._find_plugin(frame)
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+        suppressed, self.suppressed = self.suppressed, 0
+        logger.warning(
+            "事件循环已阻塞 %.2fs 协程[%s] 插件[%s] 期间省略了 %s 次报告\n%s",
+            lag,
+            self._current_task_name(),
+            f"{plugin[0]} {plugin[1]}:{plugin[2]}" if plugin else "<unknown>",
+            suppressed,
+            stack,
+        )
+
+
+loop_watchdog = LoopWatchdog(
+    interval=loop_watchdog_config.interval,
+    threshold=loop_watchdog_config.threshold,
+    report_interval=loop_watchdog_config.report_interval,
+)
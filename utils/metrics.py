@@ -0,0 +1,277 @@
+"""进程内指标
+
+提供计数器、仪表与固定分桶的延迟直方图，可以计算分位数，也可以输出为 Prometheus 文本格式。
+标签按位置传入，例如 ``histogram.observe(0.12, "Sign.command_start")``。
+"""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from gram_core.basemodel import Settings, SettingsConfigDict
+
+__all__ = (
+    "MetricsConfig",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "DEFAULT_BUCKETS",
+    "metrics",
+    "metrics_config",
+    "handler_duration",
+    "handler_errors",
+    "job_duration",
+    "template_render_duration",
+    "http_request_duration",
+    "http_request_errors",
+)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+T = TypeVar("T")
+
+
+class MetricsConfig(Settings):
+    """指标配置"""
+
+    enable: bool = True
+    web_enable: bool = False
+    web_path: str = "/metrics"
+
+    model_config = SettingsConfigDict(env_prefix="metrics_")
+
+
+metrics_config = MetricsConfig()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC, Generic[T]):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, T] = {}
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} 需要标签 {self.labelnames}，传入了 {labels}")
+        return tuple(labels)
+
+    def items(self) -> Iterator[Tuple[LabelValues, T]]:
+        return iter(list(self._values.items()))
+
+    def clear(self):
+        self._values.clear()
+
+    @abstractmethod
+    def _expose(self) -> List[str]:
+        """不包含 HELP 与 TYPE 的输出行"""
+
+    def expose(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self._expose()]
+
+
+class Counter(_Metric[float]):
+    """只增不减的计数器"""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _expose(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.items()
+        ]
+
+
+class Gauge(Counter):
+    """可以任意设置的仪表，也可以指定 ``function`` 在输出时读取"""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value: float, *labels: str):
+        self._values[self._key(labels)] = value
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def items(self) -> Iterator[Tuple[LabelValues, float]]:
+        if self.function is not None:
+            return iter(list(self.function().items()))
+        return super().items()
+
+
+class HistogramValue:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric[HistogramValue]):
+    """固定分桶的直方图"""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+
+    def observe(self, value: float, *labels: str):
+        key = self._key(labels)
+        data = self._values.get(key)
+        if data is None:
+            data = self._values[key] = HistogramValue(len(self.buckets))
+        data.counts[bisect.bisect_left(self.buckets, value)] += 1
+        data.sum += value
+        data.count += 1
+
+    def get(self, *labels: str) -> Optional[HistogramValue]:
+        return self._values.get(self._key(labels))
+
+    def quantile(self, q: float, *labels: str) -> float:
+        """通过分桶线性插值估算分位数，落在最后一个无穷大分桶时返回上一个分桶的上界"""
+        data = self._values.get(self._key(labels))
+        if data is None or data.count == 0:
+            return 0.0
+        rank = q * data.count
+        cumulative = 0
+        for index, count in enumerate(data.counts):
+            if cumulative + count >= rank and count:
+                upper = self.buckets[index]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+    def _expose(self) -> List[str]:
+        lines = []
+        for labels, data in self.items():
+            cumulative = 0
+            for bucket, count in zip(self.buckets, data.counts):
+                cumulative += count
+                le = f'le="{_format_value(bucket)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(data.sum)}")
+            lines.append(f"{self.name}_count{label_text} {data.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表，同名指标只会创建一次"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        elif type(metric) is not cls:
+            raise ValueError(f"指标 {name} 已经注册为 {metric.type}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames, function)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def exposition(self) -> str:
+        """输出为 Prometheus 文本格式"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def summary(self, name: str, limit: int = 10) -> List[Tuple[LabelValues, int, float, float, float]]:
+        """直方图的分位数摘要
+
+        :return: ``(标签, 次数, p50, p95, p99)`` 列表，按 p95 从大到小排序
+        """
+        histogram = self._metrics.get(name)
+        if not isinstance(histogram, Histogram):
+            return []
+        result = [
+            (
+                labels,
+                data.count,
+                histogram.quantile(0.5, *labels),
+                histogram.quantile(0.95, *labels),
+                histogram.quantile(0.99, *labels),
+            )
+            for labels, data in histogram.items()
+            if data.count
+        ]
+        result.sort(key=lambda x: x[3], reverse=True)
+        return result[:limit]
+
+
+metrics = MetricsRegistry()
+
+handler_duration = metrics.histogram("handler_duration_seconds", "Telegram handler 处理耗时", ("handler",))
+handler_errors = metrics.counter("handler_errors_total", "Telegram handler 抛出的异常数", ("handler",))
+job_duration = metrics.histogram("job_duration_seconds", "定时任务耗时", ("job",))
+template_render_duration = metrics.histogram("template_render_duration_seconds", "模板渲染耗时", ("template",))
+http_request_duration = metrics.histogram("http_request_duration_seconds", "HTTP 请求耗时", ("host",))
+http_request_errors = metrics.counter("http_request_errors_total", "HTTP 请求失败数", ("host",))
@@ -0,0 +1,28 @@
+"""应用生命周期
+
+事件循环阻塞检测在全部组件初始化之前启动，在全部组件关闭之后停止，不依赖任何插件。
+共享的 HTTP 连接池同样在全部组件关闭之后才关闭，避免仍在关闭的组件使用已经关闭的连接池。
+"""
+
+from gram_core.application import Application as _Application
+
+from utils.http_client import HTTPClientPool
+from utils.loop_watchdog import loop_watchdog, loop_watchdog_config
+from utils.patch.methods import patch, patchable
+
+
+@patch(_Application)
+class Application:
+    @patchable
+    async def initialize(self):
+        if loop_watchdog_config.enable:
+            loop_watchdog.start()
+        await self.old_initialize()
+
+    @patchable
+    async def shutdown(self):
+        try:
+            await self.old_shutdown()
+        finally:
+            await loop_watchdog.stop()
+            await HTTPClientPool.shutdown()
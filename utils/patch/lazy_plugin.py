@@ -0,0 +1,5 @@
+from utils.lazy_plugin import lazy_plugin_config, lazy_plugin_finder
+
+# 需要在 gram_core 导入插件模块之前替换声明的插件模块
+if lazy_plugin_config.enable:
+    lazy_plugin_finder.install()
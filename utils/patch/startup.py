@@ -0,0 +1,111 @@
+"""服务与插件按依赖关系并发初始化
+
+``ServiceManager.start_services`` 与 ``PluginManager.install_plugins`` 逐个实例化并立即等待 ``initialize()``。
+这里在实例化阶段只收集实例，全部实例化完成后交给 ``StartupScheduler`` 并发初始化，并输出启动时间线。
+插件的 handler 仍按原顺序注册，初始化失败的插件会被卸载。
+
+依赖（``DependenceManager``）数量少且是服务与插件的前置条件，仍然逐个初始化。
+"""
+
+from contextvars import ContextVar
+from typing import List, Optional
+
+from gram_core.manager import PluginManager as _PluginManager
+from gram_core.manager import ServiceManager as _ServiceManager
+from gram_core.plugin._plugin import Plugin as _Plugin
+
+from utils.log import logger
+from utils.patch.methods import patch, patchable
+from utils.startup import StartupScheduler, startup_config
+
+_deferred: ContextVar[Optional[List[object]]] = ContextVar("deferred_services", default=None)
+_deferred_plugins: ContextVar[Optional[List[object]]] = ContextVar("deferred_plugins", default=None)
+# 定义 install 的基类，Plugin 与 Plugin.Conversation 共用
+_PluginBase = next(i for i in _Plugin.__mro__ if "install" in i.__dict__)
+_MISSING = object()
+
+
+async def _defer_initialize(self):
+    _deferred.get().append(self)
+
+
+@patch(_ServiceManager)
+class ServiceManager:
+    @patchable
+    async def _initialize_service(self, target):
+        """实例化服务，``initialize()`` 延后到 ``start_services`` 中统一调度"""
+        if _deferred.get() is None:
+            return await self.old__initialize_service(target)
+        original = target.__dict__.get("initialize", _MISSING)
+        target.initialize = _defer_initialize
+        try:
+            return await self.old__initialize_service(target)
+        finally:
+            if original is _MISSING:
+                del target.initialize
+            else:
+                target.initialize = original
+
+    @patchable
+    async def start_services(self):
+        if not startup_config.parallel:
+            return await self.old_start_services()
+        deferred: List[object] = []
+        token = _deferred.set(deferred)
+        try:
+            await self.old_start_services()
+        finally:
+            _deferred.reset(token)
+        scheduler = StartupScheduler(deferred)
+        try:
+            await scheduler.run()
+        except Exception as exc:
+            logger.exception("服务初始化失败，BOT 将自动关闭")
+            raise SystemExit from exc
+        logger.info("服务启动时间线\n%s", scheduler.report())
+
+
+@patch(_PluginBase)
+class Plugin:
+    @patchable
+    async def install(self):
+        """注册 handler，``initialize()`` 延后到 ``install_plugins`` 中统一调度"""
+        deferred = _deferred_plugins.get()
+        if deferred is None:
+            return await self.old_install()
+
+        async def initialize():
+            deferred.append(self)
+
+        self.initialize = initialize
+        try:
+            return await self.old_install()
+        finally:
+            del self.initialize
+
+
+@patch(_PluginManager)
+class PluginManager:
+    @patchable
+    async def install_plugins(self):
+        if not startup_config.parallel:
+            return await self.old_install_plugins()
+        deferred: List[object] = []
+        token = _deferred_plugins.set(deferred)
+        try:
+            await self.old_install_plugins()
+        finally:
+            _deferred_plugins.reset(token)
+        scheduler = StartupScheduler(deferred)
+        errors = await scheduler.run(fail_fast=False)
+        for instance in deferred:
+            exc = errors.get(id(instance))
+            if exc is None:
+                continue
+            name = StartupScheduler.name(instance)
+            logger.error('插件 "%s" 初始化失败，已卸载', name, exc_info=exc)
+            try:
+                await instance.uninstall()
+            except Exception:  # pylint: disable=W0703
+                logger.exception('插件 "%s" 卸载失败', name)
+        logger.info("插件启动时间线\n%s", scheduler.report())
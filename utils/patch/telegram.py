@@ -1,5 +1,11 @@
+import time
+
 import telegram
+from telegram.ext import ApplicationHandlerStop, BaseHandler as _BaseHandler, Job as _Job
 
+from utils.log import logger
+from utils.log._context import bind_update, callback_name, get_log_context, reset_log_context
+from utils.metrics import handler_duration, handler_errors, job_duration, metrics_config
 from utils.patch.methods import patch, patchable
 
 # https://github.com/python-telegram-bot/python-telegram-bot/issues/4295
@@ -12,3 +18,45 @@ class Bot:
         if current_offset == "[]":
             current_offset = 50
         return self.old__effective_inline_results(results, next_offset, current_offset)
+
+
+@patch(_BaseHandler)
+class BaseHandler:
+    @patchable
+    async def handle_update(self, update, application, check_result, context):
+        """绑定 log 上下文并记录 handler 耗时与异常"""
+        token = bind_update(update, self.callback)
+        if token is None:
+            return await self.old_handle_update(update, application, check_result, context)
+        start = time.perf_counter()
+        error = None
+        try:
+            return await self.old_handle_update(update, application, check_result, context)
+        except ApplicationHandlerStop:
+            raise
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            logger.handler_finished(duration, error)
+            if metrics_config.enable:
+                name = get_log_context()["handler"]
+                handler_duration.observe(duration, name)
+                if error is not None:
+                    handler_errors.inc(name)
+            reset_log_context(token)
+
+
+@patch(_Job)
+class Job:
+    @patchable
+    async def run(self, application):
+        """记录定时任务耗时，按回调区分，任务名称中常带有 chat 或 user id"""
+        if not metrics_config.enable:
+            return await self.old_run(application)
+        start = time.perf_counter()
+        try:
+            return await self.old_run(application)
+        finally:
+            job_duration.observe(time.perf_counter() - start, callback_name(self.callback))
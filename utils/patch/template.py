@@ -0,0 +1,19 @@
+import time
+
+from core.services.template.services import TemplateService as _TemplateService
+from utils.metrics import metrics_config, template_render_duration
+from utils.patch.methods import patch, patchable
+
+
+@patch(_TemplateService)
+class TemplateService:
+    @patchable
+    async def render(self, template_name: str, *args, **kwargs):
+        """记录模板渲染耗时"""
+        if not metrics_config.enable:
+            return await self.old_render(template_name, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return await self.old_render(template_name, *args, **kwargs)
+        finally:
+            template_render_duration.observe(time.perf_counter() - start, template_name)
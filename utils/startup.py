@@ -0,0 +1,205 @@
+"""按依赖关系并发初始化组件
+
+组件之间的依赖从构造函数的类型注解推导：构造函数参数的类型是另一个组件的类型时，
+该组件的 ``initialize()`` 需要等待被依赖的组件初始化完成。互不依赖的组件会并发初始化。
+"""
+
+import asyncio
+import inspect
+import time
+import typing
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from gram_core.basemodel import Settings, SettingsConfigDict
+
+from utils.log import logger
+
+__all__ = (
+    "StartupConfig",
+    "StartupCycleError",
+    "StartupDependencyError",
+    "ComponentTiming",
+    "StartupScheduler",
+    "startup_config",
+)
+
+
+class StartupConfig(Settings):
+    """启动配置"""
+
+    parallel: bool = True
+    """按依赖关系并发初始化服务与插件"""
+
+    model_config = SettingsConfigDict(env_prefix="startup_")
+
+
+startup_config = StartupConfig()
+
+
+class StartupCycleError(Exception):
+    """组件之间存在循环依赖"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"组件之间存在循环依赖: {' -> '.join(cycle)}")
+
+
+class StartupDependencyError(Exception):
+    """组件依赖的组件初始化失败"""
+
+    def __init__(self, name: str, dependencies: List[str]):
+        self.dependencies = dependencies
+        super().__init__(f"组件 {name} 依赖的 {', '.join(dependencies)} 初始化失败")
+
+
+class ComponentTiming:
+    __slots__ = ("name", "dependencies", "start", "end")
+
+    def __init__(self, name: str, dependencies: List[str]):
+        self.name = name
+        self.dependencies = dependencies
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+def _constructor_types(cls: type) -> List[Any]:
+    init = cls.__init__
+    try:
+        hints = typing.get_type_hints(init)
+    except Exception:  # pylint: disable=W0703
+        hints = getattr(init, "__annotations__", {})
+    try:
+        parameters = inspect.signature(init).parameters
+    except (TypeError, ValueError):
+        return []
+    return [hints[name] for name in parameters if name in hints and name != "return"]
+
+
+class StartupScheduler:
+    """组件启动调度器
+
+    :param components: 需要初始化的组件实例
+    :param method: 初始化方法名
+    """
+
+    def __init__(self, components: Iterable[object], method: str = "initialize"):
+        self.components = list(components)
+        self.method = method
+        self.dependencies: Dict[int, List[object]] = self._build_graph()
+        self.timings: Dict[int, ComponentTiming] = {
+            id(component): ComponentTiming(
+                self.name(component), [self.name(i) for i in self.dependencies[id(component)]]
+            )
+            for component in self.components
+        }
+        self._started: Optional[float] = None
+
+    @staticmethod
+    def name(component: object) -> str:
+        return type(component).__name__
+
+    def _build_graph(self) -> Dict[int, List[object]]:
+        graph: Dict[int, List[object]] = {}
+        for component in self.components:
+            dependencies = []
+            for annotation in _constructor_types(type(component)):
+                if not isinstance(annotation, type):
+                    continue
+                for other in self.components:
+                    if other is not component and isinstance(other, annotation) and other not in dependencies:
+                        dependencies.append(other)
+            graph[id(component)] = dependencies
+        return graph
+
+    def order(self) -> List[object]:
+        """拓扑排序，存在循环依赖时抛出 ``StartupCycleError``"""
+        result: List[object] = []
+        visited: Set[int] = set()
+        path: List[object] = []
+
+        def visit(component: object):
+            if id(component) in visited:
+                return
+            if any(i is component for i in path):
+                index = next(i for i, item in enumerate(path) if item is component)
+                raise StartupCycleError([self.name(i) for i in path[index:]] + [self.name(component)])
+            path.append(component)
+            for dependency in self.dependencies[id(component)]:
+                visit(dependency)
+            path.pop()
+            visited.add(id(component))
+            result.append(component)
+
+        for item in self.components:
+            visit(item)
+        return result
+
+    async def _run_one(self, component: object, dependencies: List["asyncio.Task"]):
+        if dependencies:
+            results = await asyncio.gather(*dependencies, return_exceptions=True)
+            failed = [
+                self.name(i) for i, result in zip(self.dependencies[id(component)], results) if result is not None
+            ]
+            if failed:
+                raise StartupDependencyError(self.name(component), failed)
+        timing = self.timings[id(component)]
+        timing.start = time.perf_counter()
+        try:
+            method = getattr(component, self.method, None)
+            if method is not None:
+                await method()
+        finally:
+            timing.end = time.perf_counter()
+
+    async def run(self, fail_fast: bool = True) -> Dict[int, BaseException]:
+        """并发初始化全部组件
+
+        :param fail_fast: 任一组件失败时取消其余组件并抛出该异常；
+            为 ``False`` 时等待全部组件完成，依赖初始化失败的组件以 ``StartupDependencyError`` 失败
+        :return: 初始化失败的组件 id 与异常
+        """
+        order = self.order()
+        self._started = time.perf_counter()
+        tasks: Dict[int, asyncio.Task] = {}
+        for component in order:
+            dependencies = [tasks[id(i)] for i in self.dependencies[id(component)]]
+            tasks[id(component)] = asyncio.create_task(
+                self._run_one(component, dependencies), name=f"startup:{self.name(component)}"
+            )
+        if tasks:
+            return_when = asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED
+            _, pending = await asyncio.wait(tasks.values(), return_when=return_when)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        # 取出每个失败任务的异常，避免被回收时报告 exception was never retrieved
+        errors: Dict[int, BaseException] = {}
+        for component in order:
+            task = tasks[id(component)]
+            if not task.cancelled() and task.exception() is not None:
+                errors[id(component)] = task.exception()
+        if fail_fast and errors:
+            component = next(i for i in order if id(i) in errors)
+            logger.error("组件 %s 初始化失败", self.name(component))
+            raise errors[id(component)]
+        return errors
+
+    def report(self) -> str:
+        """每个组件的启动时间线"""
+        if self._started is None:
+            return ""
+        timings = sorted((i for i in self.timings.values() if i.start is not None), key=lambda x: (x.start, x.name))
+        lines = []
+        for timing in timings:
+            line = f"{timing.name:<32} +{timing.start - self._started:7.3f}s {timing.duration:7.3f}s"
+            if timing.dependencies:
+                line += f"  <- {', '.join(timing.dependencies)}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,255 @@
+"""Redis 前的进程内缓存
+
+热点数据在进程内保留一小段时间，命中时不需要访问 Redis，也不需要重新解析 JSON。
+多进程部署时可以开启 ``TIERED_CACHE_INVALIDATION``，写入后通过 Redis 发布订阅通知其他进程删除本地缓存。
+"""
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, TYPE_CHECKING
+from uuid import uuid4
+
+from gram_core.basemodel import Settings, SettingsConfigDict
+from utils.log import logger
+
+try:
+    import ujson as jsonlib
+except ImportError:
+    import json as jsonlib
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+__all__ = ("TieredCacheConfig", "CacheStatistics", "TieredCache", "tiered_cache_config")
+
+T = TypeVar("T")
+
+
+class TieredCacheConfig(Settings):
+    """进程内缓存配置"""
+
+    enable: bool = True
+    maxsize: int = 1024
+    ttl: float = 30.0
+    invalidation: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="tiered_cache_")
+
+
+tiered_cache_config = TieredCacheConfig()
+
+
+class CacheStatistics:
+    """单个缓存的命中统计"""
+
+    __slots__ = ("name", "local_hits", "remote_hits", "misses")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+
+    @property
+    def requests(self) -> int:
+        return self.local_hits + self.remote_hits + self.misses
+
+    @property
+    def local_hit_ratio(self) -> float:
+        return self.local_hits / self.requests if self.requests else 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        return (self.local_hits + self.remote_hits) / self.requests if self.requests else 0.0
+
+
+class TieredCache(Generic[T]):
+    """进程内 LRU + Redis 的两级缓存
+
+    本地缓存保存的是解析后的对象，可变对象需要传入 ``copy``，返回前复制一份，避免调用方修改缓存。
+    本地缓存的有效期不会超过 Redis 中剩余的有效期。
+    同名的多个实例共用统计与失效通知。
+    """
+
+    CHANNEL = "tiered_cache:invalidate"
+    instance_id = uuid4().hex
+    caches: "weakref.WeakSet[TieredCache]" = weakref.WeakSet()
+    _listener: Optional["asyncio.Task"] = None
+
+    def __init__(
+        self,
+        client: "Redis",
+        name: str,
+        parse: Callable[[Any], T],
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        copy: Optional[Callable[[T], T]] = None,
+    ):
+        self.client = client
+        self.name = name
+        self.parse = parse
+        self.maxsize = maxsize or tiered_cache_config.maxsize
+        self.ttl = ttl or tiered_cache_config.ttl
+        self.copy = copy
+        self.statistics = CacheStatistics(name)
+        self._data: "OrderedDict[str, Tuple[T, float]]" = OrderedDict()
+        self.caches.add(self)
+
+    def _get_local(self, key: str) -> Optional[T]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: T, pttl: int = -1):
+        """:param pttl: Redis 中剩余的有效期（毫秒），负数表示没有有效期"""
+        if not tiered_cache_config.enable:
+            return
+        ttl = self.ttl if pttl < 0 else min(self.ttl, pttl / 1000)
+        if ttl <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear_local(self, *keys: str):
+        """删除本地缓存，不指定 key 时清空"""
+        if not keys:
+            self._data.clear()
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def get(self, key: str, fetch: Optional[Callable[[], Awaitable[Any]]] = None) -> Optional[T]:
+        """读取缓存
+
+        :param key: Redis key
+        :param fetch: 从 Redis 读取原始数据的方法，默认使用 GET
+        :return: 解析后的数据，不存在时返回 None
+        """
+        value = self._get_local(key)
+        if value is not None:
+            self.statistics.local_hits += 1
+            return self.copy(value) if self.copy else value
+        if fetch is None:
+            async with self.client.pipeline(transaction=False) as pipe:
+                data, pttl = await pipe.get(key).pttl(key).execute()
+        else:
+            data, pttl = await asyncio.gather(fetch(), self.client.pttl(key))
+        if not data:
+            self.statistics.misses += 1
+            return None
+        self.statistics.remote_hits += 1
+        value = self.parse(data)
+        self._set_local(key, value, pttl)
+        return self.copy(value) if self.copy else value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, T]:
+        """批量读取缓存，本地没有的 key 通过一次 MGET 读取
+
+        :return: 存在的 key 与解析后的数据
+        """
+        result: Dict[str, T] = {}
+        missing = []
+        for key in keys:
+            value = self._get_local(key)
+            if value is None:
+                missing.append(key)
+                continue
+            self.statistics.local_hits += 1
+            result[key] = self.copy(value) if self.copy else value
+        if missing:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.mget(missing)
+                for key in missing:
+                    pipe.pttl(key)
+                values, *pttls = await pipe.execute()
+            for key, data, pttl in zip(missing, values, pttls):
+                if not data:
+                    self.statistics.misses += 1
+                    continue
+                self.statistics.remote_hits += 1
+                value = self.parse(data)
+                self._set_local(key, value, pttl)
+                result[key] = self.copy(value) if self.copy else value
+        return result
+
+    async def set(self, key: str, data: Any, ex: Optional[int] = None):
+        await self.client.set(key, data, ex=ex)
+        await self.invalidate(key)
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*keys)
+            await self.invalidate(*keys)
+
+    async def invalidate(self, *keys: str):
+        """删除本地缓存并通知其他进程"""
+        self.clear_local(*keys)
+        if self._listener is None or not keys:
+            return
+        try:
+            await self.client.publish(self.CHANNEL, jsonlib.dumps([self.instance_id, self.name, list(keys)]))
+        except Exception as exc:  # skipcq: PYL-W0703
+            logger.warning("发布缓存失效通知失败 %s", str(exc))
+
+    @classmethod
+    def get_statistics(cls) -> Dict[str, CacheStatistics]:
+        """按名称汇总的命中统计"""
+        result: Dict[str, CacheStatistics] = {}
+        for cache in list(cls.caches):
+            statistics = result.setdefault(cache.name, CacheStatistics(cache.name))
+            statistics.local_hits += cache.statistics.local_hits
+            statistics.remote_hits += cache.statistics.remote_hits
+            statistics.misses += cache.statistics.misses
+        return result
+
+    @classmethod
+    async def _listen(cls, client: "Redis"):
+        try:
+            await cls._subscribe(client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # skipcq: PYL-W0703
+            logger.error("缓存失效通知订阅异常退出", exc_info=exc)
+
+    @classmethod
+    async def _subscribe(cls, client: "Redis"):
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(cls.CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    instance_id, name, keys = jsonlib.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if instance_id == cls.instance_id:
+                    continue
+                for cache in list(cls.caches):
+                    if cache.name == name:
+                        cache.clear_local(*keys)
+
+    @classmethod
+    def start_invalidation(cls, client: "Redis"):
+        """订阅其他进程的缓存失效通知"""
+        if cls._listener is None and tiered_cache_config.invalidation:
+            cls._listener = asyncio.create_task(cls._listen(client))
+
+    @classmethod
+    async def stop_invalidation(cls):
+        if cls._listener is None:
+            return
+        listener, cls._listener = cls._listener, None
+        listener.cancel()
+        try:
+            await listener
+        except asyncio.CancelledError:
+            pass